@@ -0,0 +1,62 @@
+"""
+Backward pass over a deep chain of diamonds: Engine.backward_propagate against Tape.backward.
+
+Each diamond feeds h into two 'sin' ops and adds their outputs, so the recursive walk of
+backward_propagate follows every path from the loss and doubles its work with each stage,
+while the reverse sweep of the tape visits every op once and scales linearly.
+
+Usage:
+    python -m benchmarks.bench_backward
+"""
+import time
+import networkx as nx
+
+from trengx.engine.engine import Engine
+
+
+def diamond_chain(G, depth):
+    """
+    Builds `depth` stages of h' = sin(h) + sin(h) from a parameter 'w'.
+
+    Returns:
+        tuple: The ids of the 'w' and 'e2' nodes.
+    """
+    w, _, a = Engine.op1(G, in_name='w', in_value=0.5, op_name='sin', out_name='a_0')
+    h = w
+    for i in range(depth):
+        if i:
+            _, _, a = Engine.op1(G, in_id=h, op_name='sin', out_name=f'a_{i}')
+        _, _, c = Engine.op1(G, in_id=h, op_name='sin', out_name=f'c_{i}')
+        _, _, _, h = Engine.op2(G, in1_id=a, in2_id=c, op_name='+', out_name=f'h_{i}')
+    G.nodes[h]['name'] = 'e2'
+    return w, h
+
+
+def time_call(f, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        f()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    print(f"{'depth':>6} {'backward_propagate':>19} {'tape.backward':>14}")
+    for depth in (4, 8, 12, 16, 100, 1000, 10000):
+        G = nx.DiGraph()
+        w, e2 = diamond_chain(G, depth)
+        tape = Engine.compile(G)
+        tape.run()
+        tape.write_back(G)
+
+        baseline = ''
+        if depth <= 16:
+            def recursive():
+                G.nodes[e2]['grad'] = 1
+                Engine.backward_propagate(G, e2, 0.0)
+            baseline = f"{time_call(recursive, 3) * 1e3:.2f}ms"
+        compiled = time_call(lambda: tape.backward(e2), 10 if depth < 10000 else 3)
+        print(f"{depth:>6} {baseline:>19} {compiled * 1e3:>12.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
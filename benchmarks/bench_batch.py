@@ -0,0 +1,40 @@
+"""
+One epoch of the neural_network model over N samples: a loop of Tape.run/backward per sample
+against one Tape.run_batch/backward_batch over the whole epoch.
+
+Usage:
+    python -m benchmarks.bench_batch
+"""
+import time
+import numpy as np
+import networkx as nx
+
+from trengx.engine.engine import Engine
+from benchmarks.models import neural_network
+
+
+def main(samples=500):
+    xs = np.linspace(-2.0, 2.0, samples)
+    ys = np.sin(xs)
+    print(f"{'hidden':>6} {'per sample':>11} {'batch':>9} {'speedup':>8}")
+    for hidden in (1, 10, 100):
+        G = nx.DiGraph()
+        x, y, _, _, _, _, _, e2 = neural_network(G, hidden)
+        tape = Engine.compile(G)
+
+        start = time.perf_counter()
+        for x_value, y_value in zip(xs.tolist(), ys.tolist()):
+            tape.run({x: x_value, y: y_value})
+            tape.backward(e2)
+        baseline = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tape.run_batch({x: xs, y: ys})
+        tape.backward_batch(e2)
+        batch = time.perf_counter() - start
+
+        print(f"{hidden:>6} {baseline * 1e3:>9.1f}ms {batch * 1e3:>7.2f}ms {baseline / batch:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
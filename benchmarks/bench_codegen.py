@@ -0,0 +1,45 @@
+"""
+Forward and backward passes of the neural_network model: the Tape interpreter against the
+straight-line functions generated by Engine.codegen.
+
+Usage:
+    python -m benchmarks.bench_codegen
+"""
+import time
+import networkx as nx
+
+from trengx.engine.engine import Engine
+from benchmarks.models import neural_network
+
+
+def time_call(f, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        f()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(samples=2000):
+    print(f"{'hidden':>6} {'tape fwd+bwd':>13} {'codegen fwd+bwd':>16} {'speedup':>8}")
+    for hidden in (1, 10, 100):
+        repeat = max(20, samples // hidden)
+        G = nx.DiGraph()
+        _, _, _, _, _, _, _, e2 = neural_network(G, hidden)
+        tape = Engine.compile(G)
+        f = Engine.codegen(G, loss=e2)
+        values = tape.values.tolist()
+
+        def interpreted():
+            tape.run()
+            tape.backward(e2)
+
+        def generated():
+            f.backward(f.forward(values))
+
+        baseline = time_call(interpreted, repeat)
+        compiled = time_call(generated, repeat)
+        print(f"{hidden:>6} {baseline * 1e6:>11.1f}us {compiled * 1e6:>14.1f}us {baseline / compiled:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
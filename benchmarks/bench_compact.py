@@ -0,0 +1,53 @@
+"""
+Memory and forward_propagate time of a chain of 'sin' ops stored as a networkx DiGraph and as
+a CompactGraph.
+
+Usage:
+    python -m benchmarks.bench_compact
+"""
+import time
+import tracemalloc
+import networkx as nx
+
+from trengx.engine.engine import Engine
+from trengx.engine.compact import CompactGraph
+
+
+def sin_chain(G, stages):
+    x, _, h = Engine.op1(G, in_name='x', in_value=0.0, op_name='sin', out_name='h', out_value=0.0)
+    for _ in range(stages - 1):
+        _, _, h = Engine.op1(G, in_id=h, op_name='sin', out_name='h', out_value=0.0)
+    return x
+
+
+def build(stages, compact):
+    tracemalloc.start()
+    if compact:
+        G = CompactGraph()
+        x, _, h = G.op1(in_name='x', in_value=0.0, op_name='sin', out_name='h', out_value=0.0)
+        for _ in range(stages - 1):
+            _, _, h = G.op1(in_id=h, op_name='sin', out_name='h', out_value=0.0)
+    else:
+        G = nx.DiGraph()
+        x = sin_chain(G, stages)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return G, x, memory
+
+
+def main():
+    print(f"{'stages':>8} {'networkx':>10} {'compact':>10} {'networkx fwd':>13} {'compact fwd':>12}")
+    for stages in (1000, 10000, 100000):
+        row = []
+        for compact in (False, True):
+            G, x, memory = build(stages, compact)
+            start = time.perf_counter()
+            Engine.forward_propagate(G, x, 1.0)
+            row.append((memory, time.perf_counter() - start))
+        (nx_memory, nx_time), (c_memory, c_time) = row
+        print(f"{stages:>8} {nx_memory / 2**20:>8.1f}MB {c_memory / 2**20:>8.1f}MB "
+              f"{nx_time * 1e3:>11.1f}ms {c_time * 1e3:>10.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+The 1-hidden-layer model of neural_network built from scalar Neurons against the same model
+built from two Dense layers on tensor-valued nodes: graph size, build time and the time of a
+forward and backward pass of the compiled tape over a batch of samples.
+
+Usage:
+    python -m benchmarks.bench_dense
+"""
+import time
+import numpy as np
+import networkx as nx
+
+from trengx.engine.engine import Engine, Dense
+from benchmarks.models import neural_network
+
+
+def dense_network(G, hidden):
+    x, _, _, h = Dense(G, 1, hidden, name='1').get_nodes()
+    _, _, _, y_est = Dense(G, hidden, 1, in_id=h, activation=None, name='2').get_nodes()
+    y, _, _, e = Engine.op2(G, in1_name='y', in2_id=y_est, op_name='-', out_name='e')
+    _, _, e2 = Engine.op1(G, in_id=e, op_name='sqr', out_name='e2')
+    _, _, loss = Engine.op1(G, in_id=e2, op_name='mean', out_name='loss')
+    return x, y, loss
+
+
+def main(samples=500):
+    xs = np.linspace(-2.0, 2.0, samples)
+    ys = np.sin(xs)
+    print(f"{'hidden':>6} {'model':>7} {'nodes':>7} {'build':>9} {'fwd+bwd':>9}")
+    for hidden in (10, 100, 1000):
+        start = time.perf_counter()
+        G = nx.DiGraph()
+        x, y, _, _, _, _, _, e2 = neural_network(G, hidden)
+        build = time.perf_counter() - start
+        tape = Engine.compile(G)
+        start = time.perf_counter()
+        tape.run_batch({x: xs, y: ys})
+        tape.backward_batch(e2)
+        step = time.perf_counter() - start
+        print(f"{hidden:>6} {'scalar':>7} {G.number_of_nodes():>7} {build * 1e3:>7.1f}ms {step * 1e3:>7.2f}ms")
+
+        start = time.perf_counter()
+        G = nx.DiGraph()
+        x, y, loss = dense_network(G, hidden)
+        G.nodes[x]['value'] = xs[:, None]
+        G.nodes[y]['value'] = ys[:, None]
+        build = time.perf_counter() - start
+        tape = Engine.compile(G)
+        start = time.perf_counter()
+        tape.run()
+        tape.backward(loss)
+        step = time.perf_counter() - start
+        print(f"{hidden:>6} {'dense':>7} {G.number_of_nodes():>7} {build * 1e3:>7.1f}ms {step * 1e3:>7.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""
+Forward evaluation of the neural_network model: Engine.forward_propagate against a compiled Tape.
+
+Usage:
+    python -m benchmarks.bench_forward
+"""
+import time
+import networkx as nx
+
+from trengx.engine.engine import Engine
+from benchmarks.models import neural_network
+
+
+def main(samples=2000):
+    print(f"{'hidden':>6} {'forward_propagate':>18} {'tape.run':>10} {'speedup':>8}")
+    for hidden in (1, 10, 100):
+        samples = max(20, samples // hidden)
+        G = nx.DiGraph()
+        x, _, _, _, _, _, _, e2 = neural_network(G, hidden)
+        tape = Engine.compile(G)
+
+        start = time.perf_counter()
+        for i in range(samples):
+            Engine.forward_propagate(G, x, 1.0 + i * 1e-4)
+        baseline = (time.perf_counter() - start) / samples
+
+        start = time.perf_counter()
+        for i in range(samples):
+            tape.run({x: 1.0 + i * 1e-4})
+        compiled = (time.perf_counter() - start) / samples
+
+        assert abs(tape[e2] - G.nodes[e2]['value']) < 1e-9
+        print(f"{hidden:>6} {baseline * 1e6:>16.1f}us {compiled * 1e6:>8.1f}us {baseline / compiled:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
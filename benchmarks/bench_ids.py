@@ -0,0 +1,26 @@
+"""
+Construction time of the neural_network model with uuid4 string ids and with int ids.
+
+Usage:
+    python -m benchmarks.bench_ids
+"""
+import time
+import networkx as nx
+
+from trengx.engine import ids
+from benchmarks.models import neural_network
+
+
+def main(hidden=10000):
+    allocator = ids.get_allocator()
+    print(f"{'allocator':>10} {'build':>9}")
+    for mode in ('uuid', 'counter', 'compact64'):
+        ids.set_allocator(mode)
+        start = time.perf_counter()
+        neural_network(nx.DiGraph(), hidden)
+        print(f"{mode:>10} {(time.perf_counter() - start) * 1e3:>7.0f}ms")
+    ids.set_allocator(allocator)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Time to a target loss of the neural_network model fitted to noisy sensor readings, with plain
+SGD against the stateful optimizers of trengx.engine.optim, all through Engine.train.
+
+The readings are raw, not normalized: a large offset and inputs up to 10 make the problem
+ill-conditioned, as sensor data often is. Every optimizer is reported with the learning rate
+of the grid that reaches the target first.
+
+Usage:
+    python -m benchmarks.bench_optim
+"""
+import time
+import numpy as np
+import networkx as nx
+
+from trengx.engine import optim
+from trengx.engine.engine import Engine
+from benchmarks.models import neural_network
+
+
+def time_to_target(optimizer, xs, ys, target, hidden, max_epochs):
+    G = nx.DiGraph()
+    x, y, _, _, _, _, _, e2 = neural_network(G, hidden)
+    tape = Engine.compile(G)
+    start = time.perf_counter()
+    with np.errstate(all='ignore'):
+        for epoch in range(1, max_epochs + 1):
+            result = Engine.train(G, {x: xs, y: ys}, e2, batch_size=32, tape=tape, optimizer=optimizer)
+            if result['epoch_loss'][-1] <= target:
+                return epoch, time.perf_counter() - start
+    return None, None
+
+
+def main(samples=2000, hidden=10, noise=0.1, max_epochs=150, rates=(0.0003, 0.001, 0.003, 0.01, 0.03)):
+    rng = np.random.default_rng(0)
+    xs = rng.uniform(0.0, 10.0, samples)
+    ys = 0.3 * xs + 2.0 + rng.normal(0.0, noise, samples)
+    target = 1.2 * noise ** 2
+    print(f"target mean squared error {target:.3f}, {samples} samples, {hidden} hidden neurons")
+    print(f"{'optimizer':>10} {'lr':>7} {'epochs':>7} {'seconds':>8}")
+    for name in optim.OPTIMIZERS:
+        best = None
+        for lr in rates:
+            epochs, seconds = time_to_target(optim.OPTIMIZERS[name](lr), xs, ys, target, hidden, max_epochs)
+            if epochs is not None and (best is None or seconds < best[2]):
+                best = (lr, epochs, seconds)
+        if best is None:
+            print(f"{name:>10} {'-':>7} {'>' + str(max_epochs):>7} {'-':>8}")
+        else:
+            print(f"{name:>10} {best[0]:>7} {best[1]:>7} {best[2]:>7.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""
+Samples/sec scaling of data-parallel training from 1 to N worker processes, on the
+neural_network model scaled up to many hidden neurons, against Engine.train in this process.
+
+Scaling needs batches large enough for every shard to outweigh the per-batch round trip of the
+pipes and the reduction of the gradients: a few thousand samples per worker.
+
+Usage:
+    python -m benchmarks.bench_parallel [max workers]
+"""
+import os
+import sys
+import numpy as np
+import networkx as nx
+
+from trengx.engine.engine import Engine
+from trengx.engine.parallel import train_parallel
+from benchmarks.models import neural_network
+
+
+def main(max_workers=None, hidden=200, samples=65536, batch_size=16384, epochs=2):
+    max_workers = max_workers or os.cpu_count() or 1
+    rng = np.random.default_rng(0)
+    xs = rng.uniform(0.0, 2.0, samples)
+    ys = 1.2 * xs + 0.3 + rng.normal(0.0, 0.1, samples)
+    print(f"{hidden} hidden neurons, batches of {batch_size}, {os.cpu_count()} CPUs")
+
+    def run(train, **kwargs):
+        G = nx.DiGraph()
+        x, y, _, _, _, _, _, e2 = neural_network(G, hidden)
+        result = train(G, {x: xs, y: ys}, e2, batch_size=batch_size, epochs=epochs, lr=0.001, **kwargs)
+        return result['samples_per_second']
+
+    print(f"{'workers':>8} {'samples/s':>11} {'speedup':>8} {'efficiency':>11}")
+    print(f"{'inline':>8} {run(Engine.train):>11.0f}")
+    workers = [1]
+    while workers[-1] * 2 <= max_workers:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != max_workers:
+        workers.append(max_workers)
+    base = None
+    for n in workers:
+        throughput = run(train_parallel, workers=n)
+        base = base or throughput
+        print(f"{n:>8} {throughput:>11.0f} {throughput / base:>7.2f}x {throughput / base / n:>10.0%}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else None)
@@ -0,0 +1,60 @@
+"""
+Benchmark of Graph.set_node_value against a live Neo4j database.
+
+A subgraph of `depth` layers of `width` 'sin' ops is built downstream of one input, next to
+an unrelated background graph of `background` ops. The time per update should scale with
+depth * width and stay flat as the background graph grows.
+
+Usage:
+    NEO4J_URI=... NEO4J_USER=... NEO4J_PASSWORD=... python -m benchmarks.bench_set_node_value
+"""
+import os
+import time
+
+from trengx.engine.graph import Graph
+
+
+def build_layers(g, depth, width):
+    """
+    Builds `depth` layers of `width` 'sin' ops, every op of a layer reading the previous layer.
+    Returns the uuid of the input node.
+    """
+    x = g.add_nodes('num', [{'name': 'x', 'value': 0.0}])[0]['id']
+    previous = [x] * width
+    for _ in range(depth):
+        ops = g.add_nodes('op', [{'name': 'sin'} for _ in range(width)])
+        outs = g.add_nodes('num', [{'name': 'h', 'value': 0.0} for _ in range(width)])
+        edges = []
+        for source, op, out in zip(previous, ops, outs):
+            edges.append(('num2op', source, op['id'], {'reverse': False}))
+            edges.append(('op2num', op['id'], out['id']))
+        g.add_edges(edges)
+        previous = [out['id'] for out in outs]
+    return x
+
+
+def time_updates(g, x, repeat=20):
+    g.set_node_value(x, 0.0)  # compute and cache the plan
+    start = time.perf_counter()
+    for i in range(repeat):
+        g.set_node_value(x, float(i))
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    g = Graph(os.environ['NEO4J_URI'], os.environ['NEO4J_USER'], os.environ['NEO4J_PASSWORD'], ensure_schema=True)
+
+    print(f"{'background':>10} {'depth':>6} {'width':>6} {'ms/update':>10}")
+    for background in (0, 10000, 100000):
+        g.delete_all()
+        if background:
+            build_layers(g, depth=background // 1000, width=1000)
+        for depth, width in ((1, 10), (10, 10), (100, 10), (10, 100)):
+            x = build_layers(g, depth, width)
+            print(f"{background:>10} {depth:>6} {width:>6} {time_updates(g, x) * 1000:>10.2f}")
+    g.delete_all()
+    g.close()
+
+
+if __name__ == '__main__':
+    main()
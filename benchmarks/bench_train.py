@@ -0,0 +1,41 @@
+"""
+Training throughput of the neural_network model: the per-sample loop of
+notebooks/neural_network.ipynb (Engine.forward_propagate, then Engine.backward_propagate
+with its update) against Engine.train with mini-batches.
+
+Usage:
+    python -m benchmarks.bench_train
+"""
+import time
+import numpy as np
+import networkx as nx
+
+from trengx.engine.engine import Engine
+from benchmarks.models import neural_network
+
+
+def main(samples=1000, batch_size=50, lr=0.01):
+    rng = np.random.default_rng(0)
+    xs = rng.uniform(-2.0, 2.0, samples)
+    ys = np.sin(xs)
+    print(f"{'hidden':>6} {'per sample':>14} {'Engine.train':>14} {'speedup':>8}")
+    for hidden in (1, 10):
+        G = nx.DiGraph()
+        x, y, _, _, _, _, _, e2 = neural_network(G, hidden)
+        start = time.perf_counter()
+        for x_value, y_value in zip(xs.tolist(), ys.tolist()):
+            G.nodes[y]['value'] = y_value
+            Engine.forward_propagate(G, x, x_value)
+            Engine.backward_propagate(G, e2, lr)
+        baseline = samples / (time.perf_counter() - start)
+
+        G = nx.DiGraph()
+        x, y, _, _, _, _, _, e2 = neural_network(G, hidden)
+        result = Engine.train(G, {x: xs, y: ys}, e2, batch_size=batch_size, epochs=5, lr=lr)
+        throughput = result['samples_per_second']
+
+        print(f"{hidden:>6} {baseline:>10.0f}/s {throughput:>10.0f}/s {throughput / baseline:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Updating one sensor of a model of many independent sensor chains: Engine.forward_propagate and
+Tape.run against the incremental Tape.update, whose cost follows the changed cone only.
+
+Usage:
+    python -m benchmarks.bench_update
+"""
+import time
+import networkx as nx
+
+from trengx.engine.engine import Engine
+
+
+def sensor_chains(G, sensors, stages):
+    """
+    Builds `sensors` chains of `stages` 'sin' ops. Returns the ids of the sensor nodes.
+    """
+    inputs = []
+    for i in range(sensors):
+        x, _, h = Engine.op1(G, in_name=f'x_{i}', in_value=0.0, op_name='sin', out_name=f'h_{i}_0')
+        for j in range(1, stages):
+            _, _, h = Engine.op1(G, in_id=h, op_name='sin', out_name=f'h_{i}_{j}')
+        inputs.append(x)
+    return inputs
+
+
+def time_call(f, repeat=20):
+    start = time.perf_counter()
+    for i in range(repeat):
+        f(i)
+    return (time.perf_counter() - start) / repeat
+
+
+def main(stages=10):
+    print(f"{'sensors':>7} {'forward_propagate':>18} {'tape.run':>10} {'tape.update':>12}")
+    for sensors in (10, 100, 1000, 10000):
+        G = nx.DiGraph()
+        inputs = sensor_chains(G, sensors, stages)
+        tape = Engine.compile(G)
+        tape.run()
+        x = inputs[0]
+
+        push = time_call(lambda i: Engine.forward_propagate(G, x, i * 0.01))
+        run = time_call(lambda i: tape.run({x: i * 0.01}))
+        update = time_call(lambda i: tape.update({x: i * 0.01}))
+        print(f"{sensors:>7} {push * 1e6:>16.1f}us {run * 1e6:>8.1f}us {update * 1e6:>10.1f}us")
+
+
+if __name__ == '__main__':
+    main()
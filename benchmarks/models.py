@@ -0,0 +1,5 @@
+"""
+Models shared by the engine benchmarks. They are the models of the engine tests, so that the
+benchmarks measure the graphs the tests check.
+"""
+from test.unittest.engine.models import neural_network  # noqa: F401
@@ -0,0 +1,45 @@
+import os
+import math
+import asyncio
+import pytest
+
+from trengx.engine.async_graph import AsyncGraph
+
+# .env secrets
+uri = os.environ.get('NEO4J_URI') # Get the value of the uri variable
+user = os.environ.get('NEO4J_USER') # Get the value of the user variable
+password = os.environ.get('NEO4J_PASSWORD')  # Get the value of the pw variable
+
+if not uri:
+    pytest.skip("NEO4J_URI is not set", allow_module_level=True)
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_add_and_get_node():
+    async def scenario():
+        async with AsyncGraph(uri, user, password) as g:
+            await g.delete_all()
+            node = await g.add_node('num', {'name': 'x', 'value': 2.0})
+            assert (await g.get_node(node['id']))['properties'] == {'name': 'x', 'value': 2.0}
+            assert await g.get_node_value(node['id']) == 2.0
+            assert await g.delete_node(node['id'])
+    run(scenario())
+
+
+def test_concurrent_set_node_value():
+    async def scenario():
+        async with AsyncGraph(uri, user, password, max_concurrency=4) as g:
+            await g.delete_all()
+            x = await g.add_node('num', {'name': 'x', 'value': 0.0})
+            op = await g.add_node('op', {'name': 'sin'})
+            y = await g.add_node('num', {'name': 'y', 'value': 0.0})
+            await g.add_edge('num2op', x['id'], op['id'], {'reverse': False})
+            await g.add_edge('op2num', op['id'], y['id'])
+            await asyncio.gather(*(g.set_node_value(x['id'], float(i)) for i in range(20)))
+            x_value = await g.get_node_value(x['id'])
+            assert await g.get_node_value(y['id']) == pytest.approx(math.sin(x_value))
+            await g.delete_all()
+    run(scenario())
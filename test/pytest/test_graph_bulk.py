@@ -0,0 +1,210 @@
+import os
+import math
+import pytest
+
+from trengx.engine.graph import Graph
+
+# .env secrets
+uri = os.environ.get('NEO4J_URI') # Get the value of the uri variable
+user = os.environ.get('NEO4J_USER') # Get the value of the user variable
+password = os.environ.get('NEO4J_PASSWORD')  # Get the value of the pw variable
+
+if not uri:
+    pytest.skip("NEO4J_URI is not set", allow_module_level=True)
+
+
+@pytest.fixture
+def g():
+    # Create a Graph class instance on an empty database
+    graph = Graph(uri, user, password)
+    graph.delete_all()
+    yield graph
+    graph.delete_all()
+
+
+def test_add_nodes_returns_nodes_in_input_order(g):
+    properties = [{'name': f'n{i}', 'value': float(i)} for i in range(25)]
+    nodes = g.add_nodes('num', properties, chunk_size=10)
+    assert [node['properties']['name'] for node in nodes] == [p['name'] for p in properties]
+    assert len({node['id'] for node in nodes}) == 25
+    assert g.get_node(nodes[7]['id'])['properties']['value'] == 7.0
+
+
+def test_add_nodes_does_not_mutate_properties(g):
+    properties = [{'name': 'a'}]
+    g.add_nodes('op', properties)
+    assert properties == [{'name': 'a'}]
+
+
+def test_add_nodes_with_incorrect_chunk_size(g):
+    with pytest.raises(ValueError):
+        g.add_nodes('num', [{'name': 'a'}], chunk_size=0)
+
+
+def test_add_edges_returns_edges_in_input_order(g):
+    nums = g.add_nodes('num', [{'name': 'x'}, {'name': 'y'}, {'name': 'z'}])
+    ops = g.add_nodes('op', [{'name': '+'}])
+    x, y, z = (node['id'] for node in nums)
+    op = ops[0]['id']
+    edges = g.add_edges([
+        ('num2op', x, op),
+        ('op2num', op, z),
+        ('num2op', y, op, {'reverse': True}),
+    ], chunk_size=1)
+    assert [edge['label'] for edge in edges] == ['num2op', 'op2num', 'num2op']
+    assert [(edge['out_id'], edge['in_id']) for edge in edges] == [(x, op), (op, z), (y, op)]
+    assert edges[2]['properties'] == {'reverse': True}
+    assert g.get_edge(edges[1]['id'])['in_id'] == z
+
+
+def test_add_edges_with_missing_node(g):
+    x = g.add_node('num', {'name': 'x'})
+    with pytest.raises(Exception):
+        g.add_edges([('num2op', x['id'], 'missing')])
+
+
+def test_batch_commits_on_exit(g):
+    with g.batch() as b:
+        x = b.add_node('num', {'name': 'x', 'value': 1.0})
+        b.update_node_properties(x['id'], {'value': 2.0})
+        assert b.get_node_value(x['id']) == 2.0
+    assert g.get_node_value(x['id']) == 2.0
+
+
+def test_batch_rolls_back_on_error(g):
+    with pytest.raises(RuntimeError):
+        with g.batch() as b:
+            b.add_node('num', {'name': 'x'})
+            raise RuntimeError("abort")
+    assert g.run_query("MATCH (n) RETURN count(n) AS count") == [{'count': 0}]
+
+
+def test_batch_flush_every(g):
+    with pytest.raises(RuntimeError):
+        with g.batch(flush_every=2) as b:
+            for i in range(3):
+                b.add_node('num', {'name': f'n{i}'})
+            raise RuntimeError("abort")
+    # The first two nodes were flushed before the error
+    assert g.run_query("MATCH (n) RETURN count(n) AS count") == [{'count': 2}]
+
+
+def test_ensure_schema_is_idempotent(g):
+    g.ensure_schema()
+    g.ensure_schema()
+    names = {record['name'] for record in g.run_query("SHOW CONSTRAINTS YIELD name RETURN name")}
+    assert {'num_uuid', 'op_uuid'} <= names
+    names = {record['name'] for record in g.run_query("SHOW INDEXES YIELD name RETURN name")}
+    assert {'num2op_uuid', 'op2num_uuid'} <= names
+
+
+def test_get_edge_is_directed(g):
+    x, op = g.add_node('num', {'name': 'x'}), g.add_node('op', {'name': 'sin'})
+    edge = g.add_edge('num2op', x['id'], op['id'])
+    assert g.get_edge(edge['id'])['out_id'] == x['id']
+    assert g.delete_edge(edge['id'])
+
+
+def test_stream_query_yields_records_lazily(g):
+    g.add_nodes('num', [{'name': f'n{i}', 'value': float(i)} for i in range(10)])
+    records = g.stream_query("MATCH (n:num) RETURN n.value AS value ORDER BY value", fetch_size=3)
+    assert next(records) == {'value': 0.0}
+    assert [record['value'] for record in records] == [float(i) for i in range(1, 10)]
+
+
+def test_query_columns(g):
+    g.add_nodes('num', [{'name': f'n{i}', 'value': float(i)} for i in range(5)])
+    query = "MATCH (n:num) RETURN n.name AS name, n.value AS value ORDER BY value"
+    columns = g.query_columns(query)
+    assert columns == {'name': ['n0', 'n1', 'n2', 'n3', 'n4'], 'value': [0.0, 1.0, 2.0, 3.0, 4.0]}
+    columns = g.query_columns(query, numpy=True)
+    assert columns['value'].dtype.kind == 'f'
+    assert columns['value'].sum() == 10.0
+    assert g.query_columns("MATCH (n:missing) RETURN n") == {}
+
+
+def _sin_chain(g):
+    x, y, z = g.add_nodes('num', [{'name': 'x', 'value': 0.0}, {'name': 'y', 'value': 0.0}, {'name': 'z', 'value': 0.0}])
+    sin, = g.add_nodes('op', [{'name': 'sin'}])
+    g.add_edges([('num2op', x['id'], sin['id']), ('op2num', sin['id'], y['id'])])
+    return x['id'], y['id'], z['id'], sin['id']
+
+
+def test_set_node_value_reuses_cached_plan(g):
+    x, y, _, _ = _sin_chain(g)
+    g.set_node_value(x, 1.0)
+    plan = g._plans.get(frozenset([x]))
+    assert [step['out'] for step in plan] == [y]
+    g.set_node_value(x, 2.0)
+    assert g._plans.get(frozenset([x])) is plan
+    assert g.get_node_value(y) == pytest.approx(math.sin(2.0))
+
+
+def test_add_edge_invalidates_plan(g):
+    x, y, z, _ = _sin_chain(g)
+    g.set_node_value(x, 1.0)
+    cos = g.add_node('op', {'name': 'cos'})
+    g.add_edge('num2op', y, cos['id'])
+    assert g._plans.get(frozenset([x])) is None
+    g.add_edge('op2num', cos['id'], z)
+    g.set_node_value(x, 1.0)
+    assert g.get_node_value(z) == pytest.approx(math.cos(math.sin(1.0)))
+
+
+def test_delete_edge_invalidates_plan(g):
+    x, y, _, sin = _sin_chain(g)
+    g.set_node_value(x, 1.0)
+    edge_id = g.run_query("MATCH ()-[r:op2num]->() RETURN r.uuid AS id")[0]['id']
+    g.delete_edge(edge_id)
+    assert g._plans.get(frozenset([x])) is None
+    g.set_node_value(x, 2.0)
+    assert g.get_node_value(y) == pytest.approx(math.sin(1.0))
+
+
+def test_set_node_values_propagates_union_once(g):
+    x1, x2, y = g.add_nodes('num', [{'name': 'x1', 'value': 0.0}, {'name': 'x2', 'value': 0.0}, {'name': 'y', 'value': 0.0}])
+    sub, = g.add_nodes('op', [{'name': '-'}])
+    g.add_edges([
+        ('num2op', x1['id'], sub['id'], {'reverse': False}),
+        ('num2op', x2['id'], sub['id'], {'reverse': True}),
+        ('op2num', sub['id'], y['id']),
+    ])
+    g.set_node_values({x1['id']: 5.0, x2['id']: 2.0})
+    assert g.get_node_value(y['id']) == 3.0
+    assert len(g._plans.get(frozenset([x1['id'], x2['id']]))) == 1
+
+
+def test_delete_all_in_transactions_reports_progress(g):
+    nodes = g.add_nodes('num', [{'name': f'n{i}'} for i in range(50)])
+    hub = g.add_node('op', {'name': '+'})
+    g.add_edges([('num2op', node['id'], hub['id']) for node in nodes])
+    reports = []
+    assert g.delete_all(batch_size=2, progress=lambda edges, nodes: reports.append((edges, nodes)))
+    assert reports[-1] == (50, 51)
+    assert g.run_query("MATCH (n) RETURN count(n) AS count") == [{'count': 0}]
+
+
+def test_delete_all_with_label(g):
+    g.add_nodes('num', [{'name': 'x'}, {'name': 'y'}])
+    g.add_nodes('op', [{'name': '+'}])
+    g.delete_all(batch_size=1, label='num')
+    assert g.run_query("MATCH (n) RETURN labels(n) AS labels") == [{'labels': ['op']}]
+
+
+def test_delete_node_detach_in_transactions(g):
+    hub = g.add_node('op', {'name': '+'})
+    nodes = g.add_nodes('num', [{'name': f'n{i}'} for i in range(30)])
+    g.add_edges([('num2op', node['id'], hub['id']) for node in nodes])
+    with pytest.raises(ValueError):
+        g.delete_node(hub['id'], batch_size=4)
+    reports = []
+    assert g.delete_node(hub['id'], detach=True, batch_size=4, progress=lambda edges, nodes: reports.append((edges, nodes)))
+    assert reports[-1] == (30, 1)
+    assert [edges for edges, _ in reports] == sorted(edges for edges, _ in reports)
+    assert g.run_query("MATCH ()-[r]->() RETURN count(r) AS count") == [{'count': 0}]
+
+
+def test_delete_subgraph(g):
+    x, y, z, _ = _sin_chain(g)
+    assert g.delete_subgraph(x, batch_size=1) == 3
+    assert [record['id'] for record in g.run_query("MATCH (n) RETURN n.uuid AS id")] == [z]
@@ -0,0 +1,174 @@
+import asyncio
+import pytest
+
+from trengx.engine.graph import Graph, _PlanCache, _order_plan, _propagation_plan
+from trengx.engine.async_graph import AsyncGraph
+
+
+def op(id, name, out, *inputs):
+    return {'op': id, 'name': name, 'out': out,
+            'inputs': [{'id': input, 'reverse': reverse} for input, reverse in inputs]}
+
+
+def test_order_plan_is_topological():
+    # e = (x + w) * x, listed in reverse order
+    ops = [
+        op('mul', '*', 'e', ('s', False), ('x', True)),
+        op('add', '+', 's', ('x', False), ('w', True)),
+    ]
+    plan = _order_plan(ops)
+    assert [step['op'] for step in plan] == ['add', 'mul']
+    assert plan[1] == {'in1': 's', 'in2': 'x', 'op': 'mul', 'out': 'e', 'reverse': False}
+
+
+def test_order_plan_evaluates_diamond_once():
+    ops = [
+        op('join', '+', 'z', ('a', False), ('b', True)),
+        op('left', 'sin', 'a', ('x', False)),
+        op('right', 'cos', 'b', ('x', False)),
+    ]
+    plan = _order_plan(ops)
+    assert [step['op'] for step in plan] == ['left', 'right', 'join']
+
+
+def test_order_plan_puts_non_reversed_operand_first():
+    plan = _order_plan([op('sub', '-', 'e', ('y_est', True), ('y', False))])
+    assert (plan[0]['in1'], plan[0]['in2'], plan[0]['reverse']) == ('y', 'y_est', False)
+
+
+def test_order_plan_reads_store_output_before_storing():
+    # y = x + 0.5 * y[i-1]
+    ops = [
+        op('add', '+', 'y', ('x', False), ('m', True)),
+        op('store', 'store', 'y_prev', ('y', False)),
+        op('mul', '*', 'm', ('y_prev', False), ('a', True)),
+    ]
+    plan = _order_plan(ops)
+    assert [step['op'] for step in plan] == ['mul', 'add', 'store']
+
+
+def test_order_plan_rejects_cycle_without_store():
+    ops = [
+        op('f', 'sin', 'a', ('b', False)),
+        op('g', 'cos', 'b', ('a', False)),
+    ]
+    with pytest.raises(Exception):
+        _order_plan(ops)
+
+
+def test_unknown_labels_are_rejected_before_any_query():
+    # The driver connects lazily, so no database is needed to reach the checks
+    g = Graph('bolt://localhost:7687', 'neo4j', 'password')
+    with pytest.raises(ValueError):
+        g.add_node('number', {'name': 'x'})
+    with pytest.raises(ValueError):
+        g.add_nodes('number', [{'name': 'x'}])
+    with pytest.raises(ValueError):
+        g.add_edge('feeds', 'a', 'b')
+    with pytest.raises(ValueError):
+        g.add_edges([('num2op', 'a', 'b'), ('feeds', 'b', 'c')])
+
+
+def test_delete_node_in_transactions_requires_detach():
+    g = Graph('bolt://localhost:7687', 'neo4j', 'password')
+    with pytest.raises(ValueError):
+        g.delete_node('a', batch_size=10)
+
+
+def test_plan_cache_unindexes_dropped_plans():
+    cache = _PlanCache()
+    cache.put(frozenset({'x'}), ['plan x'], {'x', 'op', 'y'})
+    cache.put(frozenset({'z'}), ['plan z'], {'z', 'op2', 'y'})
+    cache.invalidate('op')
+    assert cache.get(frozenset({'x'})) is None
+    assert cache.get(frozenset({'z'})) == ['plan z']
+    assert set(cache.index) == {'z', 'op2', 'y'}
+    cache.invalidate('y')
+    assert cache.plans == {} and cache.index == {}
+
+
+def test_plan_cache_replaces_a_plan_and_its_uuids():
+    cache = _PlanCache()
+    cache.put('key', ['old'], {'a', 'b'})
+    cache.put('key', ['new'], {'b', 'c'})
+    assert set(cache.index) == {'b', 'c'}
+    cache.invalidate('a')
+    assert cache.get('key') == ['new']
+
+
+def test_plan_cache_evicts_the_least_recently_used_plan():
+    cache = _PlanCache(max_plans=2)
+    cache.put(frozenset({'x'}), ['plan x'], {'x', 'op'})
+    cache.put(frozenset({'z'}), ['plan z'], {'z', 'op'})
+    assert cache.get(frozenset({'x'})) == ['plan x']
+    cache.put(frozenset({'x', 'z'}), ['plan xz'], {'x', 'z', 'op'})
+    assert list(cache.plans) == [frozenset({'x'}), frozenset({'x', 'z'})]
+    assert cache.index['z'] == {frozenset({'x', 'z'})}
+    with pytest.raises(ValueError):
+        _PlanCache(max_plans=0)
+
+
+def test_propagation_plan_skips_ops_writing_a_source():
+    records = [
+        {'op': 'add', 'name': '+', 'out': 'y', 'out_edge': 'e3',
+         'inputs': [{'id': 'x', 'edge': 'e1', 'reverse': False}, {'id': 'w', 'edge': 'e2', 'reverse': True}]},
+        {'op': 'sin', 'name': 'sin', 'out': 'x', 'out_edge': 'e5',
+         'inputs': [{'id': 'y', 'edge': 'e4', 'reverse': False}]},
+    ]
+    plan, uuids = _propagation_plan(records, ['x'])
+    assert [step['op'] for step in plan] == ['add']
+    assert uuids == {'x', 'y', 'w', 'add', 'sin', 'e1', 'e2', 'e3', 'e4', 'e5'}
+
+
+def test_async_set_node_value_applies_a_cached_plan():
+    g = AsyncGraph('bolt://localhost:7687', 'neo4j', 'password')
+    calls = []
+
+    async def execute(transaction_function, *args):
+        calls.append(transaction_function.__name__)
+        if transaction_function.__name__ == '_get_propagation_plan_tx':
+            return [{'in1': 'x', 'in2': None, 'op': 'sin', 'out': 'y', 'reverse': False}], {'x', 'sin', 'y'}
+
+    g._execute_read = g._execute_write = execute
+
+    async def scenario():
+        await g.set_node_value('x', 1.0)
+        await g.set_node_value('x', 2.0)
+        await g.delete_edge('sin')
+        await g.set_node_value('x', 3.0)
+
+    asyncio.run(scenario())
+    assert calls == ['_get_propagation_plan_tx', '_apply_propagation_plan_tx', '_apply_propagation_plan_tx',
+                     '_delete_edge_tx', '_get_propagation_plan_tx', '_apply_propagation_plan_tx']
+
+
+def test_async_set_node_value_skips_a_plan_invalidated_while_read():
+    g = AsyncGraph('bolt://localhost:7687', 'neo4j', 'password')
+    calls = []
+    reading, invalidated = asyncio.Event(), asyncio.Event()
+
+    async def execute(transaction_function, *args):
+        calls.append(transaction_function.__name__)
+        if transaction_function.__name__ == '_get_propagation_plan_tx':
+            if not reading.is_set():
+                # The first read is pending while an edge of its subgraph is deleted
+                reading.set()
+                await invalidated.wait()
+            return [{'in1': 'x', 'in2': None, 'op': 'sin', 'out': 'y', 'reverse': False}], {'x', 'sin', 'y'}
+
+    g._execute_read = g._execute_write = execute
+
+    async def delete_edge():
+        await reading.wait()
+        await g.delete_edge('e')
+        invalidated.set()
+
+    async def scenario():
+        await asyncio.gather(g.set_node_value('x', 1.0), delete_edge())
+        assert g._plans.plans == {}
+        await g.set_node_value('x', 2.0)
+        await g.set_node_value('x', 3.0)
+
+    asyncio.run(scenario())
+    assert calls == ['_get_propagation_plan_tx', '_delete_edge_tx', '_apply_propagation_plan_tx',
+                     '_get_propagation_plan_tx', '_apply_propagation_plan_tx', '_apply_propagation_plan_tx']
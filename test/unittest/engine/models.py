@@ -0,0 +1,53 @@
+"""
+Models shared by the engine tests and benchmarks.
+"""
+from trengx.engine.engine import Engine, Neuron, Dense
+
+
+def neural_network(G, hidden=1):
+    """
+    Builds the neuron model of notebooks/neural_network.ipynb with `hidden` neurons:
+    y_est = sum_i w2_i * ReLU(w1_i * x + b_i), e = y - y_est and e2 = e^2.
+
+    With one neuron the parameters are named 'w1', 'b' and 'w2', else 'w1_i', 'b' and 'w2_i'.
+
+    Returns:
+        tuple: The ids of the x, y, w1, b, w2, y_est, e and e2 nodes, with the w1, b and w2 of
+        the first neuron.
+    """
+    x = y_est = None
+    params = None
+    for i in range(hidden):
+        suffix = '' if hidden == 1 else f'_{i}'
+        neuron = Neuron(G)
+        inlet, b, _, outlet = neuron.get_nodes()
+        x, w1, _, _ = Engine.op2(G, in1_id=x, in1_name='x', in2_name='w1' + suffix, in2_value=0.5 + 0.01 * i, op_name='*', out_id=inlet)
+        G.nodes[b]['value'] = 0.1
+        _, w2, _, term = Engine.op2(G, in1_id=outlet, in2_name='w2' + suffix, in2_value=0.7 / hidden, op_name='*',
+                                    out_name='y_est' if hidden == 1 else f'term_{i}')
+        if y_est is None:
+            y_est = term
+        else:
+            _, _, _, y_est = Engine.op2(G, in1_id=y_est, in2_id=term, op_name='+',
+                                        out_name='y_est' if i == hidden - 1 else f'sum_{i}')
+        params = params or (w1, b, w2)
+    G.nodes[x]['value'] = 1.0
+    y, _, _, e = Engine.op2(G, in1_name='y', in1_value=2.0, in2_id=y_est, op_name='-', out_name='e')
+    _, _, e2 = Engine.op1(G, in_id=e, op_name='sqr', out_name='e2')
+    return (x, y) + params + (y_est, e, e2)
+
+
+def mlp(G, x_value, y_value):
+    """
+    Builds two dense layers and a mean squared error.
+
+    Returns:
+        tuple: The ids of the x, y and loss nodes.
+    """
+    x, _, _, h = Dense(G, 3, 4, name='1', seed=0).get_nodes()
+    _, _, _, y_est = Dense(G, 4, 2, in_id=h, activation=None, name='2', seed=1).get_nodes()
+    y, _, _, e = Engine.op2(G, in1_name='y', in1_value=y_value, in2_id=y_est, op_name='-', out_name='e')
+    _, _, e2 = Engine.op1(G, in_id=e, op_name='sqr', out_name='e2')
+    _, _, loss = Engine.op1(G, in_id=e2, op_name='mean', out_name='loss')
+    G.nodes[x]['value'] = x_value
+    return x, y, loss
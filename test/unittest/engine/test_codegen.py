@@ -0,0 +1,69 @@
+import unittest
+import numpy as np
+import networkx as nx
+from trengx.engine.engine import Engine
+from trengx.engine.codegen import generate
+from test.unittest.engine.models import neural_network
+
+
+class CodegenTestCase(unittest.TestCase):
+    def setUp(self):
+        self.G = nx.DiGraph()
+        self.x, self.y, self.w1, self.b, self.w2, self.y_est, self.e, self.e2 = neural_network(self.G)
+        self.tape = Engine.compile(self.G)
+        self.tape.values[self.tape.index[self.x]] = 1.3
+
+    def test_forward_and_backward_match_tape(self):
+        f = Engine.codegen(self.G, loss=self.e2)
+        values = f.forward(self.tape.values.tolist())
+        grads = f.backward(values)
+        np.testing.assert_allclose(values, self.tape.run())
+        np.testing.assert_allclose(grads, self.tape.backward(self.e2))
+
+    def test_numpy_matches_batch(self):
+        f = generate(self.G, loss=self.e2, numpy=True)
+        batch = self.tape.run_batch({self.x: np.array([-1.0, 0.2, 1.3])}).copy()
+        self.tape.batch_values[self.tape.index[self.y_est]] = 0.0
+        values = f.forward(self.tape.batch_values)
+        np.testing.assert_allclose(values, batch)
+        self.tape.backward_batch(self.e2)
+        np.testing.assert_allclose(f.backward(values), self.tape.batch_grads)
+
+    def test_cached_by_structure(self):
+        G = nx.DiGraph()
+        _, _, _, _, _, _, _, e2 = neural_network(G)
+        f, g = generate(self.G, loss=self.e2), generate(G, loss=e2)
+        self.assertEqual(f.key, g.key)
+        self.assertIs(f.forward, g.forward)
+        self.assertNotEqual(generate(self.G).key, f.key)
+
+    def test_ops_without_inline_template(self):
+        G = nx.DiGraph()
+        x, _, y = Engine.op1(G, in_name='x', in_value=-1.0, op_name='sqrt', out_name='y')
+        f = generate(G, loss=y)
+        with self.assertRaises(ValueError):
+            f.forward([-1.0, 0.0])
+        values = f.forward([4.0, 0.0])
+        self.assertEqual(values[f.index[y]], 2.0)
+        self.assertEqual(f.backward(values)[f.index[x]], 0.25)
+
+    def test_chained_stores_delay_by_two_runs(self):
+        for downstream_first in (False, True):
+            G = nx.DiGraph()
+            if downstream_first:
+                y, _, z = Engine.op1(G, in_name='y', in_value=0.0, op_name='store', out_name='z', out_value=0.0)
+                x, _, _ = Engine.op1(G, in_name='x', in_value=0.0, op_name='store', out_id=y)
+            else:
+                x, _, y = Engine.op1(G, in_name='x', in_value=0.0, op_name='store', out_name='y', out_value=0.0)
+                _, _, z = Engine.op1(G, in_id=y, op_name='store', out_name='z', out_value=0.0)
+            f = generate(G)
+            values, outputs = [0.0, 0.0, 0.0], []
+            for value in (1.0, 2.0, 3.0, 4.0):
+                values = f.forward(values)
+                values[f.index[x]] = value
+                outputs.append(values[f.index[z]])
+            self.assertEqual(outputs, [0.0, 0.0, 1.0, 2.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
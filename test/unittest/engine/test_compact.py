@@ -0,0 +1,88 @@
+import math
+import unittest
+from unittest import mock
+import numpy as np
+import networkx as nx
+from trengx.engine.engine import Engine
+from trengx.engine.compact import CompactGraph, STORE
+from test.unittest.engine.models import neural_network
+
+
+class CompactGraphTestCase(unittest.TestCase):
+    def setUp(self):
+        self.G = nx.DiGraph()
+        self.x, self.y, self.w1, self.b, self.w2, self.y_est, self.e, self.e2 = neural_network(self.G)
+        Engine.forward_propagate(self.G, self.y, 2.0)
+        self.C = CompactGraph.from_networkx(self.G)
+        self.index = {key: i for i, key in enumerate(self.C.keys)}
+
+    def test_round_trip(self):
+        G = self.C.to_networkx()
+        self.assertEqual(dict(G.nodes(data=True)), dict(self.G.nodes(data=True)))
+        self.assertEqual(sorted(G.edges(data=True)), sorted(self.G.edges(data=True)))
+
+    def test_forward_propagate_matches_engine(self):
+        Engine.forward_propagate(self.G, self.x, 1.3)
+        self.assertEqual(Engine.forward_propagate(self.C, self.index[self.x], 1.3), 6)
+        for node in (self.y_est, self.e, self.e2):
+            self.assertAlmostEqual(self.C.values[self.index[node]], self.G.nodes[node]['value'])
+
+    def test_backward_propagate_matches_tape(self):
+        tape = Engine.compile(self.G)
+        tape.run({self.x: 1.3})
+        tape.backward(self.e2, lr=0.1)
+        Engine.forward_propagate(self.C, self.index[self.x], 1.3)
+        grads = Engine.backward_propagate(self.C, self.index[self.e2], 0.1)
+        for node in self.G:
+            if self.G.nodes[node]['label'] == 'num':
+                self.assertAlmostEqual(grads[self.index[node]], tape.grads[tape.index[node]])
+                self.assertAlmostEqual(self.C.values[self.index[node]], tape[node])
+
+    def test_store_passes_previous_value(self):
+        C = CompactGraph()
+        x, _, x_prev = C.op1(in_name='x', in_value=0.0, op_name='store', out_name='x_prev', out_value=0.0)
+        _, _, y = C.op1(in_id=x_prev, op_name='sqr', out_name='y')
+        for value in (1.0, 2.0, 3.0):
+            C.forward_propagate(x, value)
+        self.assertEqual(C.values[x_prev], 2.0)
+        self.assertEqual(C.values[y], 4.0)
+
+    def test_store_feedback_runs_a_second_wave(self):
+        # a = x + s, s = store(a): the store output feeds the op that computes its input
+        C = CompactGraph()
+        x, s, _, a = C.op2(in1_name='x', in1_value=0.0, in2_name='s', in2_value=0.0, op_name='+', out_name='a', out_value=0.0)
+        C.op1(in_id=a, op_name='store', out_id=s)
+        self.assertEqual(C.forward_propagate(x, 1.0), 2)
+        self.assertEqual(C.values[s], 0.0)
+        self.assertEqual(C.values[a], 1.0)
+        self.assertEqual(C.forward_propagate(x, 2.0), 2)
+        self.assertEqual(C.values[s], 1.0)
+        self.assertEqual(C.values[a], 3.0)
+
+    def test_builder_grows_and_interns_names(self):
+        C = CompactGraph(capacity=1)
+        h = C.add_num('x', 0.5)
+        for _ in range(100):
+            _, _, h = C.op1(in_id=h, op_name='sin', out_name='h')
+        self.assertEqual(len(C), 201)
+        self.assertEqual(C.names, ['x', 'h', 'sin'])
+        C.forward_propagate(0, 0.5)
+        expected = 0.5
+        for _ in range(100):
+            expected = math.sin(expected)
+        self.assertAlmostEqual(C.values[h], expected)
+        self.assertEqual(C.opcodes.dtype, np.uint8)
+
+    def test_unknown_op(self):
+        with self.assertRaises(ValueError):
+            CompactGraph().add_op('nope')
+
+    def test_opcode_out_of_range(self):
+        # Opcodes 254 and 255 are reserved for 'store' and num nodes
+        with mock.patch.dict('trengx.engine.compact.OPCODES', {'late': STORE}):
+            with self.assertRaises(ValueError):
+                CompactGraph().add_op('late')
+
+
+if __name__ == '__main__':
+    unittest.main()
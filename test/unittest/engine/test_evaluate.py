@@ -0,0 +1,57 @@
+import unittest
+import networkx as nx
+from trengx.engine.engine import Engine
+from test.unittest.engine.models import neural_network
+
+
+class EvaluateTestCase(unittest.TestCase):
+    def setUp(self):
+        self.G = nx.DiGraph()
+        self.x, self.y, self.w1, self.b, self.w2, self.y_est, self.e, self.e2 = neural_network(self.G)
+
+    def test_matches_forward_propagate(self):
+        values = Engine.evaluate(self.G, [self.e2], inputs={self.x: 1.3})
+        G = nx.DiGraph()
+        x, _, _, _, _, _, _, e2 = neural_network(G)
+        Engine.forward_propagate(G, x, 1.3)
+        self.assertAlmostEqual(values[self.e2], G.nodes[e2]['value'])
+
+    def test_computes_only_ancestors(self):
+        Engine.evaluate(self.G, [self.y_est], inputs={self.x: 1.0})
+        self.assertAlmostEqual(self.G.nodes[self.y_est]['value'], (0.5 + 0.1) * 0.7)
+        self.assertIsNone(self.G.nodes[self.e]['value'])
+        self.assertNotIn(self.e, self.G.graph['memo'])
+
+    def test_memoizes_until_new_epoch(self):
+        first = Engine.evaluate(self.G, [self.y_est], inputs={self.x: 1.0})[self.y_est]
+        self.G.nodes[self.w2]['value'] = 1.0
+        self.assertEqual(Engine.evaluate(self.G, [self.y_est])[self.y_est], first)
+        Engine.new_epoch(self.G)
+        self.assertAlmostEqual(Engine.evaluate(self.G, [self.y_est])[self.y_est], 0.5 + 0.1)
+
+    def test_store_output_is_state(self):
+        G = nx.DiGraph()
+        x, _, x_prev = Engine.op1(G, in_name='x', in_value=1.0, op_name='store', out_name='x_prev', out_value=0.0)
+        _, _, y = Engine.op1(G, in_id=x_prev, op_name='sqr', out_name='y')
+        self.assertEqual(Engine.evaluate(G, [y], inputs={x: 3.0}), {y: 0.0})
+
+    def test_binary_op_without_second_operand_passes_through(self):
+        G = nx.DiGraph()
+        # Engine.op1 gives the binary '+' a single operand
+        x, _, y = Engine.op1(G, in_name='x', in_value=0.0, op_name='+', out_name='y')
+        _, _, z = Engine.op1(G, in_id=y, op_name='sqr', out_name='z')
+        values = Engine.evaluate(G, [z], inputs={x: 3.0})
+        Engine.forward_propagate(G, x, 3.0)
+        self.assertEqual(values[z], 9.0)
+        self.assertEqual(G.nodes[z]['value'], 9.0)
+
+    def test_cycle(self):
+        G = nx.DiGraph()
+        x, _, y = Engine.op1(G, in_name='x', in_value=1.0, op_name='sin', out_name='y')
+        Engine.op1(G, in_id=y, op_name='sin', out_id=x)
+        with self.assertRaises(ValueError):
+            Engine.evaluate(G, [y])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import math
+import unittest
+import networkx as nx
+from trengx.engine.engine import Engine
+
+
+def sin_chain(G, stages):
+    x = h = None
+    for i in range(stages):
+        in_id, _, h = Engine.op1(G, in_id=h, in_name='x', in_value=0.0, op_name='sin', out_name=f'h_{i}', out_value=0.0)
+        x = x if x is not None else in_id
+    return x, h
+
+
+class ForwardPropagationTestCase(unittest.TestCase):
+    def test_binary_ops(self):
+        G = nx.DiGraph()
+        x, y, _, e = Engine.op2(G, in1_name='x', in1_value=1.0, in2_name='y', in2_value=5.0, op_name='-', out_name='e')
+        _, _, e2 = Engine.op1(G, in_id=e, op_name='sqr', out_name='e2')
+        Engine.forward_propagate(G, x, 2.0)
+        self.assertEqual(G.nodes[e]['value'], 2.0 - 5.0)
+        self.assertEqual(G.nodes[e2]['value'], 9.0)
+        Engine.forward_propagate(G, y, 1.0)
+        self.assertEqual(G.nodes[e2]['value'], 1.0)
+
+    def test_store_delays_by_one_call(self):
+        G = nx.DiGraph()
+        x, _, x_prev = Engine.op1(G, in_name='x', in_value=0.0, op_name='store', out_name='x_prev', out_value=0.0)
+        _, _, y = Engine.op1(G, in_id=x_prev, op_name='sqr', out_name='y')
+        for value in (1.0, 2.0, 3.0):
+            Engine.forward_propagate(G, x, value)
+        self.assertEqual(G.nodes[x]['value'], 3.0)
+        self.assertEqual(G.nodes[x_prev]['value'], 2.0)
+        self.assertEqual(G.nodes[y]['value'], 4.0)
+
+    def test_deep_chain_does_not_recurse(self):
+        G = nx.DiGraph()
+        x, h = sin_chain(G, 20000)
+        Engine.forward_propagate(G, x, 1.0)
+        expected = 1.0
+        for _ in range(20000):
+            expected = math.sin(expected)
+        self.assertAlmostEqual(G.nodes[h]['value'], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
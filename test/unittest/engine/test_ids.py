@@ -0,0 +1,66 @@
+import uuid
+import unittest
+import networkx as nx
+from trengx.engine import ids
+from trengx.engine.engine import Engine
+from trengx.engine.node.add_node.networkx_add_node import NetworkXAddNode
+from test.unittest.engine.models import neural_network
+
+
+class IdsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.allocator = ids.get_allocator()
+
+    def tearDown(self):
+        ids.set_allocator(self.allocator)
+        ids.set_uuid_namespace()
+
+    def test_default_is_uuid(self):
+        self.assertIsNotNone(uuid.UUID(ids.new_id()))
+
+    def test_counter(self):
+        ids.set_allocator('counter')
+        G = nx.DiGraph()
+        x, y, w1, b, w2, y_est, e, e2 = neural_network(G)
+        self.assertEqual(sorted(G.nodes), list(range(G.number_of_nodes())))
+        Engine.forward_propagate(G, x, 1.0)
+        tape = Engine.compile(G)
+        tape.run({x: 1.0})
+        self.assertAlmostEqual(tape[e2], G.nodes[e2]['value'])
+
+    def test_compact64(self):
+        ids.set_allocator('compact64')
+        values = [ids.new_id() for _ in range(1000)]
+        self.assertEqual(len(set(values)), 1000)
+        self.assertTrue(all(isinstance(value, int) and 0 <= value < 2 ** 64 for value in values))
+
+    def test_custom_allocator(self):
+        ids.set_allocator(iter('abc').__next__)
+        node = NetworkXAddNode(nx.DiGraph(), {'label': 'num'})
+        self.assertEqual(node.id, 'a')
+
+    def test_unknown_allocator(self):
+        with self.assertRaises(ValueError):
+            ids.set_allocator('nope')
+
+    def test_to_uuid(self):
+        self.assertEqual(ids.to_uuid('abc'), 'abc')
+        self.assertEqual(ids.to_uuid(42), ids.to_uuid(42))
+        self.assertNotEqual(ids.to_uuid(42), ids.to_uuid(43))
+        self.assertEqual(str(uuid.UUID(ids.to_uuid(42))), ids.to_uuid(42))
+
+    def test_to_uuid_is_deterministic(self):
+        # The same int is persisted with the same UUID by every process
+        self.assertEqual(ids.to_uuid(42), str(uuid.uuid5(ids.DEFAULT_UUID_NAMESPACE, '42')))
+        default = ids.to_uuid(42)
+        ids.set_uuid_namespace('0f0e6a1c-3b5d-4e2f-8a9b-1c2d3e4f5a6b')
+        self.assertNotEqual(ids.to_uuid(42), default)
+        self.assertEqual(ids.get_uuid_namespace(), uuid.UUID('0f0e6a1c-3b5d-4e2f-8a9b-1c2d3e4f5a6b'))
+        ids.set_uuid_namespace()
+        self.assertEqual(ids.to_uuid(42), default)
+        with self.assertRaises(ValueError):
+            ids.set_uuid_namespace('nope')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import math
+import unittest
+import numpy as np
+import networkx as nx
+from trengx.engine import ops
+from trengx.engine.engine import Engine
+from trengx.engine.tape import compile
+
+
+_REGISTRY = ('OPS', 'FORWARD', 'BACKWARD', 'FORWARD_BATCH', 'BACKWARD_BATCH', 'FORWARD_TENSOR', 'BACKWARD_TENSOR')
+
+
+class OpsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.registry = {name: list(getattr(ops, name)) for name in _REGISTRY}
+        self.opcodes = dict(ops.OPCODES)
+
+    def tearDown(self):
+        # The registry is shared by every module, so it is restored in place
+        for name, kernels in self.registry.items():
+            getattr(ops, name)[:] = kernels
+        ops.OPCODES.clear()
+        ops.OPCODES.update(self.opcodes)
+        ops._cypher_case = None
+
+    def test_kernels_match_finite_differences(self):
+        h = 1e-6
+        for op in ops.OPS:
+            if op.name in {'sign', 'ceil', 'floor', 'round'}:
+                continue
+            forward, backward = ops.FORWARD[op.code], ops.BACKWARD[op.code]
+            x, y = 0.7, 1.3
+            dx, dy = backward(x, y, 1.0)
+            self.assertAlmostEqual(dx, (forward(x + h, y) - forward(x - h, y)) / (2 * h), places=5, msg=op.name)
+            if op.arity == 2:
+                self.assertAlmostEqual(dy, (forward(x, y + h) - forward(x, y - h)) / (2 * h), places=5, msg=op.name)
+
+    def test_batch_kernels_match_scalar_kernels(self):
+        xs, ys = np.array([0.3, 1.7, 2.5]), np.array([1.1, -0.4, 2.0])
+        for op in ops.OPS:
+            values = ops.FORWARD_BATCH[op.code](xs, ys)
+            grads = ops.BACKWARD_BATCH[op.code](xs, ys, np.ones(3))
+            for i in range(3):
+                self.assertAlmostEqual(values[i], ops.FORWARD[op.code](xs[i], ys[i]), msg=op.name)
+                dx, dy = ops.BACKWARD[op.code](xs[i], ys[i], 1.0)
+                self.assertAlmostEqual(np.broadcast_to(grads[0], 3)[i], dx, msg=op.name)
+                if op.arity == 2:
+                    self.assertAlmostEqual(grads[1][i], dy, msg=op.name)
+
+    def test_domain_errors(self):
+        for name, x in (('log', 0.0), ('log10', -1.0), ('sqrt', -1.0)):
+            with self.assertRaises(ValueError):
+                ops.FORWARD[ops.opcode(name)](x, None)
+        with self.assertRaises(ValueError):
+            ops.FORWARD[ops.opcode('/')](1.0, 0.0)
+
+    def test_unknown_op(self):
+        with self.assertRaises(ValueError):
+            ops.opcode('nope')
+
+    def test_register(self):
+        name = 'cube_test'
+        op = ops.register(name, 1, lambda x, y: x ** 3, lambda x, y, g: (3 * x * x * g, 0.0), cypher='{x}^3')
+        self.assertEqual(ops.opcode(name), op.code)
+        self.assertIn(f"WHEN op.name = '{name}' THEN in1.value^3", ops.cypher_case())
+        with self.assertRaises(ValueError):
+            ops.register(name, 1, lambda x, y: x, lambda x, y, g: (g, 0.0))
+
+        G = nx.DiGraph()
+        x, _, y = Engine.op1(G, in_name='x', in_value=2.0, op_name=name, out_name='y')
+        tape = compile(G)
+        tape.run()
+        self.assertEqual(tape[y], 8.0)
+        tape.backward(y)
+        self.assertEqual(tape.grads[tape.index[x]], 12.0)
+        np.testing.assert_allclose(tape.run_batch({x: np.array([1.0, 3.0])})[tape.index[y]], [1.0, 27.0])
+        Engine.forward_propagate(G, x, 3.0)
+        self.assertEqual(G.nodes[y]['value'], 27.0)
+
+    def test_register_is_undone_by_tear_down(self):
+        # Runs after test_register, in the alphabetical order of unittest
+        self.assertNotIn('cube_test', ops.OPCODES)
+        self.assertEqual(len(ops.OPS), len(ops.FORWARD))
+        self.assertNotIn("'cube_test'", ops.cypher_case())
+
+    def test_forward_propagate_uses_registry(self):
+        G = nx.DiGraph()
+        x, _, y = Engine.op1(G, in_name='x', in_value=0.0, op_name='exp', out_name='y')
+        _, _, z = Engine.op1(G, in_id=y, op_name='cos', out_name='z')
+        Engine.forward_propagate(G, x, 1.0)
+        self.assertAlmostEqual(G.nodes[z]['value'], math.cos(math.e))
+
+    def test_cypher_case_orders_reversed_operands(self):
+        case = ops.cypher_case()
+        self.assertIn("WHEN op.name = '-' AND coalesce(is_reverse, false) THEN in2.value - in1.value", case)
+        self.assertIn("WHEN op.name = 'store' THEN in1.value", case)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import numpy as np
+import networkx as nx
+from trengx.engine import optim
+from trengx.engine.engine import Engine
+from trengx.engine.tape import compile
+from test.unittest.engine.models import neural_network, mlp
+
+
+class OptimTestCase(unittest.TestCase):
+    def setUp(self):
+        self.grads = [np.array([0.5, -1.0]), np.array([0.2, 0.3])]
+
+    def test_sgd(self):
+        params = optim.SGD(lr=0.1).step(np.array([1.0, 2.0]), self.grads[0])
+        np.testing.assert_allclose(params, [0.95, 2.1])
+
+    def test_momentum(self):
+        optimizer = optim.Momentum(lr=0.1, momentum=0.9)
+        params = np.array([1.0, 2.0])
+        for grads in self.grads:
+            optimizer.step(params, grads)
+        velocity = 0.9 * self.grads[0] + self.grads[1]
+        np.testing.assert_allclose(params, [1.0, 2.0] - 0.1 * self.grads[0] - 0.1 * velocity)
+
+    def test_rmsprop(self):
+        optimizer = optim.RMSProp(lr=0.1, rho=0.9, eps=0.0)
+        params = optimizer.step(np.array([1.0, 2.0]), self.grads[0])
+        square = 0.1 * self.grads[0] ** 2
+        np.testing.assert_allclose(params, [1.0, 2.0] - 0.1 * self.grads[0] / np.sqrt(square))
+
+    def test_adam(self):
+        optimizer = optim.Adam(lr=0.1, eps=0.0)
+        params = np.array([1.0, 2.0])
+        mean = square = 0.0
+        expected = params.copy()
+        for t, grads in enumerate(self.grads, start=1):
+            optimizer.step(params, grads)
+            mean = 0.9 * mean + 0.1 * grads
+            square = 0.999 * square + 0.001 * grads ** 2
+            expected -= 0.1 * (mean / (1 - 0.9 ** t)) / np.sqrt(square / (1 - 0.999 ** t))
+        np.testing.assert_allclose(params, expected)
+        self.assertEqual(optimizer.t, 2)
+
+    def test_state_shape_is_checked(self):
+        optimizer = optim.Adam()
+        optimizer.step(np.zeros(2), np.ones(2))
+        with self.assertRaises(ValueError):
+            optimizer.step(np.zeros(3), np.ones(3))
+        optimizer.reset()
+        optimizer.step(np.zeros(3), np.ones(3))
+
+    def test_base_class_is_abstract(self):
+        with self.assertRaises(TypeError):
+            optim.Optimizer(0.1)
+
+    def test_get_optimizer(self):
+        self.assertIsInstance(optim.get_optimizer(), optim.SGD)
+        self.assertEqual(optim.get_optimizer('adam', lr=0.5).lr, 0.5)
+        with self.assertRaises(ValueError):
+            optim.get_optimizer('lbfgs')
+
+    def test_apply_flattens_tensor_values(self):
+        values = [np.ones((2, 2)), 3.0, np.zeros(2)]
+        grads = [np.full((2, 2), 2.0), 1.0, None]
+        optim.apply(optim.SGD(lr=0.5), values, grads, [0, 1, 2])
+        np.testing.assert_allclose(values[0], np.zeros((2, 2)))
+        self.assertEqual(values[1], 2.5)
+        np.testing.assert_allclose(values[2], np.zeros(2))
+
+    def test_tape_and_backward_propagate_agree(self):
+        G = nx.DiGraph()
+        x, _, w1, b, w2, _, _, e2 = neural_network(G)
+        Engine.forward_propagate(G, x, 1.3)
+        tape = compile(G)
+        tape.run()
+        tape.backward(e2, lr=optim.Adam(lr=0.1))
+        Engine.backward_propagate(G, e2, optim.Adam(lr=0.1))
+        for node in (w1, b, w2):
+            self.assertAlmostEqual(G.nodes[node]['value'], tape[node])
+
+    def test_train_with_optimizers(self):
+        rng = np.random.default_rng(0)
+        G = nx.DiGraph()
+        xs, ys = rng.normal(size=(64, 3)), rng.normal(size=(64, 2))
+        x, y, loss = mlp(G, xs[:1], ys[:1])
+        result = Engine.train(G, {x: xs, y: ys}, loss, batch_size=16, epochs=20, optimizer=optim.Adam(lr=0.01))
+        self.assertLess(result['epoch_loss'][-1], result['epoch_loss'][0])
+        self.assertEqual(result['optimizer'].t, 80)
+
+
+if __name__ == '__main__':
+    unittest.main()
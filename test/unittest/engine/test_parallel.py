@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+import networkx as nx
+from trengx.engine.engine import Engine
+from test.unittest.engine.models import neural_network, mlp
+
+
+class ParallelTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.xs = rng.uniform(-1, 1, 200)
+        self.ys = 2.0 * self.xs + 0.5
+
+    def train(self, workers, optimizer=None):
+        G = nx.DiGraph()
+        x, y, w1, b, w2, _, _, e2 = neural_network(G)
+        result = Engine.train(G, {x: self.xs, y: self.ys}, e2, batch_size=64, epochs=3, lr=0.05,
+                              optimizer=optimizer, workers=workers)
+        return result, [G.nodes[node]['value'] for node in (w1, b, w2)]
+
+    def test_workers_match_one_process(self):
+        expected, expected_params = self.train(1, optimizer='adam')
+        result, params = self.train(3, optimizer='adam')
+        self.assertEqual(result['workers'], 3)
+        self.assertEqual(result['samples'], 600)
+        np.testing.assert_allclose(result['loss'], expected['loss'])
+        np.testing.assert_allclose(result['epoch_loss'], expected['epoch_loss'])
+        np.testing.assert_allclose(params, expected_params)
+
+    def test_more_workers_than_samples_per_batch(self):
+        G = nx.DiGraph()
+        x, y, _, _, _, _, _, e2 = neural_network(G)
+        result = Engine.train(G, {x: self.xs[:3], y: self.ys[:3]}, e2, batch_size=2, workers=4)
+        self.assertEqual(len(result['loss']), 2)
+
+    def test_worker_errors_are_raised(self):
+        G = nx.DiGraph()
+        x, _, _, p = Engine.op2(G, in1_name='x', in2_name='w', op_name='*', out_name='p', in2_value=1.0)
+        _, _, loss = Engine.op1(G, in_id=p, op_name='log', out_name='loss')
+        for workers in (1, 2):
+            with self.assertRaisesRegex(ValueError, 'Log of non-positive number -1.0'):
+                Engine.train(G, {x: np.array([1.0, 2.0, -1.0, 3.0])}, loss, batch_size=4, workers=workers)
+
+    def test_unsupported_inputs_raise(self):
+        G = nx.DiGraph()
+        x, y, _, _, _, _, _, e2 = neural_network(G)
+        with self.assertRaises(ValueError):
+            Engine.train(G, [{x: 1.0, y: 2.0}], e2, workers=2)
+        with self.assertRaises(ValueError):
+            Engine.train(G, {x: self.xs}, e2, workers=0)
+        G = nx.DiGraph()
+        x, y, loss = mlp(G, np.zeros((1, 3)), np.zeros((1, 2)))
+        with self.assertRaises(ValueError):
+            Engine.train(G, {x: np.zeros((4, 3)), y: np.zeros((4, 2))}, loss, workers=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+import networkx as nx
+from trengx.engine.engine import Engine
+from trengx.engine.tape import compile
+from trengx.engine.compact import CompactGraph
+from test.unittest.engine.models import neural_network
+
+
+class ParamsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.G = nx.DiGraph()
+        self.x, self.y, self.w1, self.b, self.w2, self.y_est, self.e, self.e2 = neural_network(self.G)
+        Engine.forward_propagate(self.G, self.x, 1.3)
+
+    def test_default_params_follow_the_names(self):
+        self.assertEqual(set(Engine.get_params(self.G)), {self.w1, self.b, self.w2})
+
+    def test_registered_params_replace_the_names(self):
+        G = nx.DiGraph()
+        x, beta, _, y = Engine.op2(G, in1_name='x', in1_value=2.0, in2_name='beta', in2_value=3.0, op_name='*', out_name='y')
+        _, scale, _, z = Engine.op2(G, in1_id=y, in2_name='scale', in2_value=0.5, op_name='*', out_name='z')
+        Engine.set_params(G, [scale])
+        Engine.add_params(G, scale)
+        self.assertEqual(Engine.get_params(G), [scale])
+        self.assertEqual(compile(G).params.tolist(), [compile(G).index[scale]])
+
+    def test_backward_propagate_matches_tape(self):
+        tape = compile(self.G)
+        tape.run()
+        tape.backward(self.e2, lr=0.1)
+        Engine.backward_propagate(self.G, self.e2, 0.1)
+        for node in (self.w1, self.b, self.w2):
+            self.assertAlmostEqual(self.G.nodes[node]['grad'], tape.grads[tape.index[node]])
+            self.assertAlmostEqual(self.G.nodes[node]['value'], tape[node])
+
+    def test_designated_loss_is_the_default(self):
+        Engine.set_loss(self.G, self.e2)
+        Engine.set_params(self.G, [self.w2])
+        tape = compile(self.G)
+        tape.run()
+        grads = tape.backward()
+        self.assertEqual(tape.loss, tape.index[self.e2])
+        Engine.backward_propagate(self.G, lr=0.1)
+        self.assertAlmostEqual(self.G.nodes[self.w2]['grad'], grads[tape.index[self.w2]])
+        self.assertEqual(self.G.nodes[self.w1]['value'], 0.5)
+
+    def test_compact_graph_keeps_the_registry(self):
+        Engine.set_loss(self.G, self.e2)
+        Engine.set_params(self.G, [self.b])
+        C = CompactGraph.from_networkx(self.G)
+        index = {key: i for i, key in enumerate(C.keys)}
+        before = C.values.copy()
+        grads = C.backward_propagate(lr=0.1)
+        changed = np.flatnonzero(~np.isclose(C.values, before, equal_nan=True)).tolist()
+        self.assertEqual(changed, [index[self.b]])
+        self.assertAlmostEqual(C.values[index[self.b]], before[index[self.b]] - 0.1 * grads[index[self.b]])
+
+    def test_invalid_registrations_raise(self):
+        op = next(iter(self.G.predecessors(self.e2)))
+        with self.assertRaises(ValueError):
+            Engine.set_params(self.G, [op])
+        with self.assertRaises(ValueError):
+            Engine.set_loss(self.G, 'missing')
+        with self.assertRaises(ValueError):
+            compile(self.G).backward()
+        with self.assertRaises(ValueError):
+            Engine.backward_propagate(self.G)
+
+
+if __name__ == '__main__':
+    unittest.main()
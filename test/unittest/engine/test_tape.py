@@ -0,0 +1,172 @@
+import math
+import unittest
+import numpy as np
+import networkx as nx
+from trengx.engine.engine import Engine
+from trengx.engine.tape import compile
+from test.unittest.engine.models import neural_network
+
+
+class TapeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.G = nx.DiGraph()
+        self.x, self.y, self.w1, self.b, self.w2, self.y_est, self.e, self.e2 = neural_network(self.G)
+
+    def test_run_matches_forward_propagate(self):
+        tape = compile(self.G)
+        tape.run({self.x: 1.3})
+        Engine.forward_propagate(self.G, self.x, 1.3)
+        for node in (self.y_est, self.e, self.e2):
+            self.assertAlmostEqual(tape[node], self.G.nodes[node]['value'])
+
+    def test_ops_are_topologically_sorted(self):
+        tape = compile(self.G)
+        computed = set()
+        for a, b, o in zip(tape.in1, tape.in2, tape.out):
+            for operand in (a, b):
+                if operand >= 0 and operand in set(tape.out):
+                    self.assertIn(operand, computed)
+            computed.add(o)
+
+    def test_reverse_operand_is_second(self):
+        tape = compile(self.G)
+        tape.run({self.x: 1.0, self.y: 10.0})
+        self.assertAlmostEqual(tape[self.e], 10.0 - tape[self.y_est])
+
+    def test_write_back(self):
+        tape = compile(self.G)
+        tape.run({self.x: 1.0})
+        tape.write_back(self.G)
+        self.assertAlmostEqual(self.G.nodes[self.e2]['value'], tape[self.e2])
+
+    def test_store_delays_by_one_run(self):
+        G = nx.DiGraph()
+        x, _, x_prev = Engine.op1(G, in_name='x', in_value=0.0, op_name='store', out_name='x_prev', out_value=0.0)
+        tape = compile(G)
+        for value in (1.0, 2.0, 3.0):
+            tape.run({x: value})
+        self.assertEqual(tape[x_prev], 2.0)
+
+    def test_chained_stores_delay_by_two_runs(self):
+        for downstream_first in (False, True):
+            G = nx.DiGraph()
+            if downstream_first:
+                y, _, z = Engine.op1(G, in_name='y', in_value=0.0, op_name='store', out_name='z', out_value=0.0)
+                x, _, _ = Engine.op1(G, in_name='x', in_value=0.0, op_name='store', out_id=y)
+            else:
+                x, _, y = Engine.op1(G, in_name='x', in_value=0.0, op_name='store', out_name='y', out_value=0.0)
+                _, _, z = Engine.op1(G, in_id=y, op_name='store', out_name='z', out_value=0.0)
+            tape = compile(G)
+            # Each run latches the values of the previous one, then sets the new input
+            outputs = []
+            for value in (1.0, 2.0, 3.0, 4.0):
+                tape.run({x: value})
+                outputs.append(tape[z])
+            self.assertEqual(outputs, [0.0, 0.0, 1.0, 2.0])
+
+    def test_backward_matches_finite_differences(self):
+        tape = compile(self.G)
+        tape.run({self.x: 1.3})
+        grads = tape.backward(self.e2).copy()
+        for node in (self.w1, self.b, self.w2):
+            value = tape[node]
+            h = 1e-6
+            tape.values[tape.index[node]] = value + h
+            up = tape.run({self.x: 1.3})[tape.index[self.e2]]
+            tape.values[tape.index[node]] = value - h
+            down = tape.run({self.x: 1.3})[tape.index[self.e2]]
+            tape.values[tape.index[node]] = value
+            self.assertAlmostEqual(grads[tape.index[node]], (up - down) / (2 * h), places=5)
+
+    def test_backward_accumulates_over_diamond(self):
+        G = nx.DiGraph()
+        x, _, a = Engine.op1(G, in_name='x', in_value=0.3, op_name='sin', out_name='a')
+        _, _, c = Engine.op1(G, in_id=x, op_name='sin', out_name='c')
+        _, _, _, e2 = Engine.op2(G, in1_id=a, in2_id=c, op_name='*', out_name='e2')
+        tape = compile(G)
+        tape.run()
+        tape.backward(e2)
+        self.assertAlmostEqual(tape.grads[tape.index[x]], 2 * math.sin(0.3) * math.cos(0.3))
+
+    def test_backward_updates_params(self):
+        tape = compile(self.G)
+        tape.run({self.x: 1.0})
+        before = tape.values.copy()
+        grads = tape.backward(self.e2, lr=0.1)
+        names = [tape.names[i] for i in tape.params]
+        self.assertEqual(sorted(names), ['b', 'w1', 'w2'])
+        for i in range(len(before)):
+            expected = before[i] - 0.1 * grads[i] if i in set(tape.params) else before[i]
+            self.assertAlmostEqual(tape.values[i], expected)
+        loss = tape[self.e2]
+        tape.run({self.x: 1.0})
+        self.assertLess(tape[self.e2], loss)
+
+    def test_update_matches_run(self):
+        tape = compile(self.G)
+        tape.run({self.x: 1.0})
+        self.assertEqual(tape.update({self.x: 1.3}), len(tape.op_ids))
+        expected = compile(self.G).run({self.x: 1.3})
+        np.testing.assert_allclose(tape.values, expected)
+
+    def test_update_recomputes_cone_once(self):
+        G = nx.DiGraph()
+        x, _, a = Engine.op1(G, in_name='x', in_value=0.3, op_name='sin', out_name='a')
+        _, _, c = Engine.op1(G, in_id=x, op_name='sin', out_name='c')
+        _, _, _, d = Engine.op2(G, in1_id=a, in2_id=c, op_name='*', out_name='d')
+        Engine.op1(G, in_name='z', in_value=0.0, op_name='sin', out_name='s')
+        tape = compile(G)
+        tape.run()
+        self.assertEqual(tape.update({x: 0.5}), 3)
+        self.assertAlmostEqual(tape[d], math.sin(0.5) ** 2)
+
+    def test_update_early_cutoff(self):
+        G = nx.DiGraph()
+        x, _, r = Engine.op1(G, in_name='x', in_value=-1.0, op_name='ReLU', out_name='r')
+        _, _, y = Engine.op1(G, in_id=r, op_name='sin', out_name='y')
+        tape = compile(G)
+        tape.run()
+        self.assertEqual(tape.update({x: -2.0}, tol=0.0), 1)
+        self.assertEqual(tape.update({x: -3.0}), 2)
+        self.assertEqual(tape.update({x: 2.0}, tol=0.0), 2)
+        self.assertAlmostEqual(tape[y], math.sin(2.0))
+
+    def test_run_batch_matches_run(self):
+        tape = compile(self.G)
+        xs = np.array([-1.0, 0.2, 1.3])
+        batch = tape.run_batch({self.x: xs}).copy()
+        for column, x in enumerate(xs):
+            np.testing.assert_allclose(batch[:, column], tape.run({self.x: x}))
+
+    def test_backward_batch_averages_gradients(self):
+        tape = compile(self.G)
+        xs = np.array([-1.0, 0.2, 1.3])
+        tape.run_batch({self.x: xs})
+        grads = tape.backward_batch(self.e2).copy()
+        expected = np.zeros_like(grads)
+        for x in xs:
+            tape.run({self.x: x})
+            expected += tape.backward(self.e2) / len(xs)
+        np.testing.assert_allclose(grads, expected)
+
+    def test_backward_batch_updates_params(self):
+        tape = compile(self.G)
+        xs, ys = np.linspace(0.0, 1.0, 8), np.linspace(1.0, 2.0, 8)
+        loss = tape.run_batch({self.x: xs, self.y: ys})[tape.index[self.e2]].mean()
+        tape.backward_batch(self.e2, lr=0.1)
+        self.assertLess(tape.run_batch({self.x: xs, self.y: ys})[tape.index[self.e2]].mean(), loss)
+
+    def test_run_batch_with_mismatched_inputs(self):
+        tape = compile(self.G)
+        with self.assertRaises(ValueError):
+            tape.run_batch({self.x: np.zeros(3), self.y: np.zeros(4)})
+
+    def test_unknown_op(self):
+        G = nx.DiGraph()
+        Engine.op1(G, in_name='x', in_value=0.0, op_name='nope', out_name='y')
+        with self.assertRaises(ValueError):
+            compile(G)
+
+
+if __name__ == '__main__':
+    unittest.main()
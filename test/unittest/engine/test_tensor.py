@@ -0,0 +1,78 @@
+import unittest
+import numpy as np
+import networkx as nx
+from trengx.engine import ops
+from trengx.engine.engine import Engine, Dense
+from test.unittest.engine.models import mlp
+
+
+class TensorTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        self.x_value = rng.normal(size=(5, 3))
+        self.y_value = rng.normal(size=(5, 2))
+        self.G = nx.DiGraph()
+        self.x, self.y, self.loss = mlp(self.G, self.x_value, self.y_value)
+
+    def test_dense_adds_a_handful_of_nodes(self):
+        G = nx.DiGraph()
+        Dense(G, 100, 100)
+        self.assertEqual(G.number_of_nodes(), 9)
+
+    def test_tape_matches_numpy(self):
+        tape = Engine.compile(self.G)
+        self.assertTrue(tape.tensor)
+        tape.run()
+        w1, b1, w2, b2 = (tape.values[tape.names.index(name)] for name in ('w1', 'b1', 'w2', 'b2'))
+        y_est = np.maximum(self.x_value @ w1 + b1, 0.0) @ w2 + b2
+        self.assertAlmostEqual(tape[self.loss], np.mean((self.y_value - y_est) ** 2))
+
+    def test_gradients_match_finite_differences(self):
+        tape = Engine.compile(self.G)
+        tape.run()
+        grads = tape.backward(self.loss)
+        h = 1e-6
+        for name in ('w1', 'b1', 'w2', 'b2'):
+            i = tape.names.index(name)
+            self.assertEqual(np.shape(grads[i]), tape.values[i].shape)
+            value = tape.values[i]
+            for position in np.ndindex(value.shape):
+                value[position] += h
+                up = tape.run()[tape.index[self.loss]]
+                value[position] -= 2 * h
+                down = tape.run()[tape.index[self.loss]]
+                value[position] += h
+                self.assertAlmostEqual(grads[i][position], (up - down) / (2 * h), places=5)
+
+    def test_training_reduces_loss(self):
+        tape = Engine.compile(self.G)
+        losses = []
+        for _ in range(50):
+            losses.append(tape.run()[tape.index[self.loss]])
+            tape.backward(self.loss, lr=0.05)
+        self.assertLess(losses[-1], losses[0])
+
+    def test_forward_propagate_and_evaluate(self):
+        tape = Engine.compile(self.G)
+        tape.run()
+        Engine.forward_propagate(self.G, self.x, self.x_value)
+        self.assertAlmostEqual(self.G.nodes[self.loss]['value'], tape[self.loss])
+        Engine.new_epoch(self.G)
+        self.assertAlmostEqual(Engine.evaluate(self.G, [self.loss])[self.loss], tape[self.loss])
+
+    def test_unbroadcast(self):
+        self.assertEqual(ops.unbroadcast(np.ones((5, 3)), np.zeros(3)).tolist(), [5.0, 5.0, 5.0])
+        self.assertEqual(ops.unbroadcast(np.ones((5, 3)), np.zeros((1, 3))).shape, (1, 3))
+        self.assertEqual(ops.unbroadcast(np.ones((5, 3)), 2.0), 15.0)
+
+    def test_matmul_vector_gradients(self):
+        x, w, g = np.array([1.0, 2.0]), np.array([[1.0, 0.0, 2.0], [0.5, 1.0, 0.0]]), np.array([1.0, 1.0, 1.0])
+        code = ops.opcode('matmul')
+        np.testing.assert_allclose(ops.FORWARD_TENSOR[code](x, w), [2.0, 2.0, 2.0])
+        dx, dw = ops.BACKWARD_TENSOR[code](x, w, g)
+        np.testing.assert_allclose(dx, [3.0, 1.5])
+        np.testing.assert_allclose(dw, [[1.0, 1.0, 1.0], [2.0, 2.0, 2.0]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+import networkx as nx
+from trengx.engine.engine import Engine
+from trengx.engine.tape import compile
+from test.unittest.engine.models import neural_network, mlp
+
+
+class TrainTestCase(unittest.TestCase):
+    def setUp(self):
+        self.G = nx.DiGraph()
+        self.x, self.y, self.w1, self.b, self.w2, self.y_est, self.e, self.e2 = neural_network(self.G)
+        rng = np.random.default_rng(0)
+        self.xs = rng.uniform(-1, 1, 100)
+        self.ys = 2.0 * self.xs + 0.5
+
+    def test_one_batch_matches_backward_batch(self):
+        tape = compile(self.G)
+        tape.run_batch({self.x: self.xs, self.y: self.ys})
+        expected = tape.values.copy()
+        tape.backward_batch(self.e2, lr=0.01)
+        expected[tape.params] = tape.values[tape.params]
+
+        Engine.train(self.G, {self.x: self.xs, self.y: self.ys}, self.e2, batch_size=100, lr=0.01)
+        for node in (self.w1, self.b, self.w2):
+            self.assertAlmostEqual(self.G.nodes[node]['value'], expected[tape.index[node]])
+
+    def test_loss_decreases(self):
+        result = Engine.train(self.G, {self.x: self.xs, self.y: self.ys}, self.e2, batch_size=10, epochs=20, lr=0.05)
+        self.assertEqual(len(result['loss']), 200)
+        self.assertEqual(result['samples'], 2000)
+        self.assertLess(result['epoch_loss'][-1], result['epoch_loss'][0])
+        self.assertGreater(result['samples_per_second'], 0)
+
+    def test_iterable_matches_arrays(self):
+        samples = [{self.x: x, self.y: y} for x, y in zip(self.xs, self.ys)]
+        H = nx.DiGraph()
+        x, y, w1, b, w2, _, _, e2 = neural_network(H)
+        by_arrays = Engine.train(self.G, {self.x: self.xs, self.y: self.ys}, self.e2, batch_size=32, epochs=2)
+        by_samples = Engine.train(H, [{x: s[self.x], y: s[self.y]} for s in samples], e2, batch_size=32, epochs=2)
+        np.testing.assert_allclose(by_samples['loss'], by_arrays['loss'])
+        self.assertAlmostEqual(H.nodes[w1]['value'], self.G.nodes[self.w1]['value'])
+
+    def test_only_given_params_are_trained(self):
+        Engine.train(self.G, {self.x: self.xs, self.y: self.ys}, self.e2, params=[self.w2], batch_size=10)
+        self.assertEqual(self.G.nodes[self.w1]['value'], 0.5)
+        self.assertNotEqual(self.G.nodes[self.w2]['value'], 0.7)
+
+    def test_invalid_arguments_raise(self):
+        with self.assertRaises(ValueError):
+            Engine.train(self.G, {self.x: self.xs, self.y: self.ys[:10]}, self.e2)
+        with self.assertRaises(ValueError):
+            Engine.train(self.G, iter([{self.x: 1.0, self.y: 2.0}]), self.e2, epochs=2)
+        with self.assertRaises(ValueError):
+            Engine.train(self.G, {self.x: self.xs, self.y: self.ys}, self.e2, batch_size=0)
+
+    def test_tensor_graph(self):
+        rng = np.random.default_rng(1)
+        G = nx.DiGraph()
+        xs, ys = rng.normal(size=(64, 3)), rng.normal(size=(64, 2))
+        x, y, loss = mlp(G, xs[:1], ys[:1])
+        result = Engine.train(G, {x: xs, y: ys}, loss, batch_size=16, epochs=30, lr=0.05)
+        self.assertEqual(len(result['loss']), 120)
+        self.assertLess(result['epoch_loss'][-1], result['epoch_loss'][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,523 @@
+# AsyncGraph class
+import asyncio
+import uuid
+from typing import Optional, List, Dict, Any
+from neo4j import AsyncGraphDatabase as async_graphdb
+
+from .graph import (NODE_LABELS, EDGE_LABELS, NODE_LABEL_EXPRESSION, EDGE_LABEL_EXPRESSION, PROPAGATION_PLAN_QUERY,
+                    MAX_PLANS, apply_propagation_plan_query, _propagation_plan, _PlanCache)
+
+
+def _node_to_dict(node) -> dict:
+    """
+    Converts a Neo4j node into the {'id', 'label', 'properties'} dictionary returned by Graph.
+    """
+    node_properties = dict(node.items())
+    del node_properties['uuid']
+    return {'id': node['uuid'], 'label': list(node.labels), 'properties': node_properties}
+
+
+class AsyncGraph:
+    """
+    This class is the asyncio counterpart of Graph, built on the async Neo4j driver.
+
+    Every method is a coroutine, so many node updates can be in flight concurrently
+    without blocking the event loop. At most `max_concurrency` operations hold a
+    session at the same time.
+
+    Attributes:
+        driver : An async driver object that maintains the connection to the database.
+
+    Example:
+        async with AsyncGraph(uri, user, password, max_concurrency=64) as g:
+            await asyncio.gather(*(g.set_node_value(id, value) for id, value in readings.items()))
+    """
+    def __init__(self, uri: str, user: str, password: str, max_concurrency: int = 100, max_plans: int = MAX_PLANS):
+        """
+        Initializes the AsyncGraph object with a connection to the database.
+
+        Args:
+            uri (str): The connection string for the database.
+            user (str): The username for the database.
+            password (str): The password for the database.
+            max_concurrency (int, optional): The maximum number of operations running at once.
+            max_plans (int, optional): The maximum number of cached propagation plans of set_node_value(s).
+        """
+        if not isinstance(max_concurrency, int) or max_concurrency <= 0:
+            raise ValueError("max_concurrency must be a positive integer")
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._plans = _PlanCache(max_plans)
+        try:
+            self.driver = async_graphdb.driver(uri, auth=(user, password), max_connection_pool_size=max_concurrency)
+        except Exception as e:
+            raise Exception(f"Failed to create driver: {e}")
+
+    async def close(self) -> None:
+        """
+        Closes the connection to the database.
+        """
+        try:
+            await self.driver.close()
+        except Exception as e:
+            raise Exception(f"Failed to close driver: {e}")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _execute_write(self, transaction_function, *args):
+        """
+        Runs a transaction function as a write, once a concurrency slot is free.
+        """
+        async with self._semaphore:
+            async with self.driver.session() as session:
+                return await session.execute_write(transaction_function, *args)
+
+    async def _execute_read(self, transaction_function, *args):
+        """
+        Runs a transaction function as a read, once a concurrency slot is free.
+        """
+        async with self._semaphore:
+            async with self.driver.session() as session:
+                return await session.execute_read(transaction_function, *args)
+
+    # Run query
+    async def run_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Runs an arbitrary Cypher query on the database.
+
+        Args:
+            query (str): The Cypher query to run.
+            parameters (dict, optional): The parameters for the query.
+
+        Returns:
+            list[dict]: A list of dictionaries representing the records returned by the query.
+        """
+        if not isinstance(query, str):
+            raise TypeError(f"Expected str for query, got {type(query)}")
+        if parameters is not None and not isinstance(parameters, dict):
+            raise TypeError(f"Expected dict for parameters, got {type(parameters)}")
+
+        async with self._semaphore:
+            async with self.driver.session() as session:
+                result = await session.run(query, parameters)
+                return await result.data()
+
+    # Add node
+    @staticmethod
+    async def _add_node_tx(tx, node_label: str, properties: dict):
+        """
+        Private helper function to create a node within a transaction.
+        """
+        query = f"CREATE (n:{node_label} $properties) RETURN n"
+        result = await tx.run(query, properties=properties)
+        record = await result.single()
+        return _node_to_dict(record['n'])
+
+    async def add_node(self, node_label: str, properties: dict = None):
+        """
+        Adds a node in the graph database.
+
+        Args:
+            node_label (str): The label to assign to the node, one of NODE_LABELS.
+            properties (dict, optional): Additional properties to assign to the node.
+
+        Returns:
+            dict: A dictionary representing the newly created node.
+        """
+        if not isinstance(node_label, str):
+            raise TypeError("node_label must be a string")
+        if node_label not in NODE_LABELS:
+            raise ValueError(f"node_label must be one of {NODE_LABELS}, got '{node_label}'")
+        if not isinstance(properties, dict):
+            raise TypeError("properties must be a dictionary")
+        properties = dict(properties, uuid=str(uuid.uuid4()))
+        try:
+            return await self._execute_write(self._add_node_tx, node_label, properties)
+        except Exception as e:
+            raise Exception(f"Failed to add node: {e}")
+
+    # Get node
+    @staticmethod
+    async def _get_node_tx(tx, node_id: str):
+        """
+        Private helper function to retrieve a node within a transaction.
+        """
+        query = f"MATCH (n{NODE_LABEL_EXPRESSION}) WHERE n.uuid = $node_id RETURN n"
+        result = await tx.run(query, node_id=node_id)
+        record = await result.single()
+        if record is None:
+            return f"No node found with node_id: {node_id}"
+        return _node_to_dict(record['n'])
+
+    async def get_node(self, node_id: str):
+        """
+        Retrieves a node from the graph database based on its UUID.
+
+        Args:
+            node_id (str): The ID of the node (UUID) to retrieve.
+
+        Returns:
+            dict: A dictionary representing the retrieved node.
+        """
+        if not isinstance(node_id, str):
+            raise TypeError("node_id must be a string")
+        try:
+            return await self._execute_read(self._get_node_tx, node_id)
+        except Exception as e:
+            raise Exception(f"Failed to retrieve node: {e}")
+
+    # Update node properties
+    @staticmethod
+    async def _update_node_properties_tx(tx, node_id: str, properties: dict):
+        """
+        Private helper function to update node properties within a transaction.
+        """
+        query = f"MATCH (n{NODE_LABEL_EXPRESSION}) WHERE n.uuid = $node_id SET n += $properties RETURN n"
+        result = await tx.run(query, node_id=node_id, properties=properties)
+        record = await result.single()
+        if record is None:
+            raise Exception(f"No node found with node_id: {node_id}")
+        return _node_to_dict(record['n'])
+
+    async def update_node_properties(self, node_id: str, properties: dict):
+        """
+        Updates the properties of a node in the graph database.
+
+        Args:
+            node_id (str): The ID of the node to update.
+            properties (dict): The updated properties to assign to the node.
+
+        Returns:
+            dict: A dictionary representing the updated node.
+        """
+        if not isinstance(node_id, str):
+            raise TypeError("node_id must be a string")
+        if not isinstance(properties, dict):
+            raise TypeError("properties must be a dictionary")
+        try:
+            node = await self._execute_write(self._update_node_properties_tx, node_id, properties)
+        except Exception as e:
+            raise Exception(f"Failed to update node properties: {e}")
+        # Renaming an op, for instance to or from 'store', changes the order of the plans through it
+        if 'op' in node['label']:
+            self._plans.invalidate(node_id)
+        return node
+
+    # Delete node
+    @staticmethod
+    async def _delete_node_tx(tx, node_id: str, detach: bool = False):
+        """
+        Private helper function to delete a node within a transaction.
+        """
+        query = f"MATCH (n{NODE_LABEL_EXPRESSION}) WHERE n.uuid = $node_id"
+        query += " DETACH DELETE n" if detach else " DELETE n"
+        query += " RETURN count(n) as deleted_count"
+        result = await tx.run(query, node_id=node_id)
+        record = await result.single()
+        return record["deleted_count"] > 0
+
+    async def delete_node(self, node_id: str, detach: bool = False):
+        """
+        Deletes a node from the graph database based on its ID.
+
+        Args:
+            node_id (str): The ID of the node to delete.
+            detach (bool, optional): Flag indicating whether to delete the node with or without detaching relationships.
+
+        Returns:
+            bool: True if the node was deleted, False otherwise.
+        """
+        if not isinstance(node_id, str):
+            raise TypeError("node_id must be a string")
+        if not isinstance(detach, bool):
+            raise TypeError("detach must be a boolean")
+        self._plans.invalidate(node_id)
+        try:
+            return await self._execute_write(self._delete_node_tx, node_id, detach)
+        except Exception as e:
+            raise Exception(f"Failed to delete node: {e}")
+
+    # Set node value
+    @staticmethod
+    async def _get_propagation_plan_tx(tx, node_ids: List[str]):
+        """
+        Private helper function to compute the propagation plan of source nodes within a transaction.
+        """
+        result = await tx.run(PROPAGATION_PLAN_QUERY, node_ids=node_ids)
+        return _propagation_plan(await result.data(), node_ids)
+
+    @staticmethod
+    async def _apply_propagation_plan_tx(tx, inputs: List[dict], plan: list):
+        """
+        Private helper function to set node values and apply their propagation plan within a transaction.
+        """
+        result = await tx.run(apply_propagation_plan_query(), inputs=inputs, plan=plan)
+        await result.consume()
+
+    async def set_node_value(self, node_id: str, value):
+        """
+        Sets the 'value' property of a num node and recomputes the ops downstream of it.
+
+        Uses the same cached propagation plans as Graph.set_node_value: every downstream op is
+        evaluated once, in topological order.
+
+        Args:
+            node_id (str): The ID of the node.
+            value: The new value.
+        """
+        if not isinstance(node_id, str):
+            raise TypeError("node_id must be a string")
+        await self.set_node_values({node_id: value})
+
+    async def set_node_values(self, values: Dict[str, Any]):
+        """
+        Sets the 'value' property of many num nodes and recomputes the ops downstream of them
+        in a single transaction, as Graph.set_node_values.
+
+        Args:
+            values (dict): The IDs of the nodes mapped to their new values.
+        """
+        if not isinstance(values, dict):
+            raise TypeError("values must be a dictionary")
+        if not all(isinstance(node_id, str) for node_id in values):
+            raise TypeError("node_id must be a string")
+        try:
+            key = frozenset(values)
+            plan = self._plans.get(key)
+            if plan is None:
+                # A structural change committed while the plan is read must not leave it cached
+                generation = self._plans.generation
+                plan, uuids = await self._execute_read(self._get_propagation_plan_tx, list(values))
+                self._plans.put(key, plan, uuids, generation)
+            inputs = [{'id': node_id, 'value': value} for node_id, value in values.items()]
+            await self._execute_write(self._apply_propagation_plan_tx, inputs, plan)
+        except Exception as e:
+            raise Exception(f"Failed to set node value: {e}")
+
+    def clear_plan_cache(self) -> None:
+        """
+        Drops every cached propagation plan.
+        """
+        self._plans.clear()
+
+    # Get node value
+    @staticmethod
+    async def _get_node_property_tx(tx, node_id: str, key: str):
+        """
+        Private helper function to retrieve a specific property of a node within a transaction.
+        """
+        query = f"""
+            MATCH (n{NODE_LABEL_EXPRESSION})
+            WHERE n.uuid = $node_id
+            RETURN apoc.map.values(n, [$key])[0] as value
+        """
+        result = await tx.run(query, node_id=node_id, key=key)
+        record = await result.single()
+        return record['value']
+
+    async def get_node_value(self, node_id: str):
+        """
+        Retrieves the 'value' property of a node from the graph database.
+
+        Args:
+            node_id (str): The ID of the node.
+
+        Returns:
+            Any: The value of the 'value' property, or None if the property does not exist.
+        """
+        if not isinstance(node_id, str):
+            raise TypeError("node_id must be a string")
+        try:
+            return await self._execute_read(self._get_node_property_tx, node_id, 'value')
+        except Exception as e:
+            raise Exception(f"Failed to retrieve node 'value' property: {e}")
+
+    async def get_node_property(self, node_id: str, key: str):
+        """
+        Retrieves a specific property of a node from the graph database.
+
+        Args:
+            node_id (str): The ID of the node.
+            key (str): The property key.
+
+        Returns:
+            Any: The value of the specified property, or None if the property does not exist.
+        """
+        if not isinstance(node_id, str):
+            raise TypeError("node_id must be a string")
+        if not isinstance(key, str):
+            raise TypeError("key must be a string")
+        try:
+            return await self._execute_read(self._get_node_property_tx, node_id, key)
+        except Exception as e:
+            raise Exception(f"Failed to retrieve node property: {e}")
+
+    # Add edge
+    @staticmethod
+    async def _add_edge_tx(tx, label: str, out_id: str, in_id: str, properties: dict = None, merge: bool = False):
+        """
+        Private helper function to add an edge between two nodes within a transaction.
+        """
+        add_clause = "MERGE" if merge else "CREATE"
+        query = f"MATCH (n{NODE_LABEL_EXPRESSION}) WHERE n.uuid = $out_id MATCH (m{NODE_LABEL_EXPRESSION}) WHERE m.uuid = $in_id {add_clause} (n)-[r:{label}{{uuid: $edge_id}}]->(m)"
+        if properties:
+            query += " SET r += $properties"
+        query += " RETURN r.uuid AS id, type(r) AS label, n.uuid AS out_id, m.uuid AS in_id, properties(r) AS properties"
+        result = await tx.run(query, out_id=out_id, in_id=in_id, edge_id=str(uuid.uuid4()), properties=properties)
+        edge = (await result.data())[0]
+        # Remove the 'edge_id' key from properties
+        edge['properties'].pop('uuid', None)
+        return edge
+
+    async def add_edge(self, label: str, out_id: str, in_id: str, properties: dict = None, merge: bool = False):
+        """
+        Adds an edge between two nodes in the graph database.
+
+        Args:
+            label (str): The label of the edge, one of EDGE_LABELS.
+            out_id (str): The ID of the outgoing node.
+            in_id (str): The ID of the incoming node.
+            properties (dict, optional): The properties of the edge.
+            merge (bool, optional): A flag indicating whether to merge the edge if it already exists.
+
+        Returns:
+            dict: A dictionary with details of the created or merged edge.
+        """
+        if not isinstance(label, str):
+            raise TypeError("edge_label must be a string")
+        if label not in EDGE_LABELS:
+            raise ValueError(f"edge_label must be one of {EDGE_LABELS}, got '{label}'")
+        if not isinstance(out_id, str):
+            raise TypeError("out_id must be a string")
+        if not isinstance(in_id, str):
+            raise TypeError("in_id must be a string")
+        if properties and not isinstance(properties, dict):
+            raise TypeError("properties must be a dictionary")
+        if not isinstance(merge, bool):
+            raise TypeError("merge must be a boolean")
+        self._plans.invalidate(out_id, in_id)
+        try:
+            return await self._execute_write(self._add_edge_tx, label, out_id, in_id, properties, merge)
+        except Exception as e:
+            raise Exception(f"Failed to add edge: {e}")
+
+    # Get edge
+    @staticmethod
+    async def _get_edge_tx(tx, id: str):
+        """
+        Private helper function to retrieve an edge by its ID within a transaction.
+        """
+        query = f"MATCH ()-[r{EDGE_LABEL_EXPRESSION}]->() WHERE r.uuid = $id RETURN r.uuid AS id, type(r) AS label, startNode(r).uuid AS out_id, endNode(r).uuid AS in_id, properties(r) AS properties"
+        result = await tx.run(query, id=id)
+        edge = (await result.data())[0]
+        # Remove the 'edge_id' key from properties
+        edge['properties'].pop('uuid', None)
+        return edge
+
+    async def get_edge(self, id: str):
+        """
+        Retrieves an edge by its ID.
+
+        Args:
+            id (str): The ID of the edge to retrieve.
+
+        Returns:
+            dict: A dictionary representing the retrieved edge.
+        """
+        if not isinstance(id, str):
+            raise TypeError("id must be a string")
+        try:
+            return await self._execute_read(self._get_edge_tx, id)
+        except Exception as e:
+            raise Exception(f"Failed to retrieve edge: {e}")
+
+    # Update edge properties
+    @staticmethod
+    async def _update_edge_properties_tx(tx, id: str, properties: dict):
+        """
+        Private helper function to update edge properties by ID within a transaction.
+        """
+        query = f"""
+            MATCH ()-[r{EDGE_LABEL_EXPRESSION}]->()
+            WHERE r.uuid = $id
+            SET r += $properties
+            RETURN r.uuid AS edge_id
+        """
+        result = await tx.run(query, id=id, properties=properties)
+        return await result.single() is not None
+
+    async def update_edge_properties(self, id: str, properties: dict):
+        """
+        Updates edge properties by ID in the graph database.
+
+        Args:
+            id (str): The ID of the edge to update.
+            properties (dict): The new properties for the edge.
+
+        Returns:
+            bool: True if the edge was found and updated, False otherwise.
+        """
+        if not isinstance(id, str):
+            raise TypeError("id must be a string")
+        if not isinstance(properties, dict):
+            raise TypeError("properties must be a dictionary")
+        self._plans.invalidate(id)
+        try:
+            return await self._execute_write(self._update_edge_properties_tx, id, properties)
+        except Exception as e:
+            raise Exception(f"Failed to update edge properties: {e}")
+
+    # Delete edge
+    @staticmethod
+    async def _delete_edge_tx(tx, id: str):
+        """
+        Private helper function to delete an edge by its ID within a transaction.
+        """
+        query = f"MATCH ()-[r{EDGE_LABEL_EXPRESSION}]->() WHERE r.uuid = $id DELETE r RETURN count(r) as deleted_count"
+        result = await tx.run(query, id=id)
+        record = await result.single()
+        return record["deleted_count"] > 0
+
+    async def delete_edge(self, id: str):
+        """
+        Deletes an edge by its ID.
+
+        Args:
+            id (str): The ID of the edge to delete.
+
+        Returns:
+            bool: True if at least one edge was deleted, False otherwise.
+        """
+        if not isinstance(id, str):
+            raise TypeError("id must be a string")
+        self._plans.invalidate(id)
+        try:
+            return await self._execute_write(self._delete_edge_tx, id)
+        except Exception as e:
+            raise Exception(f"Failed to delete edge: {e}")
+
+    # Delete all
+    @staticmethod
+    async def _delete_all_tx(tx):
+        """
+        Private helper function to delete all nodes and relationships within a transaction.
+        """
+        result = await tx.run("MATCH (n) DETACH DELETE n")
+        await result.consume()
+        return True
+
+    async def delete_all(self):
+        """
+        Deletes all nodes and relationships in the graph database.
+
+        Returns:
+            bool: True if the deletion operation was successful.
+        """
+        self._plans.clear()
+        try:
+            return await self._execute_write(self._delete_all_tx)
+        except Exception as e:
+            raise Exception(f"Failed to delete all nodes and relationships: {e}")
@@ -0,0 +1,176 @@
+import math
+import hashlib
+import numpy as np
+
+from .ops import OPS, FORWARD, BACKWARD, FORWARD_BATCH, BACKWARD_BATCH
+from .tape import Tape
+
+# Python expressions of the ops that can be inlined, in terms of {x}, {y} and the output gradient {g}.
+# Other ops, such as the ones raising ValueError outside their domain and the ops registered by
+# user code, call their kernel from the registry.
+INLINE = {
+    '+': ('{x} + {y}', '{g}', '{g}'),
+    '-': ('{x} - {y}', '{g}', '-{g}'),
+    '*': ('{x} * {y}', '{g} * {y}', '{g} * {x}'),
+    'sqr': ('{x} * {x}', '2.0 * {x} * {g}', None),
+    'exp': ('_math.exp({x})', '{g} * _math.exp({x})', None),
+    'sin': ('_math.sin({x})', '{g} * _math.cos({x})', None),
+    'cos': ('_math.cos({x})', '-{g} * _math.sin({x})', None),
+    'ReLU': ('({x} if {x} > 0 else 0.0)', '({g} if {x} > 0 else 0.0)', None),
+}
+
+INLINE_NUMPY = {
+    '+': ('{x} + {y}', '{g}', '{g}'),
+    '-': ('{x} - {y}', '{g}', '-{g}'),
+    '*': ('{x} * {y}', '{g} * {y}', '{g} * {x}'),
+    'sqr': ('{x} * {x}', '2.0 * {x} * {g}', None),
+    'exp': ('_np.exp({x})', '{g} * _np.exp({x})', None),
+    'sin': ('_np.sin({x})', '{g} * _np.cos({x})', None),
+    'cos': ('_np.cos({x})', '-{g} * _np.sin({x})', None),
+    'ReLU': ('_np.maximum({x}, 0.0)', '{g} * ({x} > 0)', None),
+}
+
+# Generated functions by structural hash
+_cache = {}
+
+
+class Generated:
+    """
+    Straight-line Python functions generated from a num/op DiGraph.
+
+    `forward` has one local variable per num node and one statement per op, in topological
+    order. `backward` has one gradient variable per num node and accumulates the gradient of
+    the loss over the ops it depends on, in reverse order. In NumPy mode every variable is a
+    row of samples, like in Tape.run_batch.
+
+    Attributes:
+        ids (list): The networkx id of the num node at each index.
+        index (dict): The index of each num node, by networkx id.
+        key (str): The structural hash of the graph, shared by graphs of the same structure.
+        source (str): The generated source code.
+        forward (callable): forward(values) -> values, the values of every num node indexed like `ids`.
+            'store' outputs latch the value of their input in `values` first, as in Tape.run.
+        backward (callable): backward(values) -> grads, the gradient of the loss with respect to
+            every num node, or None if no loss was given.
+    """
+    def __init__(self, tape, key, source, forward, backward):
+        self.ids = tape.ids
+        self.index = tape.index
+        self.key = key
+        self.source = source
+        self.forward = forward
+        self.backward = backward
+
+
+def structural_hash(tape, loss=None, numpy=False) -> str:
+    """
+    Returns a hash of the structure of a compiled graph: the ops, how they connect the num nodes
+    and the loss, independently of the ids of the nodes and of their values.
+    """
+    loss = -1 if loss is None else tape.index[loss]
+    structure = (
+        len(tape.ids),
+        [OPS[code].name for code in tape.opcodes.tolist()],
+        tape.in1.tolist(), tape.in2.tolist(), tape.out.tolist(),
+        tape.store_in.tolist(), tape.store_out.tolist(),
+        loss, bool(numpy),
+    )
+    return hashlib.sha1(repr(structure).encode()).hexdigest()
+
+
+def generate(G, loss=None, numpy=False) -> Generated:
+    """
+    Generates and compiles the forward function, and the gradient function of `loss` if given,
+    of a num/op DiGraph. Graphs of the same structure share the compiled functions.
+
+    Args:
+        G: The num/op DiGraph built with Engine.op1 and Engine.op2.
+        loss (optional): The networkx id of the loss num node.
+        numpy (bool): If True, generate functions over rows of samples.
+
+    Returns:
+        Generated: The generated functions.
+
+    Raises:
+        ValueError: If a num node holds a NumPy array.
+
+    Example:
+        f = generate(G, loss=e2)
+        values = f.forward(tape.values.tolist())
+        grads = f.backward(values)
+    """
+    tape = Tape(G)
+    if tape.tensor:
+        raise ValueError("Code generation of tensor-valued graphs is not supported")
+    key = structural_hash(tape, loss, numpy)
+    if key not in _cache:
+        source = _source(tape, None if loss is None else tape.index[loss], numpy)
+        namespace = {'_math': math, '_np': np}
+        namespace.update({f'_f{op.code}': (FORWARD_BATCH if numpy else FORWARD)[op.code] for op in OPS})
+        namespace.update({f'_b{op.code}': (BACKWARD_BATCH if numpy else BACKWARD)[op.code] for op in OPS})
+        exec(compile(source, f'<trengx.codegen {key[:12]}>', 'exec'), namespace)
+        _cache[key] = (source, namespace['forward'], namespace.get('backward'))
+    source, forward, backward = _cache[key]
+    return Generated(tape, key, source, forward, backward)
+
+
+def clear_cache() -> None:
+    """
+    Drops the cached generated functions.
+    """
+    _cache.clear()
+
+
+def _source(tape, loss, numpy) -> str:
+    inline = INLINE_NUMPY if numpy else INLINE
+    names = [f'v{i}' for i in range(len(tape.ids))]
+    program = list(zip(tape.opcodes.tolist(), tape.in1.tolist(), tape.in2.tolist(), tape.out.tolist()))
+    collect = '_np.stack([{}])' if numpy else '[{}]'
+
+    lines = ['def forward(values):']
+    lines.append(f"    {', '.join(names)}, = values" if names else '    pass')
+    if len(tape.store_in):
+        # One tuple assignment, so that every store reads its input before any store writes
+        stores = list(zip(tape.store_in.tolist(), tape.store_out.tolist()))
+        lines.append(f"    {''.join(f'v{o}, ' for _, o in stores)}= {''.join(f'v{i}, ' for i, _ in stores)}".rstrip())
+    for code, a, b, o in program:
+        x, y = f'v{a}', f'v{b}' if b >= 0 else 'None'
+        template = inline.get(OPS[code].name)
+        if template is None:
+            lines.append(f'    v{o} = _f{code}({x}, {y})')
+        else:
+            lines.append(f'    v{o} = ' + template[0].format(x=x, y=y))
+    lines.append('    return ' + collect.format(', '.join(names)))
+
+    if loss is not None:
+        # Only the ops the loss depends on contribute to the gradients; 'store' ops pass none
+        needed = {loss}
+        steps = []
+        for code, a, b, o in reversed(program):
+            if o in needed:
+                steps.append((code, a, b, o))
+                needed.update((a, b) if b >= 0 else (a,))
+
+        lines.append('')
+        lines.append('def backward(values):')
+        lines.append(f"    {', '.join(names)}, = values")
+        for i in range(len(names)):
+            if i != loss:
+                lines.append(f'    g{i} = 0.0')
+        lines.append(f'    g{loss} = _np.ones_like(v{loss})' if numpy else f'    g{loss} = 1.0')
+        for code, a, b, o in steps:
+            x, y, g = f'v{a}', f'v{b}' if b >= 0 else 'None', f'g{o}'
+            template = inline.get(OPS[code].name)
+            if template is None:
+                lines.append(f'    _da, _db = _b{code}({x}, {y}, {g})')
+                lines.append(f'    g{a} += _da')
+                if b >= 0:
+                    lines.append(f'    g{b} += _db')
+            else:
+                lines.append(f'    g{a} += ' + template[1].format(x=x, y=y, g=g))
+                if b >= 0:
+                    lines.append(f'    g{b} += ' + template[2].format(x=x, y=y, g=g))
+        grads = ', '.join(f'g{i}' for i in range(len(names)))
+        lines.append(f'    return _np.stack(_np.broadcast_arrays({grads}))' if numpy else f'    return [{grads}]')
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,403 @@
+import heapq
+import numpy as np
+
+from .ops import OPS, OPCODES, FORWARD, BACKWARD
+from .tape import _topological_order
+from .params import get_params, get_loss, default_params
+from .optim import Optimizer, apply
+
+# Node labels
+NUM, OP = 0, 1
+# Opcodes of the nodes that are not registry ops
+NO_OPCODE, STORE = 255, 254
+
+
+class CompactGraph:
+    """
+    A num/op graph stored as a struct of arrays instead of networkx attribute dicts.
+
+    Nodes are consecutive integers. Their label, opcode, interned name, value and gradient
+    are kept in NumPy arrays, and the edges in CSR adjacency built on demand, so a node
+    costs a few tens of bytes instead of a dict per node and a UUID string per id.
+
+    It has the forward/backward API of Engine: Engine.forward_propagate and
+    Engine.backward_propagate accept a CompactGraph in place of a networkx DiGraph.
+
+    Attributes:
+        names (list): The interned name table, indexed by the values of `name_ids`.
+        keys (list): The networkx id of every node when built with `from_networkx`, else None.
+        loss (int): The designated loss node, -1 if none.
+
+    Example:
+        C = CompactGraph()
+        x, w, _, y = C.op2(in1_name='x', in1_value=1.0, in2_name='w1', in2_value=0.5, op_name='*', out_name='y')
+        C.forward_propagate(x, 2.0)
+        C.values[y]
+    """
+    def __init__(self, capacity=16):
+        self.names = []
+        self._name_index = {}
+        self.keys = None
+        self.loss = -1
+        self._param_nodes = None
+
+        self._n = 0
+        self._labels = np.zeros(capacity, dtype=np.uint8)
+        self._opcodes = np.zeros(capacity, dtype=np.uint8)
+        self._name_ids = np.zeros(capacity, dtype=np.int32)
+        self._values = np.zeros(capacity, dtype=np.float64)
+        self._grads = np.zeros(capacity, dtype=np.float64)
+
+        self._m = 0
+        self._edge_src = np.zeros(capacity, dtype=np.int32)
+        self._edge_dst = np.zeros(capacity, dtype=np.int32)
+        self._edge_reverse = np.zeros(capacity, dtype=np.bool_)
+
+        self._built = False
+
+    def __len__(self):
+        return self._n
+
+    # Views of the node arrays. They are invalidated when nodes are added past the capacity.
+    @property
+    def labels(self) -> np.ndarray:
+        return self._labels[:self._n]
+
+    @property
+    def opcodes(self) -> np.ndarray:
+        return self._opcodes[:self._n]
+
+    @property
+    def name_ids(self) -> np.ndarray:
+        return self._name_ids[:self._n]
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values[:self._n]
+
+    @property
+    def grads(self) -> np.ndarray:
+        return self._grads[:self._n]
+
+    def name(self, node):
+        """
+        Returns the name of a node, or None.
+        """
+        name_id = self._name_ids[node]
+        return self.names[name_id] if name_id >= 0 else None
+
+    def _intern(self, name) -> int:
+        if name is None:
+            return -1
+        name_id = self._name_index.get(name)
+        if name_id is None:
+            name_id = self._name_index[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def _add_node(self, label, opcode, name, value) -> int:
+        node = self._n
+        if node == len(self._labels):
+            size = 2 * node
+            for attribute in ('_labels', '_opcodes', '_name_ids', '_values', '_grads'):
+                array = getattr(self, attribute)
+                grown = np.zeros(size, dtype=array.dtype)
+                grown[:node] = array
+                setattr(self, attribute, grown)
+        self._labels[node] = label
+        self._opcodes[node] = opcode
+        self._name_ids[node] = self._intern(name)
+        self._values[node] = np.nan if value is None else value
+        self._grads[node] = 0.0
+        self._n += 1
+        self._built = False
+        return node
+
+    def add_num(self, name=None, value=None) -> int:
+        """
+        Adds a num node and returns its id.
+        """
+        return self._add_node(NUM, NO_OPCODE, name, value)
+
+    def add_op(self, name) -> int:
+        """
+        Adds an op node and returns its id.
+
+        Raises:
+            ValueError: If the op is not registered in trengx.engine.ops, or if its opcode does not
+                fit in the uint8 opcodes below STORE.
+        """
+        if name == 'store':
+            opcode = STORE
+        elif name not in OPCODES:
+            raise ValueError(f"Unknown op '{name}'")
+        else:
+            opcode = OPCODES[name]
+            if opcode >= STORE:
+                raise ValueError(f"Op '{name}' has opcode {opcode}, CompactGraph supports opcodes below {STORE}")
+        return self._add_node(OP, opcode, name, None)
+
+    def add_edge(self, src, dst, reverse=False) -> None:
+        """
+        Adds a num2op or op2num edge.
+        """
+        edge = self._m
+        if edge == len(self._edge_src):
+            size = 2 * edge
+            for attribute in ('_edge_src', '_edge_dst', '_edge_reverse'):
+                array = getattr(self, attribute)
+                grown = np.zeros(size, dtype=array.dtype)
+                grown[:edge] = array
+                setattr(self, attribute, grown)
+        self._edge_src[edge] = src
+        self._edge_dst[edge] = dst
+        self._edge_reverse[edge] = reverse
+        self._m += 1
+        self._built = False
+
+    def set_params(self, nodes) -> None:
+        """
+        Registers the trainable num nodes, replacing the registered ones. Without registered
+        parameters, the num nodes whose names start with 'w' or 'b' are trained.
+
+        Raises:
+            ValueError: If a node is not a num node.
+        """
+        nodes = list(dict.fromkeys(nodes))
+        for node in nodes:
+            self._check_num(node)
+        self._param_nodes = nodes
+        self._built = False
+
+    def set_loss(self, node) -> None:
+        """
+        Designates the loss num node, the default loss of `backward_propagate`.
+
+        Raises:
+            ValueError: If the node is not a num node.
+        """
+        self._check_num(node)
+        self.loss = node
+
+    def _check_num(self, node) -> None:
+        if not 0 <= node < self._n or self._labels[node] != NUM:
+            raise ValueError(f"{node!r} is not a num node of the graph")
+
+    def op1(self, in_id=None, in_name=None, in_value=None, op_name=None, out_id=None, out_name=None, out_value=None):
+        """
+        Type 1 elementary operation unit, as Engine.op1. Returns (in_id, op_id, out_id).
+        """
+        if in_id is None:
+            in_id = self.add_num(in_name, in_value)
+        if out_id is None:
+            out_id = self.add_num(out_name, out_value)
+        op_id = self.add_op(op_name)
+        self.add_edge(in_id, op_id)
+        self.add_edge(op_id, out_id)
+        return in_id, op_id, out_id
+
+    def op2(self, in1_id=None, in1_name=None, in1_value=None, in2_id=None, in2_name=None, in2_value=None,
+            op_name=None, out_id=None, out_name=None, out_value=None):
+        """
+        Type 2 elementary operation unit, as Engine.op2. Returns (in1_id, in2_id, op_id, out_id).
+        """
+        if in1_id is None:
+            in1_id = self.add_num(in1_name, in1_value)
+        if in2_id is None:
+            in2_id = self.add_num(in2_name, in2_value)
+        if out_id is None:
+            out_id = self.add_num(out_name, out_value)
+        op_id = self.add_op(op_name)
+        self.add_edge(in1_id, op_id)
+        self.add_edge(in2_id, op_id, reverse=True)
+        self.add_edge(op_id, out_id)
+        return in1_id, in2_id, op_id, out_id
+
+    @classmethod
+    def from_networkx(cls, G) -> 'CompactGraph':
+        """
+        Converts a num/op DiGraph built with Engine.op1 and Engine.op2. The networkx ids are kept in `keys`.
+        """
+        C = cls(capacity=max(16, G.number_of_nodes()))
+        index = {}
+        for node, data in G.nodes(data=True):
+            if data.get('label') == 'op':
+                index[node] = C.add_op(data.get('name'))
+            else:
+                index[node] = C.add_num(data.get('name'), data.get('value'))
+                C._grads[index[node]] = data.get('grad') or 0.0
+        for src, dst, data in G.edges(data=True):
+            C.add_edge(index[src], index[dst], bool(data.get('reverse', False)))
+        C.keys = list(G.nodes)
+        if 'params' in G.graph:
+            C.set_params([index[node] for node in get_params(G)])
+        if get_loss(G) is not None:
+            C.loss = index[get_loss(G)]
+        return C
+
+    def to_networkx(self):
+        """
+        Converts back to a num/op DiGraph, with the networkx ids of `from_networkx` if any, else the integer ids.
+        """
+        import networkx as nx
+
+        G = nx.DiGraph()
+        keys = self.keys if self.keys is not None and len(self.keys) == self._n else range(self._n)
+        keys = list(keys)
+        labels, values, grads = self.labels.tolist(), self.values.tolist(), self.grads.tolist()
+        for node, key in enumerate(keys):
+            if labels[node] == OP:
+                G.add_node(key, label='op', name=self.name(node))
+            else:
+                value = None if values[node] != values[node] else values[node]
+                G.add_node(key, label='num', name=self.name(node), value=value, grad=grads[node])
+        for src, dst, reverse in zip(self._edge_src[:self._m].tolist(), self._edge_dst[:self._m].tolist(),
+                                     self._edge_reverse[:self._m].tolist()):
+            if labels[src] == NUM:
+                if reverse:
+                    G.add_edge(keys[src], keys[dst], label='num2op', reverse=True)
+                else:
+                    G.add_edge(keys[src], keys[dst], label='num2op')
+            else:
+                G.add_edge(keys[src], keys[dst], label='op2num')
+        return G
+
+    def _build(self) -> None:
+        """
+        Builds the CSR adjacency and the topological order of the ops after the graph changed.
+        """
+        if self._built:
+            return
+        n, m = self._n, self._m
+        src, dst, reverse = self._edge_src[:m], self._edge_dst[:m], self._edge_reverse[:m]
+
+        order = np.argsort(src, kind='stable')
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=self.indptr[1:])
+        self.indices = dst[order]
+
+        order = np.argsort(dst, kind='stable')
+        self.in_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(dst, minlength=n), out=self.in_indptr[1:])
+        self.in_indices = src[order]
+        in_reverse = reverse[order]
+
+        indptr, indices, in_indptr = self.indptr.tolist(), self.indices.tolist(), self.in_indptr.tolist()
+        in_indices, in_reverse = self.in_indices.tolist(), in_reverse.tolist()
+        opcodes = self.opcodes.tolist()
+        ops = []
+        self._store_out = {}
+        for op in np.flatnonzero(self.labels == OP).tolist():
+            outputs = indices[indptr[op]:indptr[op + 1]]
+            if len(outputs) != 1:
+                raise ValueError(f"op '{self.name(op)}' must have exactly one output, got {len(outputs)}")
+            # The operand flagged `reverse` is the second one
+            start, end = in_indptr[op], in_indptr[op + 1]
+            operands = [node for _, node in sorted(zip(in_reverse[start:end], in_indices[start:end]))]
+            code = opcodes[op]
+            if code == STORE:
+                self._store_out[op] = outputs[0]
+                continue
+            arity = OPS[code].arity
+            if len(operands) != arity:
+                raise ValueError(f"op '{self.name(op)}' expects {arity} operand(s), got {len(operands)}")
+            ops.append((op, code, operands[0], operands[1] if arity == 2 else -1, outputs[0]))
+
+        ops = _topological_order(ops)
+        self._program = [op[1:] for op in ops]
+        self._position = [-1] * n
+        for position, op in enumerate(ops):
+            self._position[op[0]] = position
+        if self._param_nodes is None:
+            labels = self.labels.tolist()
+            names = [self.name(i) if labels[i] == NUM else None for i in range(n)]
+            self._params = np.array(default_params(names), dtype=np.int64)
+        else:
+            self._params = np.array(self._param_nodes, dtype=np.int64)
+        self._built = True
+
+    def forward_propagate(self, node, value) -> int:
+        """
+        Sets the value of a num node and recomputes the ops downstream of it in waves: within a
+        wave every dirty op runs once, in topological order. A 'store' op whose input changes
+        passes the previous value of its input to its output, once per call, as in
+        Engine.forward_propagate. When that output feeds back upstream, the ops it reaches run
+        once more in another wave, so an op can run once per store of its feedback loops.
+
+        Returns:
+            int: The number of op evaluations, counting an op again for each wave it runs in.
+        """
+        self._build()
+        values = self._values
+        indptr, indices, position, program = self.indptr, self.indices, self._position, self._program
+        forward = FORWARD
+        pending = [(node, value)]
+        dirty = []
+        queued = set()
+        updated = set()
+        recomputed = 0
+        while pending or dirty:
+            if not pending:
+                p = heapq.heappop(dirty)
+                queued.discard(p)
+                code, a, b, o = program[p]
+                pending.append((o, forward[code](values[a], values[b])))
+                recomputed += 1
+                continue
+            i, new = pending.pop()
+            old = values[i]
+            values[i] = new
+            updated.add(i)
+            for op in indices[indptr[i]:indptr[i + 1]].tolist():
+                p = position[op]
+                if p >= 0:
+                    if p not in queued:
+                        queued.add(p)
+                        heapq.heappush(dirty, p)
+                elif self._store_out[op] not in updated:
+                    pending.append((self._store_out[op], old))
+        return recomputed
+
+    def backward_propagate(self, loss=None, lr=None) -> np.ndarray:
+        """
+        Computes the gradient of the loss, by default the designated one, with one reverse
+        sweep over the ops and, if `lr` is given, updates the parameters in one vectorized step,
+        with plain SGD or with an optimizer of trengx.engine.optim.
+
+        Returns:
+            np.ndarray: The gradients of every node.
+
+        Raises:
+            ValueError: If no loss is given and none was designated.
+        """
+        self._build()
+        if loss is None:
+            if self.loss < 0:
+                raise ValueError("No loss given and none designated with set_loss")
+            loss = self.loss
+        values = self.values.tolist()
+        grads = [0.0] * self._n
+        grads[loss] = 1.0
+        backward = BACKWARD
+        for code, a, b, o in reversed(self._program):
+            g = grads[o]
+            if g == 0.0:
+                continue
+            da, db = backward[code](values[a], values[b], g)
+            grads[a] += da
+            if b >= 0:
+                grads[b] += db
+        self._grads[:self._n] = grads
+        if isinstance(lr, Optimizer):
+            apply(lr, self._values, self._grads, self._params)
+        elif lr is not None:
+            self._values[self._params] -= lr * self._grads[self._params]
+        return self.grads
+
+    def nbytes(self) -> int:
+        """
+        Returns the memory used by the node and edge arrays.
+        """
+        arrays = (self._labels, self._opcodes, self._name_ids, self._values, self._grads,
+                  self._edge_src, self._edge_dst, self._edge_reverse)
+        return sum(array.nbytes for array in arrays)
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-import uuid
 from typing import Any, Dict, Union
 
+from ...ids import new_id
+
 class AddEdge(ABC):
     """
     Abstract base class for an edge in a computational graph.
@@ -19,21 +20,23 @@ class AddEdge(ABC):
         if edge is None:
             raise ValueError("edge cannot be None")
 
-        id = edge.get('id', str(uuid.uuid1()))
-        if not isinstance(id, str):
-            raise ValueError("id must be a string")
+        id = edge.get('id')
+        if id is None:
+            id = new_id()
+        if not isinstance(id, (str, int)):
+            raise ValueError("id must be a string or an int")
 
         label = edge.get('label')
         if label is not None and not isinstance(label, str):
             raise ValueError("label must be a string")
 
         source = edge.get('source')
-        if source is not None and not isinstance(source, str):
-            raise ValueError("source must be a string")
+        if source is not None and not isinstance(source, (str, int)):
+            raise ValueError("source must be a string or an int")
 
         target = edge.get('target')
-        if target is not None and not isinstance(target, str):
-            raise ValueError("target must be a string")
+        if target is not None and not isinstance(target, (str, int)):
+            raise ValueError("target must be a string or an int")
 
         name = edge.get('name')
         if name is not None and not isinstance(name, str):
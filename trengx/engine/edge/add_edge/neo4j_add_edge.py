@@ -1,4 +1,5 @@
 from .add_edge import AddEdge
+from ...ids import to_uuid
 
 class Neo4jAddEdge(AddEdge):
     
@@ -17,9 +18,9 @@ class Neo4jAddEdge(AddEdge):
                 CREATE (a)-[r:{self.label} {{id: $id, name: $name, second_operand: $second_operand}}]->(b)
                 RETURN r
                 """,
-                source=self.source, 
-                target=self.target,
-                id=self.id, 
+                source=to_uuid(self.source), 
+                target=to_uuid(self.target),
+                id=to_uuid(self.id), 
                 name=self.name, 
                 second_operand=self.second_operand
             ).single()
@@ -1,18 +1,26 @@
-import uuid
 import numpy as np
 
+from .tape import Tape
+from .codegen import generate
+from .train import train
+from .compact import CompactGraph
+from .ids import new_id
+from .params import set_params, add_params, get_params, set_loss, get_loss
+from .optim import Optimizer, apply
+from .ops import OPS, FORWARD, BACKWARD, FORWARD_TENSOR, BACKWARD_TENSOR, opcode, is_tensor, unbroadcast
+
 class Engine:
     
     # Type 1 elementary operation unit
     def op1 (G, in_id=None, in_name=None, in_value=None, in_grad=0, op_name=None, out_id=None, out_name=None, out_value=None, out_grad=0):
-        # Generate a new UUID if no id is provided for in
+        # Generate a new id if no id is provided for in
         if in_id == None:
-            in_id = str(uuid.uuid4())
+            in_id = new_id()
             G.add_node(in_id, label = 'num', name=in_name, value=in_value, grad=in_grad)
         if out_id == None:
-            out_id = str(uuid.uuid4())
+            out_id = new_id()
             G.add_node(out_id, label = 'num', name=out_name, value=out_value, grad=out_grad)
-        op_id = str(uuid.uuid4())
+        op_id = new_id()
         G.add_node(op_id, label = 'op', name=op_name)
         # Create edges
         G.add_edge(in_id, op_id, label='num2op')
@@ -21,17 +29,17 @@ class Engine:
 
     # Type 2 elementary operation unit
     def op2 (G, in1_id=None, in1_name=None, in1_value=None, in1_grad=0, in2_id=None, in2_name=None, in2_value=None, in2_grad=0, op_name=None, out_id=None, out_name=None, out_value=None, out_grad=0):
-        # Generate a new UUID if no id is provided 
+        # Generate a new id if no id is provided 
         if in1_id == None:
-            in1_id = str(uuid.uuid4())
+            in1_id = new_id()
             G.add_node(in1_id, label = 'num', name=in1_name, value=in1_value, grad=in1_grad)
         if in2_id == None:
-            in2_id = str(uuid.uuid4())
+            in2_id = new_id()
             G.add_node(in2_id, label = 'num', name=in2_name, value=in2_value, grad=in2_grad)
         if out_id == None:
-            out_id = str(uuid.uuid4())
+            out_id = new_id()
             G.add_node(out_id, label = 'num', name=out_name, value=out_value, grad=out_grad)
-        op_id = str(uuid.uuid4())
+        op_id = new_id()
         G.add_node(op_id, label = 'op', name=op_name)
         # Create edges
         G.add_edge(in1_id, op_id, label='num2op')
@@ -39,12 +47,58 @@ class Engine:
         G.add_edge(op_id, out_id, label='op2num')
         return in1_id, in2_id, op_id, out_id
 
+    # Compile the graph into a flat evaluation tape
+    def compile(G):
+        return Tape(G)
+
+    # Generate straight-line forward and gradient functions of the graph
+    def codegen(G, loss=None, numpy=False):
+        return generate(G, loss, numpy)
+
+    # Register the trainable num nodes, replacing the registered ones
+    def set_params(G, nodes):
+        return set_params(G, nodes)
+
+    # Register more trainable num nodes
+    def add_params(G, *nodes):
+        return add_params(G, *nodes)
+
+    # The trainable num nodes: the registered ones, else the ones whose names start with 'w' or 'b'
+    def get_params(G):
+        return get_params(G)
+
+    # Designate the loss num node
+    def set_loss(G, node):
+        return set_loss(G, node)
+
+    # Train the parameters with mini-batches on the compiled tape, with SGD or another optimizer,
+    # in this process or split between a pool of worker processes
+    def train(G, data, loss_node=None, params=None, batch_size=32, epochs=1, lr=0.01, tape=None, optimizer=None, workers=1):
+        return train(G, data, loss_node, params, batch_size, epochs, lr, tape, optimizer, workers)
+
     # Forward propagation function
     def forward_propagate(G, in1, in1_value, updated_nodes=None):
+        if isinstance(G, CompactGraph):
+            return G.forward_propagate(in1, in1_value)
+
         # Initialize the set of updated nodes if it's None
         if updated_nodes is None:
             updated_nodes = set()
+        Engine.new_epoch(G)
+
+        # Depth-first walk with an explicit stack of frames instead of recursion, so the
+        # depth of the graph is not limited by the Python stack. Each frame is a generator
+        # that yields the (node, value) pairs it would have recursed into.
+        stack = [Engine.forward_frame(G, in1, in1_value, updated_nodes)]
+        while stack:
+            step = next(stack[-1], None)
+            if step is None:
+                stack.pop()
+            else:
+                stack.append(Engine.forward_frame(G, step[0], step[1], updated_nodes))
 
+    # One frame of forward_propagate: sets the value of in1 and evaluates its ops
+    def forward_frame(G, in1, in1_value, updated_nodes):
         prev_in1_value = G.nodes[in1]['value'] 
         G.nodes[in1]['value'] =in1_value
         updated_nodes.add(in1)  # Mark the current node as updated
@@ -54,103 +108,144 @@ class Engine:
 
             # Handle the optional second operand
             in2 = next((node for node in G.predecessors(op) if node != in1), None)
-            in2_value = G.nodes[in2]['value'] if in2 else None
+            in2_value = G.nodes[in2]['value'] if in2 is not None else None
 
             out = next(G.successors(op), None)
 
-            # Calculate the output value based on the operation
-            if op_name == '+':
-                out_value = in1_value + (in2_value if in2_value is not None else 0)
-            elif op_name == '-':
-                if in2_value is not None:
-                    if reverse:
-                        out_value = in2_value - in1_value
-                    else:
-                        out_value = in1_value - in2_value
-                else:
-                    out_value = in1_value
-            elif op_name == '*':
-                out_value = in1_value * (in2_value if in2_value is not None else 1)
-            elif op_name == 'log':
-                if in1_value > 0:
-                    out_value = np.log(in1_value)
-                else:
-                    print(f"Error: Log of non-positive number {in1_value}")
-                    return
-            elif op_name == 'sin':
-                out_value = np.sin(in1_value)
-            elif op_name == 'ReLU':
-                if in1_value > 0:
-                    out_value = in1_value
-                else:
-                    out_value = 0
-            elif op_name == 'sqr':
-                out_value = in1_value**2
-            elif op_name == 'sqrt':
-                if in1_value >= 0:
-                    out_value = np.sqrt(in1_value)
-                else:
-                    print(f"Error: sqrt of negative number {in1_value}")
-                    return
-            elif op_name == 'store':
+            if op_name == 'store':
                 if out not in updated_nodes:  # Only update 'out' if it hasn't been updated yet
-                    forward_propagate(G, out, prev_in1_value, updated_nodes)
+                    yield out, prev_in1_value
                 G.nodes[in1]['value'] = in1_value
                 continue
 
+            # Calculate the output value with the kernel of the op, or its tensor kernel if an
+            # operand is a NumPy array. A binary op without a second operand passes its first
+            # operand through.
+            code = opcode(op_name)
+            if in2_value is None and OPS[code].arity == 2:
+                out_value = in1_value
+            else:
+                x, y = (in2_value, in1_value) if reverse else (in1_value, in2_value)
+                forward = FORWARD_TENSOR if is_tensor(x) or is_tensor(y) else FORWARD
+                try:
+                    out_value = forward[code](x, y)
+                except ValueError as e:
+                    print(e)
+                    return
+
             # Store the output value back into the graph
             if out not in updated_nodes:  # Only update 'out' if it hasn't been updated yet
                 G.nodes[out]['value'] = out_value
 
-            # Now recursively forward propagate the new value to the next nodes
-            forward_propagate(G, out, out_value, updated_nodes)
-
-    # Backward propagation function
-    def backward_propagate(G, node_id, lr):
-        if G.nodes[node_id]['name'][0] in {'w', 'b'}:  # variable names start with 'w' or 'b'
-                G.nodes[node_id]['value'] -= lr * G.nodes[node_id]['grad']
-                G.nodes[node_id]['grad'] = 0 # reset the gradient to zero 
-        else:
-            grad = G.nodes[node_id]['grad']
-            if G.nodes[node_id]['name'] == 'e2':
-                G.nodes[node_id]['grad'] = 1
-            else:
-                G.nodes[node_id]['grad'] = 0 # reset the gradient to zero       
-            for op, _ in G.in_edges(node_id):
-                op_name = G.nodes[op]['name']
-
-                in1 = next((node for node in G.predecessors(op)), None)
-                in1_value = G.nodes[in1]['value'] if in1 else None
-
-                in2 = next((node for node in G.predecessors(op) if node != in1), None)
-                in2_value = G.nodes[in2]['value'] if in2 else None
-                reverse = G[in2][op].get('reverse', False) if in2 else False
-
-                if op_name == '+':
-                    G.nodes[in1]['grad'] += grad
-                    G.nodes[in2]['grad'] += grad
-                elif op_name == '-':
-                    G.nodes[in1]['grad'] += grad 
-                    G.nodes[in2]['grad'] += -grad if reverse else grad
-                elif op_name == '*':
-                    G.nodes[in1]['grad'] += grad * in2_value
-                    G.nodes[in2]['grad'] += grad * in1_value
-                elif op_name == 'log':
-                    G.nodes[in1]['grad'] += grad / in1_value
-                elif op_name == 'sin':
-                    G.nodes[in1]['grad']  += grad * np.cos(in1_value)
-                elif op_name == 'ReLU':
-                    G.nodes[in1]['grad'] += grad if in1_value > 0 else 0
-                elif op_name == 'sqr':
-                    G.nodes[in1]['grad'] += grad * 2 * in1_value
-                elif op_name == 'sqrt':
-                    if in1_value > 0:
-                        G.nodes[in1]['grad'] += grad / (2 * np.sqrt(in1_value))
-                    else:
-                        raise ValueError(f"Error: gradient through sqrt of negative number {in1_value}")
-
-                for in_node, _ in G.in_edges(op):
-                    backward_propagate(G, in_node, lr)
+            # Now forward propagate the new value to the next nodes
+            yield out, out_value
+
+    # Pull-based evaluation of the requested num nodes
+    def evaluate(G, outputs, inputs=None):
+        # Only the ancestors of the outputs are computed. Results are memoized in G.graph['memo']
+        # until the next epoch, so polling the same outputs again is a dictionary lookup.
+        if inputs:
+            for node, value in inputs.items():
+                G.nodes[node]['value'] = value
+            Engine.new_epoch(G)
+        memo = G.graph.setdefault('memo', {})
+
+        entered = set()
+        for output in outputs:
+            stack = [output]
+            while stack:
+                node = stack[-1]
+                if node in memo:
+                    stack.pop()
+                    continue
+                entered.add(node)
+
+                # Source nodes and 'store' outputs hold their own value
+                op = next(G.predecessors(node), None)
+                if op is None or G.nodes[op]['name'] == 'store':
+                    memo[node] = G.nodes[node]['value']
+                    stack.pop()
+                    continue
+
+                # The operand flagged `reverse` is the second one
+                operands = sorted(G.predecessors(op), key=lambda n: bool(G[n][op].get('reverse', False)))
+                pending = [operand for operand in operands if operand not in memo]
+                if pending:
+                    for operand in pending:
+                        if operand in entered:
+                            raise ValueError("The ops form a cycle that does not go through a 'store' op")
+                    stack.extend(pending)
+                    continue
+
+                # A binary op without a second operand passes its first operand through, as in forward_frame
+                in1_value = memo[operands[0]]
+                in2_value = memo[operands[1]] if len(operands) > 1 else None
+                code = opcode(G.nodes[op]['name'])
+                if in2_value is None and OPS[code].arity == 2:
+                    value = in1_value
+                else:
+                    forward = FORWARD_TENSOR if is_tensor(in1_value) or is_tensor(in2_value) else FORWARD
+                    value = forward[code](in1_value, in2_value)
+                G.nodes[node]['value'] = memo[node] = value
+                stack.pop()
+
+        return {output: memo[output] for output in outputs}
+
+    # Start a new evaluation epoch, dropping the values memoized by evaluate
+    def new_epoch(G):
+        G.graph['memo'] = {}
+
+    # Backward propagation function: the gradient of the loss, by default the designated one,
+    # then one update of the registered parameters if lr is given, a float for plain SGD or an
+    # optimizer of trengx.engine.optim
+    def backward_propagate(G, node_id=None, lr=None):
+        if isinstance(G, CompactGraph):
+            return G.backward_propagate(node_id, lr)
+        Engine.new_epoch(G)
+        if node_id is None:
+            node_id = get_loss(G)
+            if node_id is None:
+                raise ValueError("No loss given and none designated with set_loss")
+        params = get_params(G)
+        for param in params:
+            G.nodes[param]['grad'] = 0
+        G.nodes[node_id]['grad'] = 1
+        Engine.backward_frame(G, node_id, set(params))
+        G.nodes[node_id]['grad'] = 1
+        if isinstance(lr, Optimizer):
+            values = [G.nodes[param]['value'] for param in params]
+            apply(lr, values, [G.nodes[param]['grad'] for param in params], range(len(params)))
+            for param, value in zip(params, values):
+                G.nodes[param]['value'] = value
+        elif lr is not None:
+            for param in params:
+                G.nodes[param]['value'] = G.nodes[param]['value'] - lr * G.nodes[param]['grad']
+
+    # Push the gradient of a num node through the ops computing it. Parameters keep the
+    # gradient accumulated over every path; other nodes are reset once they passed it on.
+    def backward_frame(G, node_id, params):
+        if node_id in params:
+            return
+        grad = G.nodes[node_id]['grad']
+        G.nodes[node_id]['grad'] = 0 # reset the gradient to zero
+        for op, _ in G.in_edges(node_id):
+            op_name = G.nodes[op]['name']
+
+            # The operand flagged `reverse` is the second one; 'store' ops pass no gradient
+            if op_name != 'store':
+                operands = sorted(G.predecessors(op), key=lambda node: bool(G[node][op].get('reverse', False)))
+                in1_value = G.nodes[operands[0]]['value']
+                in2_value = G.nodes[operands[1]]['value'] if len(operands) > 1 else None
+                if is_tensor(in1_value) or is_tensor(in2_value) or is_tensor(grad):
+                    grads = BACKWARD_TENSOR[opcode(op_name)](in1_value, in2_value, grad)
+                    grads = [unbroadcast(g, G.nodes[node]['value']) for node, g in zip(operands, grads)]
+                else:
+                    grads = BACKWARD[opcode(op_name)](in1_value, in2_value, grad)
+                for operand, operand_grad in zip(operands, grads):
+                    G.nodes[operand]['grad'] += operand_grad
+
+            for in_node, _ in G.in_edges(op):
+                Engine.backward_frame(G, in_node, params)
 
 class Neuron:
     def __init__(self, G):
@@ -158,8 +253,35 @@ class Neuron:
         self.create()
 
     def create(self):
-        self.inlet, self.b, _, self.v = op2(self.G, in1_name = 'inlet', in2_name = 'b', op_name='+', out_name = 'v')
-        _, _, self.outlet = op1(self.G, in_id=self.v, op_name='ReLU', out_name = 'outlet')
+        self.inlet, self.b, _, self.v = Engine.op2(self.G, in1_name = 'inlet', in2_name = 'b', op_name='+', out_name = 'v')
+        _, _, self.outlet = Engine.op1(self.G, in_id=self.v, op_name='ReLU', out_name = 'outlet')
 
     def get_nodes(self):
         return self.inlet, self.b, self.v, self.outlet
+
+class Dense:
+    # A dense layer outlet = activation(inlet @ w + b) on tensor-valued nodes: a handful of
+    # nodes per layer instead of one Neuron per output and one '*' op per weight.
+    # inlet holds a vector of in_dim values, or a (batch, in_dim) matrix.
+    def __init__(self, G, in_dim, out_dim, in_id=None, activation='ReLU', name='', seed=None):
+        self.G = G
+        self.in_dim = in_dim
+        self.out_dim = out_dim
+        self.in_id = in_id
+        self.activation = activation
+        self.name = name
+        self.rng = np.random.default_rng(seed)
+        self.create()
+
+    def create(self):
+        # He initialization of the weights, zero biases
+        w = self.rng.normal(0.0, np.sqrt(2.0 / self.in_dim), size=(self.in_dim, self.out_dim))
+        b = np.zeros(self.out_dim)
+        self.inlet, self.w, _, z = Engine.op2(self.G, in1_id=self.in_id, in1_name='inlet', in2_name='w' + self.name, in2_value=w, op_name='matmul', out_name='z' + self.name)
+        _, self.b, _, self.v = Engine.op2(self.G, in1_id=z, in2_name='b' + self.name, in2_value=b, op_name='+', out_name='v' + self.name)
+        self.outlet = self.v
+        if self.activation is not None:
+            _, _, self.outlet = Engine.op1(self.G, in_id=self.v, op_name=self.activation, out_name='outlet' + self.name)
+
+    def get_nodes(self):
+        return self.inlet, self.w, self.b, self.outlet
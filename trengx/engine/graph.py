@@ -1,17 +1,272 @@
 # Graph class
 import uuid
-from typing import Optional, List, Dict, Any
+from collections import deque, OrderedDict
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Iterator, Callable
 from neo4j import GraphDatabase as graphdb
 
+from .ops import cypher_case
+
+# Node and edge labels whose 'uuid' property is indexed by Graph.ensure_schema().
+# Lookups by uuid are scoped to these labels so that the planner can use the indexes, so
+# nodes and edges can only be created with one of them.
+NODE_LABELS = ('num', 'op')
+EDGE_LABELS = ('num2op', 'op2num')
+NODE_LABEL_EXPRESSION = ':' + '|'.join(NODE_LABELS)
+EDGE_LABEL_EXPRESSION = ':' + '|'.join(EDGE_LABELS)
+
+# Number of inner transactions per query when deleting in transactions; progress is reported after each query
+DELETE_TRANSACTIONS_PER_QUERY = 10
+
+# Default number of propagation plans cached by Graph and AsyncGraph, see _PlanCache
+MAX_PLANS = 1024
+
+# Lists the ops downstream of a set of num nodes, each once, with their output, their operands
+# and the uuids of the edges connecting them
+PROPAGATION_PLAN_QUERY = """
+    MATCH (src:num)
+    WHERE src.uuid IN $node_ids
+
+    CALL apoc.path.subgraphNodes(src, {
+    relationshipFilter: 'num2op>|op2num>',
+    maxLevel: -1
+    }) YIELD node
+
+    WITH DISTINCT node
+    WHERE node:op
+    MATCH (node)-[ro:op2num]->(out:num)
+    MATCH (input:num)-[ri:num2op]->(node)
+
+    RETURN node.uuid AS op, node.name AS name, out.uuid AS out, ro.uuid AS out_edge,
+           collect({id: input.uuid, edge: ri.uuid, reverse: coalesce(ri.reverse, false)}) AS inputs
+"""
+
+# Sets the values of num nodes and applies a propagation plan, one step after the other,
+# around the Cypher CASE of the op registry (see apply_propagation_plan_query)
+_APPLY_PROPAGATION_PLAN_QUERY = """
+    UNWIND $inputs AS input
+    MATCH (src:num)
+    WHERE src.uuid = input.id
+    SET src.value = input.value
+
+    WITH count(src) AS updated
+
+    UNWIND $plan AS step
+    CALL {
+        WITH step
+        MATCH (in1:num) WHERE in1.uuid = step.in1
+        MATCH (op:op) WHERE op.uuid = step.op
+        MATCH (out:num) WHERE out.uuid = step.out
+        OPTIONAL MATCH (in2:num) WHERE in2.uuid = step.in2
+        WITH in1, step.reverse AS is_reverse, op, out, in2
+        SET out.value =
+"""
+
+
+def apply_propagation_plan_query() -> str:
+    """
+    Returns the query setting the `$inputs` values and applying the `$plan` steps in order.
+
+    The values of the ops are computed with the ops of trengx.engine.ops that have a Cypher expression.
+    """
+    return _APPLY_PROPAGATION_PLAN_QUERY + cypher_case() + "    }\n"
+
+
+def _propagation_plan(records: List[dict], node_ids: List[str]):
+    """
+    Builds the propagation plan of source nodes from the records of PROPAGATION_PLAN_QUERY.
+
+    Returns:
+        tuple: The plan, a list of {'in1', 'in2', 'op', 'out', 'reverse'} steps evaluating every
+        op downstream of the sources once in topological order, and the set of node and edge
+        uuids the plan depends on. Ops writing to a source are left out, the source value wins.
+    """
+    ops = []
+    uuids = set(node_ids)
+    for op in records:
+        uuids.update((op['op'], op['out'], op['out_edge']))
+        for operand in op['inputs']:
+            uuids.update((operand['id'], operand['edge']))
+        if op['out'] not in node_ids:
+            ops.append(op)
+    return _order_plan(ops), uuids
+
+
+def _order_plan(ops: List[dict]) -> List[dict]:
+    """
+    Orders the ops of a propagation plan topologically, each op exactly once.
+
+    An op is evaluated after the ops producing its operands. A 'store' op is a delay
+    element: the consumers of its output read the previous value, so they are evaluated
+    before the store op instead of after it.
+
+    Args:
+        ops (list[dict]): One dictionary per op with 'op', 'name', 'out' and 'inputs',
+            a list of {'id', 'reverse'} operands.
+
+    Returns:
+        list[dict]: The (in1, in2, op, out, reverse) steps in evaluation order. `in1` is the
+        operand whose edge is not reversed when there is one.
+
+    Raises:
+        Exception: If the ops form a cycle that does not go through a 'store' op.
+    """
+    producers = {op['out']: index for index, op in enumerate(ops)}
+    successors = [[] for _ in ops]
+    in_degree = [0] * len(ops)
+    for index, op in enumerate(ops):
+        for operand in op['inputs']:
+            producer = producers.get(operand['id'])
+            if producer is None or producer == index:
+                continue
+            if ops[producer]['name'] == 'store':
+                before, after = index, producer
+            else:
+                before, after = producer, index
+            successors[before].append(after)
+            in_degree[after] += 1
+
+    ready = deque(index for index, degree in enumerate(in_degree) if degree == 0)
+    plan = []
+    while ready:
+        index = ready.popleft()
+        op = ops[index]
+        inputs = sorted(op['inputs'], key=lambda operand: operand['reverse'])
+        plan.append({
+            'in1': inputs[0]['id'],
+            'in2': inputs[1]['id'] if len(inputs) > 1 else None,
+            'op': op['op'],
+            'out': op['out'],
+            'reverse': inputs[0]['reverse'],
+        })
+        for successor in successors[index]:
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                ready.append(successor)
+
+    if len(plan) != len(ops):
+        raise Exception("The ops downstream of the node form a cycle without a 'store' op")
+    return plan
+
+
+class _PlanCache:
+    """
+    Propagation plans of set_node_value, keyed by their sources.
+
+    Each plan is also indexed by the uuids of the nodes and edges it touches, so that a
+    structural change only invalidates the plans of the subgraphs it affects. At most
+    `max_plans` plans are kept; the least recently used one is evicted first, so that
+    sources reported in ever new combinations do not grow the cache without bound.
+
+    `generation` counts the invalidations. A plan read while one happens may describe the old
+    structure, so `put` skips it when given the generation read before the plan query.
+    """
+    def __init__(self, max_plans: int = MAX_PLANS):
+        if not isinstance(max_plans, int) or max_plans <= 0:
+            raise ValueError("max_plans must be a positive integer")
+        self.max_plans = max_plans
+        self.plans = OrderedDict()
+        self.uuids = {}
+        self.index = {}
+        self.generation = 0
+
+    def get(self, key):
+        plan = self.plans.get(key)
+        if plan is not None:
+            self.plans.move_to_end(key)
+        return plan
+
+    def put(self, key, plan: list, uuids, generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self.generation:
+            return
+        self._drop(key)
+        self.plans[key] = plan
+        self.uuids[key] = set(uuids)
+        for id in self.uuids[key]:
+            self.index.setdefault(id, set()).add(key)
+        while len(self.plans) > self.max_plans:
+            self._drop(next(iter(self.plans)))
+
+    def invalidate(self, *uuids) -> None:
+        """
+        Drops every plan touching one of the given node or edge uuids.
+        """
+        self.generation += 1
+        for id in uuids:
+            for key in list(self.index.get(id, ())):
+                self._drop(key)
+
+    def _drop(self, key) -> None:
+        # Unindex the plan from every uuid it touches, so that the index only holds cached plans
+        self.plans.pop(key, None)
+        for id in self.uuids.pop(key, ()):
+            keys = self.index.get(id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.index[id]
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.plans.clear()
+        self.uuids.clear()
+        self.index.clear()
+
+
+class _Batch:
+    """
+    Holds the session and the explicit transaction shared by every operation issued
+    inside `Graph.batch()`.
+
+    Attributes:
+        session : The session the transaction is opened on.
+        tx : The currently open explicit transaction.
+        flush_every (int): Commit and reopen the transaction after this many operations, or None.
+        pending (int): The number of operations run in the current transaction.
+    """
+    def __init__(self, session, flush_every: Optional[int] = None):
+        self.session = session
+        self.flush_every = flush_every
+        self.pending = 0
+        self.tx = session.begin_transaction()
+
+    def run(self, transaction_function, *args):
+        """
+        Runs a transaction function in the open transaction, flushing when `flush_every` is reached.
+        """
+        result = transaction_function(self.tx, *args)
+        self.pending += 1
+        if self.flush_every and self.pending >= self.flush_every:
+            self.flush()
+        return result
+
+    def flush(self) -> None:
+        """
+        Commits the open transaction and begins a new one on the same session.
+        """
+        self.tx.commit()
+        self.pending = 0
+        self.tx = self.session.begin_transaction()
+
+    def commit(self) -> None:
+        self.tx.commit()
+
+    def rollback(self) -> None:
+        self.tx.rollback()
+
+
 class Graph:
     """
     This class acts as an interface for executing and managing basic graph operations
     on a Neo4j graph database.
 
+    Nodes and edges are looked up by uuid among the NODE_LABELS and EDGE_LABELS only.
+
     Attributes:
         driver : A driver object that maintains the connection to the database.
     """
-    def __init__(self, uri: str, user: str, password: str):
+    def __init__(self, uri: str, user: str, password: str, ensure_schema: bool = False,
+                 max_plans: int = MAX_PLANS):
         """
         Initializes the Graph object with a connection to the database.
 
@@ -19,11 +274,17 @@ class Graph:
             uri (str): The connection string for the database.
             user (str): The username for the database.
             password (str): The password for the database.
+            ensure_schema (bool, optional): Create the uuid constraints and indexes right away.
+            max_plans (int, optional): The maximum number of cached propagation plans of set_node_value(s).
         """
+        self._batch = None
+        self._plans = _PlanCache(max_plans)
         try:
             self.driver = graphdb.driver(uri, auth=(user, password))
         except Exception as e:
             raise Exception(f"Failed to create driver: {e}")
+        if ensure_schema:
+            self.ensure_schema()
 
     def close(self) -> None:
         """
@@ -34,7 +295,107 @@ class Graph:
         except Exception as e:
             raise Exception(f"Failed to close driver: {e}")
 
+    def _execute_write(self, transaction_function, *args):
+        """
+        Runs a transaction function as a write, inside the active batch if there is one.
+        """
+        if self._batch is not None:
+            return self._batch.run(transaction_function, *args)
+        with self.driver.session() as session:
+            return session.write_transaction(transaction_function, *args)
+
+    def _execute_read(self, transaction_function, *args):
+        """
+        Runs a transaction function as a read, inside the active batch if there is one.
+        """
+        if self._batch is not None:
+            return self._batch.run(transaction_function, *args)
+        with self.driver.session() as session:
+            return session.read_transaction(transaction_function, *args)
+
+    # Batch
+    @contextmanager
+    def batch(self, flush_every: Optional[int] = None):
+        """
+        Context manager running every Graph operation issued inside it in one explicit
+        transaction on one session.
+
+        The transaction is committed once on exit, or rolled back if the block raises.
+        Operations are not thread safe while a batch is active.
+
+        Args:
+            flush_every (int, optional): Commit after every `flush_every` operations and
+                continue in a new transaction, to bound the size of long batches.
+
+        Yields:
+            Graph: This Graph object.
+
+        Example:
+            with g.batch() as b:
+                b.set_node_value(x_id, 1.0)
+                b.get_node_value(y_id)
+        """
+        if self._batch is not None:
+            raise RuntimeError("A batch is already active on this Graph")
+        if flush_every is not None and (not isinstance(flush_every, int) or flush_every <= 0):
+            raise ValueError("flush_every must be a positive integer")
+
+        with self.driver.session() as session:
+            self._batch = _Batch(session, flush_every)
+            try:
+                yield self
+            except Exception:
+                self._batch.rollback()
+                # Plans computed inside the batch may describe rolled back edges
+                self._plans.clear()
+                raise
+            else:
+                self._batch.commit()
+            finally:
+                self._batch = None
+
+    def flush(self) -> None:
+        """
+        Commits the operations issued so far in the active batch and continues in a new transaction.
+        Does nothing outside of a batch.
+        """
+        if self._batch is not None:
+            self._batch.flush()
+
+    # Schema
+    def ensure_schema(self) -> None:
+        """
+        Creates the uniqueness constraints on the uuid of NODE_LABELS nodes and the property
+        indexes on the uuid of EDGE_LABELS relationships, if they do not exist yet.
+
+        Without them every lookup by uuid is a full node or relationship scan.
+        """
+        if self._batch is not None:
+            raise RuntimeError("ensure_schema cannot run inside a batch")
+
+        statements = [
+            f"CREATE CONSTRAINT {label}_uuid IF NOT EXISTS FOR (n:{label}) REQUIRE n.uuid IS UNIQUE"
+            for label in NODE_LABELS
+        ] + [
+            f"CREATE INDEX {label}_uuid IF NOT EXISTS FOR ()-[r:{label}]-() ON (r.uuid)"
+            for label in EDGE_LABELS
+        ]
+        try:
+            with self.driver.session() as session:
+                for statement in statements:
+                    session.run(statement).consume()
+        except Exception as e:
+            raise Exception(f"Failed to create schema: {e}")
+
     # Run query
+    @staticmethod
+    def _run_query_tx(tx, query: str, parameters: Optional[Dict[str, Any]] = None):
+        """
+        Private helper function to run an arbitrary Cypher query within a transaction.
+        """
+        result = tx.run(query, parameters)
+        return [record.data() for record in result]
+
     def run_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Runs an arbitrary Cypher query on the database.
@@ -61,6 +422,8 @@ class Graph:
             raise TypeError(f"Expected dict for parameters, got {type(parameters)}")
 
         try:
+            if self._batch is not None:
+                return self._batch.run(self._run_query_tx, query, parameters)
             with self.driver.session() as session:
                 result = session.run(query, parameters)
                 return [record.data() for record in result]
@@ -70,6 +433,80 @@ class Graph:
             # then raise the original exception
             raise e
 
+    # Stream query
+    def _stream_records(self, query: str, parameters: Optional[Dict[str, Any]], fetch_size: int):
+        """
+        Private generator yielding the raw records of a query as they are fetched from the server.
+        """
+        if not isinstance(query, str):
+            raise TypeError(f"Expected str for query, got {type(query)}")
+        if parameters is not None and not isinstance(parameters, dict):
+            raise TypeError(f"Expected dict for parameters, got {type(parameters)}")
+        if not isinstance(fetch_size, int) or fetch_size <= 0:
+            raise ValueError("fetch_size must be a positive integer")
+
+        if self._batch is not None:
+            yield from self._batch.tx.run(query, parameters)
+            return
+        with self.driver.session(fetch_size=fetch_size) as session:
+            yield from session.run(query, parameters)
+
+    def stream_query(self, query: str, parameters: Optional[Dict[str, Any]] = None, fetch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Runs an arbitrary Cypher query and yields its records lazily.
+
+        Records are pulled from the server `fetch_size` at a time, so large results are never
+        held in memory at once. The session stays open until the generator is exhausted or closed.
+
+        Args:
+            query (str): The Cypher query to run.
+            parameters (dict, optional): The parameters for the query.
+            fetch_size (int, optional): The number of records fetched per round trip.
+
+        Yields:
+            dict: One dictionary per record returned by the query.
+
+        Example:
+            for record in g.stream_query("MATCH (n:num) RETURN n.uuid AS id, n.value AS value"):
+                ...
+        """
+        for record in self._stream_records(query, parameters, fetch_size):
+            yield record.data()
+
+    def query_columns(self, query: str, parameters: Optional[Dict[str, Any]] = None, fetch_size: int = 1000, numpy: bool = False) -> Dict[str, Any]:
+        """
+        Runs an arbitrary Cypher query and returns its result column by column.
+
+        No dictionary is built per record; the values are appended to one list per column.
+
+        Args:
+            query (str): The Cypher query to run.
+            parameters (dict, optional): The parameters for the query.
+            fetch_size (int, optional): The number of records fetched per round trip.
+            numpy (bool, optional): Return each column as a NumPy array instead of a list.
+
+        Returns:
+            dict: The column names mapped to lists (or NumPy arrays) of values.
+
+        Example:
+            columns = g.query_columns("MATCH (n:num) RETURN n.value AS value", numpy=True)
+            columns['value'].mean()
+        """
+        columns = None
+        for record in self._stream_records(query, parameters, fetch_size):
+            if columns is None:
+                keys = record.keys()
+                columns = [[] for _ in keys]
+            for column, value in zip(columns, record.values()):
+                column.append(value)
+        if columns is None:
+            return {}
+
+        if numpy:
+            import numpy as np
+            columns = [np.asarray(column) for column in columns]
+        return dict(zip(keys, columns))
+
 
     def __del__(self):
         """
@@ -85,7 +522,7 @@ class Graph:
 
         Args:
             tx: Transaction object.
-            node_label (str): The label to assign to the node.
+            node_label (str): The label to assign to the node, one of NODE_LABELS.
             properties (dict): Additional properties to assign to the node.
 
         Returns:
@@ -107,7 +544,7 @@ class Graph:
         and calls the helper function `_create_node_tx` to add the node.
 
         Args:
-            node_label (str): The label to assign to the node.
+            node_label (str): The label to assign to the node, one of NODE_LABELS.
             properties (dict, optional): Additional properties to assign to the node.
 
         Returns:
@@ -115,15 +552,75 @@ class Graph:
         """
         if not isinstance(node_label, str):
             raise TypeError("node_label must be a string")
+        if node_label not in NODE_LABELS:
+            raise ValueError(f"node_label must be one of {NODE_LABELS}, got '{node_label}'")
         if not isinstance(properties, dict):
             raise TypeError("properties must be a dictionary")
-        with self.driver.session() as session:
-            try:
-                node = session.write_transaction(self._add_node_tx, node_label, properties)
-                return node
-            except Exception as e:
-                raise Exception(f"Failed to add node: {e}")
-            
+        try:
+            node = self._execute_write(self._add_node_tx, node_label, properties)
+            return node
+        except Exception as e:
+            raise Exception(f"Failed to add node: {e}")
+
+    # Add nodes
+    @staticmethod
+    def _add_nodes_tx(tx, node_label: str, rows: List[dict]):
+        """
+        Private helper function to create a chunk of nodes within a single transaction.
+
+        Args:
+            tx: Transaction object.
+            node_label (str): The label to assign to every node in the chunk.
+            rows (list[dict]): The node properties, each already carrying its client-side 'uuid'.
+
+        Returns:
+            list[dict]: Dictionaries representing the newly created nodes, in the order of `rows`.
+        """
+        query = f"UNWIND $rows AS row CREATE (n:{node_label}) SET n = row RETURN n"
+        result = tx.run(query, rows=rows)
+        created = {}
+        for record in result:
+            node = record['n']
+            node_properties = dict(node.items())
+            del node_properties['uuid']
+            created[node['uuid']] = {'id': node['uuid'], 'label': list(node.labels), 'properties': node_properties}
+        return [created[row['uuid']] for row in rows]
+
+    def add_nodes(self, node_label: str, properties: List[dict], chunk_size: int = 1000):
+        """
+        Public function to add many nodes with the same label in a Neo4j graph database.
+
+        The UUIDs are generated client-side and the nodes are created with one UNWIND
+        query per chunk of `chunk_size` nodes, so a model with tens of thousands of nodes
+        costs a handful of round trips instead of one per node.
+
+        Args:
+            node_label (str): The label to assign to the nodes, one of NODE_LABELS.
+            properties (list[dict]): One dictionary of properties per node to create.
+            chunk_size (int, optional): The maximum number of nodes created per transaction.
+
+        Returns:
+            list[dict]: Dictionaries representing the newly created nodes, in input order.
+        """
+        if not isinstance(node_label, str):
+            raise TypeError("node_label must be a string")
+        if node_label not in NODE_LABELS:
+            raise ValueError(f"node_label must be one of {NODE_LABELS}, got '{node_label}'")
+        if not isinstance(properties, list) or not all(isinstance(p, dict) for p in properties):
+            raise TypeError("properties must be a list of dictionaries")
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+
+        rows = [dict(p, uuid=str(uuid.uuid4())) for p in properties]
+        nodes = []
+        try:
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                nodes.extend(self._execute_write(self._add_nodes_tx, node_label, chunk))
+            return nodes
+        except Exception as e:
+            raise Exception(f"Failed to add nodes: {e}")
+
     # Get node
     @staticmethod
     def _get_node_tx(tx, node_id: str):
@@ -138,7 +635,7 @@ class Graph:
             dict: A dictionary representing the retrieved node.
         """
     
-        query = "MATCH (n) WHERE n.uuid = $node_id RETURN n"
+        query = f"MATCH (n{NODE_LABEL_EXPRESSION}) WHERE n.uuid = $node_id RETURN n"
         result = tx.run(query, node_id=node_id).single()
         if result is None:
             return f"No node found with node_id: {node_id}"
@@ -164,11 +661,10 @@ class Graph:
         """        
         if not isinstance(node_id, str):
             raise TypeError("node_id must be a string")
-        with self.driver.session() as session:
-            try:
-                return session.read_transaction(self._get_node_tx, node_id)
-            except Exception as e:
-                raise Exception(f"Failed to retrieve node: {e}")
+        try:
+            return self._execute_read(self._get_node_tx, node_id)
+        except Exception as e:
+            raise Exception(f"Failed to retrieve node: {e}")
 
 
     # Update node properties
@@ -188,7 +684,7 @@ class Graph:
         Raises:
             Exception: If no node is found.
         """
-        query = "MATCH (n) WHERE n.uuid = $node_id SET n += $properties RETURN n"
+        query = f"MATCH (n{NODE_LABEL_EXPRESSION}) WHERE n.uuid = $node_id SET n += $properties RETURN n"
         result = tx.run(query, node_id=node_id, properties=properties).single()
         if result is None:
             raise Exception(f"No node found with node_id: {node_id}")
@@ -217,11 +713,14 @@ class Graph:
             raise TypeError("node_id must be a string")
         if not isinstance(properties, dict):
             raise TypeError("properties must be a dictionary")
-        with self.driver.session() as session:
-            try:
-                return session.write_transaction(self._update_node_properties_tx, node_id, properties)
-            except Exception as e:
-                raise Exception(f"Failed to update node properties: {e}")
+        try:
+            node = self._execute_write(self._update_node_properties_tx, node_id, properties)
+        except Exception as e:
+            raise Exception(f"Failed to update node properties: {e}")
+        # Renaming an op, for instance to or from 'store', changes the order of the plans through it
+        if 'op' in node['label']:
+            self._plans.invalidate(node_id)
+        return node
 
     # Delete node
     @staticmethod
@@ -238,7 +737,7 @@ class Graph:
             bool: True if the node was deleted, False otherwise.
         """
         try:
-            query = "MATCH (n) WHERE n.uuid = $node_id"
+            query = f"MATCH (n{NODE_LABEL_EXPRESSION}) WHERE n.uuid = $node_id"
             
             if detach:
                 query += " DETACH DELETE n"
@@ -257,7 +756,8 @@ class Graph:
             raise Exception(f"Failed to delete node: {e}")
 
 
-    def delete_node(self, node_id: str, detach: bool = False):
+    def delete_node(self, node_id: str, detach: bool = False, batch_size: Optional[int] = None,
+                    progress: Optional[Callable[[int, int], None]] = None):
         """
         Public function to delete a node from the graph database based on its ID.
 
@@ -267,103 +767,73 @@ class Graph:
         Args:
             node_id (str): The ID of the node to delete.
             detach (bool, optional): Flag indicating whether to delete the node with or without detaching relationships.
+            batch_size (int, optional): With `detach`, delete the relationships of the node in transactions
+                of `batch_size` rows first, so that high-degree nodes are deleted in constant memory.
+            progress (callable, optional): With `batch_size`, called with the cumulative numbers
+                of deleted edges and nodes as the deletion proceeds.
 
         Returns:
             bool: True if the node was deleted, False otherwise.
+
+        Raises:
+            ValueError: If `batch_size` is given without `detach`.
+
+        Example:
+            g.delete_node(hub_id, detach=True, batch_size=10000, progress=lambda edges, nodes: print(edges))
         """
         if not isinstance(node_id, str):
             raise TypeError("node_id must be a string")
         if not isinstance(detach, bool):
             raise TypeError("detach must be a boolean")
+        if batch_size is not None and not detach:
+            raise ValueError("batch_size requires detach=True")
 
-        with self.driver.session() as session:
+        self._plans.invalidate(node_id)
+        if batch_size is not None:
+            match = f"MATCH (n{NODE_LABEL_EXPRESSION}) WHERE n.uuid = $node_id"
             try:
-                return session.write_transaction(self._delete_node_tx, node_id, detach)
+                _, deleted_nodes = self._delete_in_transactions(match, {'node_id': node_id}, batch_size, progress)
+                return deleted_nodes > 0
             except Exception as e:
                 raise Exception(f"Failed to delete node: {e}")
+        try:
+            return self._execute_write(self._delete_node_tx, node_id, detach)
+        except Exception as e:
+            raise Exception(f"Failed to delete node: {e}")
 
 
 
     #Set node value
     @staticmethod
-    def _set_node_value_tx(tx, node_id:str, value):
+    def _get_propagation_plan_tx(tx, node_ids: List[str]):
         """
-        1. MATCH path = (in1)-[r:num2op|op2num*0..]->() WHERE id(in1) = $node_id AND all(rel IN relationships(path) WHERE rel.trigger = true):
-        Find a path that begins from a node (in1) which has the ID specified by the parameter node_id. 
-        The path can include any number of num2op or op2num relationships (from none at all, up to an infinite number, 
-        denoted by *0..). The num2op relationship likely signifies the operation to perform on a number 
-        and the op2num relationship likely represents the number to perform the operation on. 
-        The WHERE clause ensures all relationships in this path have a trigger property that is true.
+        Private helper function to compute the propagation plan of source nodes within a transaction.
 
-        2. WITH path ORDER BY length(path) DESC LIMIT 1 WITH nodes(path) AS nodes:
-        This statement orders all found paths by their length in descending order and limits the result to the longest path. 
-        Then, the nodes of this longest path are collected into a list called nodes.
-
-        3. UNWIND range(0, size(nodes)-2, 2) AS i WITH nodes[i] AS in1, nodes[i+1] AS op, nodes[i+2] AS out:
-        The UNWIND statement creates a new row for each value in the range from 0 to the size of nodes - 2, stepping by 2. 
-        This is used to group the nodes into triples (in1, op, out).
+        Args:
+            tx: Transaction object.
+            node_ids (list[str]): The IDs of the source num nodes.
 
-        4. MATCH (in1)-[:num2op]->(op)-[:op2num]->(out) OPTIONAL MATCH (in2)-[:num2op]->(op) WHERE id(in2) <> id(in1):
-        The script then matches these triples to actual paths in the graph. It also optionally matches another node in2 that connects 
-        to op with a num2op relationship, provided in2 is not the same as in1.
+        Returns:
+            tuple: The plan and the uuids it depends on, see `_propagation_plan`.
+        """
+        records = [record.data() for record in tx.run(PROPAGATION_PLAN_QUERY, node_ids=node_ids)]
+        return _propagation_plan(records, node_ids)
 
-        5. WITH in1, op, out, in2 SET out.value = CASE ... END:
-        Depending on the op.name (the name of the operation), this part updates out.value (the result of the operation). 
-        For subtraction and division, it also considers a reverse property on the operation node to decide the order of the operands. 
-        If op.name is none of the given, it leaves out.value as it was.
+    @staticmethod
+    def _apply_propagation_plan_tx(tx, inputs: List[dict], plan: list):
         """
+        Private helper function to set node values and apply their propagation plan within a transaction.
 
+        Args:
+            tx: Transaction object.
+            inputs (list[dict]): The {'id', 'value'} of every source num node.
+            plan (list): The steps returned by `_get_propagation_plan_tx`.
+        """
         try:
-            query="""
-                MATCH (in1)
-                WHERE in1.uuid = $node_id
-                SET in1.value = $value
-
-                WITH in1
-
-                CALL apoc.path.subgraphAll(in1, {
-                relationshipFilter: 'num2op|op2num>',
-                maxLevel: -1
-                }) YIELD nodes, relationships
-
-                WITH nodes
-
-                UNWIND nodes AS node
-
-                MATCH (in1)-[r:num2op]->(op)-[:op2num]->(out)
-                OPTIONAL MATCH (in2)-[:num2op]->(op)
-                WHERE in1.uuid <> in2.uuid
-
-                WITH in1, r, op, out, in2
-
-                SET out.value =
-                CASE
-                    WHEN op.name = '+' THEN in1.value + in2.value
-                    WHEN op.name = '-' AND r.reverse = false THEN in1.value - in2.value
-                    WHEN op.name = '-' AND r.reverse = true THEN in2.value - in1.value
-                    WHEN op.name = '*' THEN in1.value * in2.value
-                    WHEN op.name = '/' AND r.reverse = false AND in2.value <> 0 THEN in1.value / in2.value
-                    WHEN op.name = '/' AND r.reverse = true AND in1.value <> 0 THEN in2.value / in1.value
-                    WHEN op.name = 'sqrt' AND in1.value >= 0 THEN sqrt(in1.value)
-                    WHEN op.name = 'abs' THEN abs(in1.value)
-                    WHEN op.name = 'exp' THEN exp(in1.value)
-                    WHEN op.name = 'log10' AND in1.value > 0 THEN log10(in1.value)
-                    WHEN op.name = 'log' AND in1.value > 0 THEN log(in1.value)
-                    WHEN op.name = 'sin' THEN sin(in1.value)
-                    WHEN op.name = 'cos' THEN cos(in1.value)
-                    WHEN op.name = 'tan' THEN tan(in1.value)
-                    WHEN op.name = 'ceil' THEN ceil(in1.value)
-                    WHEN op.name = 'floor' THEN floor(in1.value)
-                    WHEN op.name = 'round' THEN round(in1.value)
-                    WHEN op.name = 'sign' THEN sign(in1.value)
-                    WHEN op.name = 'store' THEN in1.value
-                    ELSE out.value
-                END
-
-            """
-            tx.run(query, node_id=node_id, value=value)
+            tx.run(apply_propagation_plan_query(), inputs=inputs, plan=plan).consume()
         except Exception as e:
             raise Exception(f"Error occurred: {e}")
+
     '''
     query="""
         MATCH (in1)
@@ -403,10 +873,57 @@ class Graph:
         END
     '''
     def set_node_value(self, node_id:str, value):
+        """
+        Public function to set the 'value' property of a num node and recompute the ops downstream of it.
+
+        The propagation plan of the node, the (in1, in2, op, out, reverse) steps evaluating every
+        downstream op once in topological order, is computed once and cached, so repeated updates
+        of the same input send one parameterized write each. Plans are invalidated by add_edge(s),
+        update_edge_properties, delete_edge, delete_node, delete_all and update_node_properties
+        of op nodes; call `clear_plan_cache` after changing the graph structure with `run_query`.
+
+        Args:
+            node_id (str): The ID of the node.
+            value: The new value.
+        """
         if not isinstance(node_id, str):
             raise TypeError("node_id must be a string")
-        with self.driver.session() as session:
-            session.execute_write(self._set_node_value_tx, node_id, value)
+        self.set_node_values({node_id: value})
+
+    def set_node_values(self, values: Dict[str, Any]):
+        """
+        Public function to set the 'value' property of many num nodes and recompute the ops
+        downstream of them.
+
+        All values are written and the union of their downstream subgraphs is propagated in a
+        single transaction, so an op depending on several changed inputs is recomputed once.
+        The plan of each set of inputs is cached like the plan of `set_node_value`, the least
+        recently used plans being evicted beyond `max_plans`.
+
+        Args:
+            values (dict): The IDs of the nodes mapped to their new values.
+
+        Example:
+            g.set_node_values({x1['id']: 0.5, x2['id']: 1.5})
+        """
+        if not isinstance(values, dict):
+            raise TypeError("values must be a dictionary")
+        if not all(isinstance(node_id, str) for node_id in values):
+            raise TypeError("node_id must be a string")
+        key = frozenset(values)
+        plan = self._plans.get(key)
+        if plan is None:
+            generation = self._plans.generation
+            plan, uuids = self._execute_read(self._get_propagation_plan_tx, list(values))
+            self._plans.put(key, plan, uuids, generation)
+        inputs = [{'id': node_id, 'value': value} for node_id, value in values.items()]
+        self._execute_write(self._apply_propagation_plan_tx, inputs, plan)
+
+    def clear_plan_cache(self) -> None:
+        """
+        Drops every cached propagation plan.
+        """
+        self._plans.clear()
         
     #Get node value
     @staticmethod
@@ -422,8 +939,8 @@ class Graph:
             Any: The value of the 'value' property, or None if the property does not exist.
         """
         key = 'value'  # The key we're interested in is 'value'
-        query = """
-            MATCH (n) 
+        query = f"""
+            MATCH (n{NODE_LABEL_EXPRESSION})
             WHERE n.uuid = $node_id
             RETURN apoc.map.values(n, [$key])[0] as value
         """
@@ -446,11 +963,10 @@ class Graph:
         """
         if not isinstance(node_id, str):
             raise TypeError("node_id must be a string")
-        with self.driver.session() as session:
-            try:
-                return session.read_transaction(self._get_node_value_tx, node_id)
-            except Exception as e:
-                raise Exception(f"Failed to retrieve node 'value' property: {e}")
+        try:
+            return self._execute_read(self._get_node_value_tx, node_id)
+        except Exception as e:
+            raise Exception(f"Failed to retrieve node 'value' property: {e}")
 
 
     @staticmethod
@@ -466,8 +982,8 @@ class Graph:
         Returns:
             Any: The value of the specified property, or None if the property does not exist.
         """
-        query = """
-            MATCH (n) 
+        query = f"""
+            MATCH (n{NODE_LABEL_EXPRESSION})
             WHERE n.uuid = $node_id
             RETURN apoc.map.values(n, [$key])[0] as value
         """
@@ -493,11 +1009,10 @@ class Graph:
             raise TypeError("node_id must be a string")
         if not isinstance(key, str):
             raise TypeError("key must be a string")
-        with self.driver.session() as session:
-            try:
-                return session.read_transaction(self._get_node_property_tx, node_id, key)
-            except Exception as e:
-                raise Exception(f"Failed to retrieve node property: {e}")
+        try:
+            return self._execute_read(self._get_node_property_tx, node_id, key)
+        except Exception as e:
+            raise Exception(f"Failed to retrieve node property: {e}")
 
     # Add edge
     @staticmethod
@@ -507,7 +1022,7 @@ class Graph:
 
         Args:
             tx: Transaction object.
-            label (str): The label of the edge.
+            label (str): The label of the edge, one of EDGE_LABELS.
             out_id (str): The ID of the outgoing node.
             in_id (str): The ID of the incoming node.
             properties (dict, optional): The properties of the edge.
@@ -523,7 +1038,7 @@ class Graph:
         
         edge_id = str(uuid.uuid4())
         
-        query = f"MATCH (n) WHERE n.uuid = $out_id MATCH (m) WHERE m.uuid = $in_id {add_clause} (n)-[r:{label}{{uuid: $edge_id}}]->(m)"
+        query = f"MATCH (n{NODE_LABEL_EXPRESSION}) WHERE n.uuid = $out_id MATCH (m{NODE_LABEL_EXPRESSION}) WHERE m.uuid = $in_id {add_clause} (n)-[r:{label}{{uuid: $edge_id}}]->(m)"
         if properties:
             query += " SET r += $properties"
         query += " RETURN r.uuid AS id, type(r) AS label, n.uuid AS out_id, m.uuid AS in_id, properties(r) AS properties"
@@ -546,7 +1061,7 @@ class Graph:
         and calls the helper function `_add_edge_tx` to add the edge.
 
         Args:
-            label (str): The label of the edge.
+            label (str): The label of the edge, one of EDGE_LABELS.
             out_id (str): The ID of the outgoing node.
             in_id (str): The ID of the incoming node.
             properties (dict, optional): The properties of the edge.
@@ -557,6 +1072,8 @@ class Graph:
         """
         if not isinstance(label, str):
             raise TypeError("edge_label must be a string")
+        if label not in EDGE_LABELS:
+            raise ValueError(f"edge_label must be one of {EDGE_LABELS}, got '{label}'")
         if not isinstance(out_id, str):
             raise TypeError("out_id must be a string")
         if not isinstance(in_id, str):
@@ -566,12 +1083,108 @@ class Graph:
         if not isinstance(merge, bool):
             raise TypeError("merge must be a boolean")
         
-        with self.driver.session() as session:
-            try:
-                edge = session.write_transaction(self._add_edge_tx, label, out_id, in_id, properties, merge)
-                return edge
-            except Exception as e:
-                raise Exception(f"Failed to add edge: {e}")
+        self._plans.invalidate(out_id, in_id)
+        try:
+            edge = self._execute_write(self._add_edge_tx, label, out_id, in_id, properties, merge)
+            return edge
+        except Exception as e:
+            raise Exception(f"Failed to add edge: {e}")
+
+    # Add edges
+    @staticmethod
+    def _add_edges_tx(tx, label: str, rows: List[dict], merge: bool = False):
+        """
+        Private helper function to add a chunk of edges sharing one label within a transaction.
+
+        Args:
+            tx: Transaction object.
+            label (str): The label of every edge in the chunk.
+            rows (list[dict]): One dictionary per edge with 'edge_id', 'out_id', 'in_id' and 'properties'.
+            merge (bool, optional): A flag indicating whether to merge the edges if they already exist.
+
+        Returns:
+            list[dict]: Dictionaries with details of the created or merged edges, in the order of `rows`.
+
+        Raises:
+            Exception: If the endpoints of an edge are not found.
+        """
+        if merge:
+            add_clause = "MERGE"
+        else:
+            add_clause = "CREATE"
+
+        query = f"""
+            UNWIND $rows AS row
+            MATCH (n{NODE_LABEL_EXPRESSION}) WHERE n.uuid = row.out_id
+            MATCH (m{NODE_LABEL_EXPRESSION}) WHERE m.uuid = row.in_id
+            {add_clause} (n)-[r:{label}{{uuid: row.edge_id}}]->(m)
+            SET r += row.properties
+            RETURN r.uuid AS id, type(r) AS label, n.uuid AS out_id, m.uuid AS in_id, properties(r) AS properties
+        """
+        created = {}
+        for edge in tx.run(query, rows=rows).data():
+            # Remove the 'edge_id' key from properties
+            edge['properties'].pop('uuid', None)
+            created[edge['id']] = edge
+
+        missing = [row for row in rows if row['edge_id'] not in created]
+        if missing:
+            raise Exception(f"No nodes found for edges: {[(row['out_id'], row['in_id']) for row in missing]}")
+        return [created[row['edge_id']] for row in rows]
+
+    def add_edges(self, edges: List[tuple], merge: bool = False, chunk_size: int = 1000):
+        """
+        Public function to add many edges between existing nodes in the graph database.
+
+        The edges are grouped by label so that each label is one query plan, and each group
+        is created with one UNWIND query per chunk of `chunk_size` edges.
+
+        Args:
+            edges (list[tuple]): Tuples of (label, out_id, in_id) or (label, out_id, in_id, properties).
+            merge (bool, optional): A flag indicating whether to merge the edges if they already exist.
+            chunk_size (int, optional): The maximum number of edges created per transaction.
+
+        Returns:
+            list[dict]: Dictionaries with details of the created or merged edges, in input order.
+        """
+        if not isinstance(edges, list):
+            raise TypeError("edges must be a list of tuples")
+        if not isinstance(merge, bool):
+            raise TypeError("merge must be a boolean")
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+
+        groups = {}
+        for position, edge in enumerate(edges):
+            if not isinstance(edge, tuple) or len(edge) not in (3, 4):
+                raise TypeError("each edge must be a tuple of (label, out_id, in_id[, properties])")
+            label, out_id, in_id = edge[:3]
+            properties = edge[3] if len(edge) == 4 else None
+            if not isinstance(label, str):
+                raise TypeError("edge_label must be a string")
+            if label not in EDGE_LABELS:
+                raise ValueError(f"edge_label must be one of {EDGE_LABELS}, got '{label}'")
+            if not isinstance(out_id, str):
+                raise TypeError("out_id must be a string")
+            if not isinstance(in_id, str):
+                raise TypeError("in_id must be a string")
+            if properties and not isinstance(properties, dict):
+                raise TypeError("properties must be a dictionary")
+            row = {'edge_id': str(uuid.uuid4()), 'out_id': out_id, 'in_id': in_id, 'properties': properties or {}}
+            groups.setdefault(label, []).append((position, row))
+            self._plans.invalidate(out_id, in_id)
+
+        result = [None] * len(edges)
+        try:
+            for label, group in groups.items():
+                for start in range(0, len(group), chunk_size):
+                    chunk = group[start:start + chunk_size]
+                    created = self._execute_write(self._add_edges_tx, label, [row for _, row in chunk], merge)
+                    for (position, _), edge in zip(chunk, created):
+                        result[position] = edge
+            return result
+        except Exception as e:
+            raise Exception(f"Failed to add edges: {e}")
 
     # Get edge
     @staticmethod
@@ -587,7 +1200,7 @@ class Graph:
             dict: A dictionary representing the retrieved edge.
         """
         try:
-            query = "MATCH ()-[r]-() WHERE r.uuid = $id RETURN r.uuid AS id, type(r) AS label, startNode(r).uuid AS out_id, endNode(r).uuid AS in_id, properties(r) AS properties"
+            query = f"MATCH ()-[r{EDGE_LABEL_EXPRESSION}]->() WHERE r.uuid = $id RETURN r.uuid AS id, type(r) AS label, startNode(r).uuid AS out_id, endNode(r).uuid AS in_id, properties(r) AS properties"
             result = tx.run(query, id=id).data()
             edge = result[0]
             # Remove the 'edge_id' key from properties
@@ -614,11 +1227,10 @@ class Graph:
         if not isinstance(id, str):
             raise TypeError("id must be a string")
 
-        with self.driver.session() as session:
-            try:
-                return session.read_transaction(self._get_edge_tx, id)
-            except Exception as e:
-                raise Exception(f"Failed to retrieve edge: {e}")
+        try:
+            return self._execute_read(self._get_edge_tx, id)
+        except Exception as e:
+            raise Exception(f"Failed to retrieve edge: {e}")
 
 
     # Update edge properties
@@ -635,8 +1247,8 @@ class Graph:
         Returns:
             bool: True if the update operation was successful, False otherwise.
         """
-        query = """
-            MATCH ()-[r]-()
+        query = f"""
+            MATCH ()-[r{EDGE_LABEL_EXPRESSION}]->()
             WHERE r.uuid = $id
             SET r += $properties
             RETURN r.uuid AS edge_id
@@ -663,9 +1275,9 @@ class Graph:
         if not isinstance(properties, dict):
             raise TypeError("properties must be a dictionary")
 
+        self._plans.invalidate(id)
         try:
-            with self.driver.session() as session:
-                return session.write_transaction(self._update_edge_properties_tx, id, properties)
+            return self._execute_write(self._update_edge_properties_tx, id, properties)
         except Exception as e:
             raise Exception(f"Failed to update edge properties: {e}")
 
@@ -684,7 +1296,7 @@ class Graph:
             bool: True if at least one edge was deleted, False otherwise.
         """
         try:
-            query = "MATCH ()-[r]-() WHERE r.uuid = $id DELETE r RETURN count(r) as deleted_count"
+            query = f"MATCH ()-[r{EDGE_LABEL_EXPRESSION}]->() WHERE r.uuid = $id DELETE r RETURN count(r) as deleted_count"
             result = tx.run(query, id=id).single()
             deleted_count = result["deleted_count"]
 
@@ -709,27 +1321,29 @@ class Graph:
         if not isinstance(id, str):
             raise TypeError("id must be a string")
 
-        with self.driver.session() as session:
-            try:
-                return session.write_transaction(self._delete_edge_tx, id)
-            except Exception as e:
-                raise Exception(f"Failed to delete edge: {e}")
+        self._plans.invalidate(id)
+        try:
+            return self._execute_write(self._delete_edge_tx, id)
+        except Exception as e:
+            raise Exception(f"Failed to delete edge: {e}")
 
 
     # Delete all
     @staticmethod
-    def _delete_all_tx(tx):
+    def _delete_all_tx(tx, label: Optional[str] = None):
         """
         Private helper function to delete all nodes and relationships within a transaction.
 
         Args:
             tx: Transaction object.
+            label (str, optional): Only delete the nodes with this label and their relationships.
 
         Returns:
             bool: True if the deletion operation was successful, False otherwise.
         """
-        query = """
-            MATCH (n)
+        pattern = f"(n:{label})" if label else "(n)"
+        query = f"""
+            MATCH {pattern}
             OPTIONAL MATCH (n)-[r]-()
             DELETE n, r
             RETURN count(n) as deleted_nodes, count(r) as deleted_edges
@@ -738,16 +1352,131 @@ class Graph:
 
         return result is not None
 
-    def delete_all(self):
+    def _delete_in_transactions(self, match: str, parameters: Dict[str, Any], batch_size: int,
+                                progress: Optional[Callable[[int, int], None]] = None):
+        """
+        Private helper function deleting the nodes bound to `n` by a MATCH clause, and their
+        relationships, with `CALL { ... } IN TRANSACTIONS OF batch_size ROWS`.
+
+        Relationships are deleted before nodes so that no transaction holds every relationship
+        of a high-degree node. Each query handles at most DELETE_TRANSACTIONS_PER_QUERY * batch_size rows
+        and the queries are repeated until nothing is left, so memory use stays constant.
+
+        Args:
+            match (str): A Cypher MATCH clause binding the nodes to delete to `n`.
+            parameters (dict): The parameters of the MATCH clause.
+            batch_size (int): The number of rows deleted per inner transaction.
+            progress (callable, optional): Called with the cumulative numbers of deleted edges
+                and nodes after each query.
+
+        Returns:
+            tuple: The numbers of deleted edges and nodes.
+        """
+        if self._batch is not None:
+            raise RuntimeError("Deleting in transactions cannot run inside a batch")
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer")
+
+        limit = batch_size * DELETE_TRANSACTIONS_PER_QUERY
+        edges_query = f"""
+            {match}
+            MATCH (n)-[r]-()
+            WITH DISTINCT r LIMIT {limit}
+            CALL {{ WITH r DELETE r }} IN TRANSACTIONS OF {batch_size} ROWS
+            RETURN count(*) AS deleted
+        """
+        nodes_query = f"""
+            {match}
+            WITH n LIMIT {limit}
+            CALL {{ WITH n DETACH DELETE n }} IN TRANSACTIONS OF {batch_size} ROWS
+            RETURN count(*) AS deleted
+        """
+        deleted = [0, 0]
+        with self.driver.session() as session:
+            for position, query in enumerate((edges_query, nodes_query)):
+                while True:
+                    count = session.run(query, parameters).single()['deleted']
+                    if count == 0:
+                        break
+                    deleted[position] += count
+                    if progress is not None:
+                        progress(deleted[0], deleted[1])
+        return deleted[0], deleted[1]
+
+    def delete_all(self, batch_size: Optional[int] = None, label: Optional[str] = None,
+                   progress: Optional[Callable[[int, int], None]] = None):
         """
         Public function to delete all nodes and relationships in the graph database.
 
+        Without `batch_size` everything is deleted in one transaction. With it, the deletion runs
+        in transactions of `batch_size` rows, in constant memory and without holding locks for
+        the whole duration, which is what multi-million-element graphs need.
+
+        Args:
+            batch_size (int, optional): The number of rows deleted per transaction.
+            label (str, optional): Only delete the nodes with this label and their relationships.
+            progress (callable, optional): With `batch_size`, called with the cumulative numbers
+                of deleted edges and nodes as the deletion proceeds.
+
         Returns:
             bool: True if the deletion operation was successful, False otherwise.
+
+        Example:
+            g.delete_all(batch_size=10000, progress=lambda edges, nodes: print(edges, nodes))
         """
+        if label is not None and not isinstance(label, str):
+            raise TypeError("label must be a string")
+
+        self._plans.clear()
         try:
-            with self.driver.session() as session:
-                return session.write_transaction(self._delete_all_tx)
+            if batch_size is not None:
+                match = f"MATCH (n:{label})" if label else "MATCH (n)"
+                self._delete_in_transactions(match, {}, batch_size, progress)
+                return True
+            return self._execute_write(self._delete_all_tx, label)
         except Exception as e:
             raise Exception(f"Failed to delete all nodes and relationships: {e}")
 
+    # Delete subgraph
+    @staticmethod
+    def _get_subgraph_tx(tx, node_id: str):
+        """
+        Private helper function to list the uuids of a node and of the nodes downstream of it within a transaction.
+        """
+        query = f"""
+            MATCH (src{NODE_LABEL_EXPRESSION})
+            WHERE src.uuid = $node_id
+            CALL apoc.path.subgraphNodes(src, {{
+            relationshipFilter: 'num2op>|op2num>',
+            maxLevel: -1
+            }}) YIELD node
+            RETURN node.uuid AS id
+        """
+        return [record['id'] for record in tx.run(query, node_id=node_id)]
+
+    def delete_subgraph(self, node_id: str, batch_size: int = 10000,
+                        progress: Optional[Callable[[int, int], None]] = None):
+        """
+        Public function to delete a node, every node downstream of it and their relationships,
+        in transactions of `batch_size` rows.
+
+        Args:
+            node_id (str): The ID of the node the subgraph starts from.
+            batch_size (int, optional): The number of rows deleted per transaction.
+            progress (callable, optional): Called with the cumulative numbers of deleted edges
+                and nodes as the deletion proceeds.
+
+        Returns:
+            int: The number of deleted nodes.
+        """
+        if not isinstance(node_id, str):
+            raise TypeError("node_id must be a string")
+
+        try:
+            ids = self._execute_read(self._get_subgraph_tx, node_id)
+            self._plans.invalidate(*ids)
+            match = f"UNWIND $ids AS id MATCH (n{NODE_LABEL_EXPRESSION}) WHERE n.uuid = id"
+            _, deleted_nodes = self._delete_in_transactions(match, {'ids': ids}, batch_size, progress)
+            return deleted_nodes
+        except Exception as e:
+            raise Exception(f"Failed to delete subgraph: {e}")
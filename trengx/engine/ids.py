@@ -0,0 +1,120 @@
+import os
+import uuid
+import itertools
+
+# Node and edge id allocation.
+#
+# The engine builders (Engine.op1, Engine.op2, AddNode, AddEdge) take their ids from new_id().
+# The default 'uuid' mode keeps the uuid4 strings ids have always been. The 'counter' and
+# 'compact64' modes hand out Python ints instead, which are much cheaper to create, hash and
+# store as dict keys. Int ids are mapped to UUID strings with to_uuid() only when they are
+# persisted to Neo4j.
+
+# Namespace of the uuid5 that int ids are mapped to. The mapping is deterministic, so a graph
+# persisted by one process is found again by the next one; graphs whose int ids come from
+# different counters should be given different namespaces so that they do not collide in the
+# database.
+DEFAULT_UUID_NAMESPACE = uuid.UUID('5b1f4c3e-8a2d-5e6f-9c1b-7d3a2e4f6b80')
+
+_uuid_namespace = DEFAULT_UUID_NAMESPACE
+
+
+def _uuid4() -> str:
+    return str(uuid.uuid4())
+
+
+def counter_allocator(start: int = 0):
+    """
+    Returns an allocator of monotonic int ids: start, start + 1, ...
+    """
+    return itertools.count(start).__next__
+
+
+def compact64_allocator():
+    """
+    Returns an allocator of 64-bit int ids: a random 32-bit prefix followed by a 32-bit counter,
+    so that the ids of different allocators are unlikely to collide.
+    """
+    prefix = int.from_bytes(os.urandom(4), 'big') << 32
+    return itertools.count(prefix).__next__
+
+
+ALLOCATORS = {
+    'uuid': lambda: _uuid4,
+    'counter': counter_allocator,
+    'compact64': compact64_allocator,
+}
+
+_allocator = _uuid4
+
+
+def set_allocator(allocator) -> None:
+    """
+    Sets the id allocator used by new_id().
+
+    Args:
+        allocator: 'uuid', 'counter', 'compact64' or a callable returning a new hashable id at each call.
+
+    Raises:
+        ValueError: If the mode is unknown.
+
+    Example:
+        set_allocator('counter')
+    """
+    global _allocator
+    if isinstance(allocator, str):
+        if allocator not in ALLOCATORS:
+            raise ValueError(f"Unknown id allocator '{allocator}', expected one of {list(ALLOCATORS)}")
+        allocator = ALLOCATORS[allocator]()
+    _allocator = allocator
+
+
+def get_allocator():
+    """
+    Returns the id allocator used by new_id().
+    """
+    return _allocator
+
+
+def new_id():
+    """
+    Returns a new node or edge id from the current allocator.
+    """
+    return _allocator()
+
+
+def set_uuid_namespace(namespace=None) -> None:
+    """
+    Sets the namespace of the UUIDs that int ids are mapped to by to_uuid().
+
+    Args:
+        namespace: A uuid.UUID or a UUID string. Defaults to DEFAULT_UUID_NAMESPACE.
+
+    Raises:
+        ValueError: If the string is not a UUID.
+
+    Example:
+        set_uuid_namespace('0f0e6a1c-3b5d-4e2f-8a9b-1c2d3e4f5a6b')
+    """
+    global _uuid_namespace
+    if namespace is None:
+        namespace = DEFAULT_UUID_NAMESPACE
+    _uuid_namespace = namespace if isinstance(namespace, uuid.UUID) else uuid.UUID(namespace)
+
+
+def get_uuid_namespace() -> uuid.UUID:
+    """
+    Returns the namespace of the UUIDs that int ids are mapped to by to_uuid().
+    """
+    return _uuid_namespace
+
+
+def to_uuid(id) -> str:
+    """
+    Returns the UUID string an id is persisted with. Strings are returned unchanged, and ints
+    are mapped to the uuid5 of their decimal string in the current namespace, the same in
+    every process.
+    """
+    if isinstance(id, str):
+        return id
+    return str(uuid.uuid5(_uuid_namespace, str(id)))
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-import uuid
 from typing import Any, Dict, Union
 
+from ...ids import new_id
+
 class AddNode(ABC):
     """
     Abstract base class for a node in a computational graph.
@@ -19,9 +20,11 @@ class AddNode(ABC):
         if node is None:
             raise ValueError("node cannot be None")
 
-        id = node.get('id', str(uuid.uuid1()))
-        if not isinstance(id, str):
-            raise ValueError("id must be a string")
+        id = node.get('id')
+        if id is None:
+            id = new_id()
+        if not isinstance(id, (str, int)):
+            raise ValueError("id must be a string or an int")
 
         label = node.get('label')
         if label is not None and not isinstance(label, str):
@@ -1,4 +1,5 @@
 from .add_node import AddNode
+from ...ids import to_uuid
 
 class Neo4jAddNode(AddNode):
     def __init__(self, driver, node):
@@ -11,7 +12,7 @@ class Neo4jAddNode(AddNode):
         with self.driver.session() as session:
             response = session.run(
                 f"CREATE (n:{self.label} {{id: $id, name: $name, value: $value, grad: $grad}}) RETURN n",
-                id=self.id, 
+                id=to_uuid(self.id), 
                 name=self.name, 
                 value=self.value, 
                 grad=self.grad
@@ -0,0 +1,317 @@
+import math
+import numpy as np
+
+# Operator registry shared by the in-memory engine, the compiled tape and the Neo4j graph.
+#
+# Every op gets an integer opcode when it is registered. The kernels are kept in flat lists
+# indexed by opcode, so that compiled code dispatches with one list lookup:
+#   FORWARD[code](x, y) -> value
+#   BACKWARD[code](x, y, g) -> (dx, dy)
+# where x is the first operand, y the second one (the operand whose num2op edge is flagged
+# `reverse`, ignored by unary ops) and g the gradient of the output. FORWARD_BATCH and
+# BACKWARD_BATCH are the same kernels over NumPy arrays of samples of scalar nodes.
+# FORWARD_TENSOR and BACKWARD_TENSOR evaluate tensor-valued nodes: elementwise ops broadcast
+# like NumPy, and reductions such as 'sum' reduce the whole tensor. Their gradients have the
+# broadcast shape; evaluators reduce them to the shape of each operand with unbroadcast().
+#
+# 'store' is not an op of the registry: it is a unit delay handled by the evaluators themselves.
+
+
+class Op:
+    """
+    An operator of the registry.
+
+    Attributes:
+        name (str): The name of the op nodes evaluated by this op.
+        code (int): The opcode, the index of the kernels in FORWARD, BACKWARD, ...
+        arity (int): The number of operands, 1 or 2.
+        cypher (str): The Cypher expression of the value, in terms of {x} and {y}, or None.
+        cypher_guard (str): A Cypher condition on {x} and {y} under which the value is defined, or None.
+    """
+    def __init__(self, name, code, arity, cypher=None, cypher_guard=None):
+        self.name = name
+        self.code = code
+        self.arity = arity
+        self.cypher = cypher
+        self.cypher_guard = cypher_guard
+
+    def __repr__(self):
+        return f"Op({self.name!r}, code={self.code}, arity={self.arity})"
+
+
+OPS = []
+OPCODES = {}
+FORWARD = []
+BACKWARD = []
+FORWARD_BATCH = []
+BACKWARD_BATCH = []
+FORWARD_TENSOR = []
+BACKWARD_TENSOR = []
+
+_cypher_case = None
+
+
+def register(name, arity, forward, backward, forward_batch=None, backward_batch=None, cypher=None, cypher_guard=None,
+             forward_tensor=None, backward_tensor=None) -> Op:
+    """
+    Registers an op.
+
+    Args:
+        name (str): The name of the op nodes evaluated by this op.
+        arity (int): The number of operands, 1 or 2.
+        forward (callable): The scalar kernel forward(x, y) -> value. It raises ValueError outside its domain.
+        backward (callable): The scalar kernel backward(x, y, g) -> (dx, dy).
+        forward_batch (callable, optional): forward over NumPy arrays. Defaults to np.vectorize(forward).
+        backward_batch (callable, optional): backward over NumPy arrays. Defaults to np.vectorize(backward).
+        cypher (str, optional): The Cypher expression of the value, in terms of {x} and {y}, used by
+            Graph.set_node_value. Ops without one keep their output value in Neo4j.
+        cypher_guard (str, optional): A Cypher condition on {x} and {y}. Outside of it the output keeps its value.
+        forward_tensor (callable, optional): forward over tensor values. Defaults to forward_batch.
+        backward_tensor (callable, optional): backward over tensor values. Defaults to backward_batch.
+
+    Returns:
+        Op: The registered op.
+
+    Raises:
+        ValueError: If the name is already registered or the arity is not 1 or 2.
+
+    Example:
+        register('cube', 1, lambda x, y: x ** 3, lambda x, y, g: (3 * x * x * g, 0.0), cypher='{x}^3')
+    """
+    global _cypher_case
+    if name in OPCODES or name == 'store':
+        raise ValueError(f"op '{name}' is already registered")
+    if arity not in (1, 2):
+        raise ValueError(f"arity must be 1 or 2, got {arity}")
+
+    op = Op(name, len(OPS), arity, cypher, cypher_guard)
+    OPS.append(op)
+    OPCODES[name] = op.code
+    FORWARD.append(forward)
+    BACKWARD.append(backward)
+    FORWARD_BATCH.append(forward_batch or np.vectorize(forward, otypes=[np.float64]))
+    BACKWARD_BATCH.append(backward_batch or np.vectorize(backward, otypes=[np.float64, np.float64]))
+    FORWARD_TENSOR.append(forward_tensor or FORWARD_BATCH[-1])
+    BACKWARD_TENSOR.append(backward_tensor or BACKWARD_BATCH[-1])
+    _cypher_case = None
+    return op
+
+
+def opcode(name) -> int:
+    """
+    Returns the opcode of an op.
+
+    Raises:
+        ValueError: If the op is not registered.
+    """
+    try:
+        return OPCODES[name]
+    except KeyError:
+        raise ValueError(f"Unknown op '{name}'") from None
+
+
+def cypher_case() -> str:
+    """
+    Returns a Cypher CASE expression computing the value of `out` from `op.name`, its operands
+    `in1` and `in2` and `is_reverse`, the reverse flag of the num2op edge from `in1`.
+
+    It covers every registered op with a Cypher expression, plus 'store'. Outside of the guard
+    of an op, and for other ops, the value of `out` is kept.
+    """
+    global _cypher_case
+    if _cypher_case is None:
+        lines = []
+        for op in OPS:
+            if op.cypher is None:
+                continue
+            operands = [('in1.value', 'in2.value', '')]
+            if op.arity == 2:
+                operands = [
+                    ('in1.value', 'in2.value', ' AND NOT coalesce(is_reverse, false)'),
+                    ('in2.value', 'in1.value', ' AND coalesce(is_reverse, false)'),
+                ]
+            for x, y, condition in operands:
+                if op.cypher_guard is not None:
+                    condition += ' AND ' + op.cypher_guard.format(x=x, y=y)
+                lines.append(f"        WHEN op.name = '{op.name}'{condition} THEN {op.cypher.format(x=x, y=y)}")
+        lines.append("        WHEN op.name = 'store' THEN in1.value")
+        _cypher_case = "\n    CASE\n" + "\n".join(lines) + "\n        ELSE out.value\n    END\n"
+    return _cypher_case
+
+
+def is_tensor(value) -> bool:
+    """
+    Returns True if a value is a NumPy array, which selects the tensor kernels.
+    """
+    return isinstance(value, np.ndarray)
+
+
+def unbroadcast(grad, like):
+    """
+    Reduces a gradient computed with broadcasting to the shape of the operand `like`, summing
+    over the broadcast dimensions. Scalar operands get a float.
+    """
+    shape = np.shape(like)
+    if np.shape(grad) == shape:
+        return grad
+    grad = np.asarray(grad)
+    if grad.ndim < len(shape):
+        return np.broadcast_to(grad, shape).copy()
+    grad = grad.sum(axis=tuple(range(grad.ndim - len(shape))))
+    axes = tuple(axis for axis, size in enumerate(shape) if size == 1 and grad.shape[axis] != 1)
+    if axes:
+        grad = grad.sum(axis=axes, keepdims=True)
+    return grad if shape else float(grad)
+
+
+def _domain(condition, message, x):
+    if condition:
+        raise ValueError(message.format(x))
+
+
+def _domain_batch(condition, message, x):
+    condition = np.asarray(condition)
+    if condition.any():
+        x, condition = np.broadcast_arrays(np.asarray(x), condition)
+        raise ValueError(message.format(x[condition][0]))
+
+
+def _unary(name, forward, backward, forward_batch, backward_batch, cypher=None, cypher_guard=None,
+           forward_tensor=None, backward_tensor=None):
+    register(
+        name, 1,
+        lambda x, y: forward(x),
+        lambda x, y, g: (backward(x, g), 0.0),
+        lambda x, y: forward_batch(x),
+        lambda x, y, g: (backward_batch(x, g), 0.0),
+        cypher, cypher_guard,
+        forward_tensor and (lambda x, y: forward_tensor(x)),
+        backward_tensor and (lambda x, y, g: (backward_tensor(x, g), 0.0)),
+    )
+
+
+def _d_matmul(x, y, g):
+    # Operands are vectors or matrices, as in np.matmul
+    if np.ndim(y) == 1:
+        dx = np.outer(g, y) if np.ndim(x) == 2 else g * y
+        dy = x.T @ g if np.ndim(x) == 2 else g * x
+    else:
+        dx = g @ y.T
+        dy = np.atleast_2d(x).T @ np.atleast_2d(g)
+    return dx, dy
+
+
+def _div(x, y):
+    _domain(y == 0, "Error: Division of {} by zero", x)
+    return x / y
+
+
+def _div_batch(x, y):
+    _domain_batch(y == 0, "Error: Division of {} by zero", x)
+    return x / y
+
+
+def _log(x):
+    _domain(x <= 0, "Error: Log of non-positive number {}", x)
+    return math.log(x)
+
+
+def _log_batch(x):
+    _domain_batch(x <= 0, "Error: Log of non-positive number {}", x)
+    return np.log(x)
+
+
+def _log10(x):
+    _domain(x <= 0, "Error: Log of non-positive number {}", x)
+    return math.log10(x)
+
+
+def _log10_batch(x):
+    _domain_batch(x <= 0, "Error: Log of non-positive number {}", x)
+    return np.log10(x)
+
+
+def _sqrt(x):
+    _domain(x < 0, "Error: sqrt of negative number {}", x)
+    return math.sqrt(x)
+
+
+def _sqrt_batch(x):
+    _domain_batch(x < 0, "Error: sqrt of negative number {}", x)
+    return np.sqrt(x)
+
+
+def _d_sqrt(x, g):
+    _domain(x <= 0, "Error: gradient through sqrt of negative number {}", x)
+    return g / (2 * math.sqrt(x))
+
+
+def _d_sqrt_batch(x, g):
+    _domain_batch(x <= 0, "Error: gradient through sqrt of negative number {}", x)
+    return g / (2 * np.sqrt(x))
+
+
+def _zero(x, g):
+    return 0.0
+
+
+def _zero_batch(x, g):
+    return np.zeros_like(x)
+
+
+register('+', 2,
+         lambda x, y: x + y, lambda x, y, g: (g, g),
+         np.add, lambda x, y, g: (g, g),
+         cypher='{x} + {y}')
+register('-', 2,
+         lambda x, y: x - y, lambda x, y, g: (g, -g),
+         np.subtract, lambda x, y, g: (g, -g),
+         cypher='{x} - {y}')
+register('*', 2,
+         lambda x, y: x * y, lambda x, y, g: (g * y, g * x),
+         np.multiply, lambda x, y, g: (g * y, g * x),
+         cypher='{x} * {y}')
+register('/', 2,
+         _div, lambda x, y, g: (g / y, -g * x / (y * y)),
+         _div_batch, lambda x, y, g: (g / y, -g * x / (y * y)),
+         cypher='{x} / {y}', cypher_guard='{y} <> 0')
+_unary('log', _log, lambda x, g: g / x, _log_batch, lambda x, g: g / x,
+       cypher='log({x})', cypher_guard='{x} > 0')
+_unary('log10', _log10, lambda x, g: g / (x * math.log(10)), _log10_batch, lambda x, g: g / (x * math.log(10)),
+       cypher='log10({x})', cypher_guard='{x} > 0')
+_unary('exp', math.exp, lambda x, g: g * math.exp(x), np.exp, lambda x, g: g * np.exp(x),
+       cypher='exp({x})')
+_unary('sin', math.sin, lambda x, g: g * math.cos(x), np.sin, lambda x, g: g * np.cos(x),
+       cypher='sin({x})')
+_unary('cos', math.cos, lambda x, g: -g * math.sin(x), np.cos, lambda x, g: -g * np.sin(x),
+       cypher='cos({x})')
+_unary('tan', math.tan, lambda x, g: g / math.cos(x) ** 2, np.tan, lambda x, g: g / np.cos(x) ** 2,
+       cypher='tan({x})')
+_unary('ReLU', lambda x: x if x > 0 else 0.0, lambda x, g: g if x > 0 else 0.0,
+       lambda x: np.maximum(x, 0.0), lambda x, g: g * (x > 0),
+       cypher='CASE WHEN {x} > 0 THEN {x} ELSE 0.0 END')
+_unary('sqr', lambda x: x * x, lambda x, g: g * 2 * x, lambda x: x * x, lambda x, g: g * 2 * x,
+       cypher='{x} * {x}')
+_unary('sqrt', _sqrt, _d_sqrt, _sqrt_batch, _d_sqrt_batch,
+       cypher='sqrt({x})', cypher_guard='{x} >= 0')
+_unary('abs', abs, lambda x, g: g * (x > 0) - g * (x < 0), np.abs, lambda x, g: g * np.sign(x),
+       cypher='abs({x})')
+_unary('sign', lambda x: math.copysign(1.0, x) if x else 0.0, _zero, np.sign, _zero_batch,
+       cypher='sign({x})')
+_unary('ceil', lambda x: float(math.ceil(x)), _zero, np.ceil, _zero_batch,
+       cypher='ceil({x})')
+_unary('floor', lambda x: float(math.floor(x)), _zero, np.floor, _zero_batch,
+       cypher='floor({x})')
+# Cypher rounds halves up, unlike Python's round
+_unary('round', lambda x: float(math.floor(x + 0.5)), _zero, lambda x: np.floor(x + 0.5), _zero_batch,
+       cypher='round({x})')
+# Tensor ops. On scalar nodes and batches of samples of scalar nodes, 'matmul' is a product
+# and 'sum' and 'mean' are the identity.
+register('matmul', 2,
+         lambda x, y: x * y, lambda x, y, g: (g * y, g * x),
+         np.multiply, lambda x, y, g: (g * y, g * x),
+         forward_tensor=lambda x, y: np.matmul(x, y), backward_tensor=_d_matmul)
+_unary('sum', lambda x: x, lambda x, g: g, lambda x: x, lambda x, g: g,
+       forward_tensor=lambda x: np.sum(x), backward_tensor=lambda x, g: np.full(np.shape(x), g))
+_unary('mean', lambda x: x, lambda x, g: g, lambda x: x, lambda x, g: g,
+       forward_tensor=lambda x: np.mean(x), backward_tensor=lambda x, g: np.full(np.shape(x), g / np.size(x)))
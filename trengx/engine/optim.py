@@ -0,0 +1,182 @@
+from abc import ABC, abstractmethod
+import numpy as np
+
+# Stateful optimizers over the parameter vector.
+#
+# An optimizer updates the registered parameters of a graph, see trengx.engine.params, from their
+# gradients. The parameters are seen as one flat float64 vector, in the order of the parameter
+# index, and the state of the optimizer (moments, step count) is kept as arrays aligned with it,
+# so every step is a handful of fused NumPy operations whatever the number of parameters.
+# Wherever a learning rate `lr` is accepted (Tape.backward, Engine.backward_propagate, train...),
+# an optimizer can be given instead of a float.
+
+
+class Optimizer(ABC):
+    """
+    Base class of the optimizers.
+
+    Attributes:
+        lr (float): The learning rate.
+        t (int): The number of steps taken.
+    """
+    def __init__(self, lr):
+        self.lr = lr
+        self.t = 0
+        self._shape = None
+
+    def step(self, params, grads) -> np.ndarray:
+        """
+        Updates the parameter vector in place from its gradient and returns it.
+
+        Raises:
+            ValueError: If the parameter vector does not have the shape of the previous steps.
+        """
+        params = np.asarray(params, dtype=np.float64)
+        grads = np.asarray(grads, dtype=np.float64)
+        if self._shape is None:
+            self._shape = params.shape
+            self._init(params.shape)
+        elif params.shape != self._shape:
+            raise ValueError(f"The optimizer state has shape {self._shape}, got parameters of shape {params.shape}")
+        self.t += 1
+        self._update(params, grads)
+        return params
+
+    def reset(self) -> None:
+        """
+        Drops the state, so that the next step starts over.
+        """
+        self.t = 0
+        self._shape = None
+
+    def _init(self, shape) -> None:
+        pass
+
+    @abstractmethod
+    def _update(self, params, grads) -> None:
+        """
+        Updates the parameter vector in place. It must be implemented by any concrete subclass.
+        """
+        pass
+
+
+class SGD(Optimizer):
+    """
+    Plain gradient descent: params -= lr * grads.
+    """
+    def __init__(self, lr=0.01):
+        super().__init__(lr)
+
+    def _update(self, params, grads) -> None:
+        params -= self.lr * grads
+
+
+class Momentum(Optimizer):
+    """
+    Gradient descent with momentum: velocity = momentum * velocity + grads, params -= lr * velocity.
+    """
+    def __init__(self, lr=0.01, momentum=0.9):
+        super().__init__(lr)
+        self.momentum = momentum
+
+    def _init(self, shape) -> None:
+        self.velocity = np.zeros(shape)
+
+    def _update(self, params, grads) -> None:
+        self.velocity *= self.momentum
+        self.velocity += grads
+        params -= self.lr * self.velocity
+
+
+class RMSProp(Optimizer):
+    """
+    RMSProp: the step of every parameter is scaled by a moving average of its squared gradients.
+    """
+    def __init__(self, lr=0.001, rho=0.9, eps=1e-8):
+        super().__init__(lr)
+        self.rho = rho
+        self.eps = eps
+
+    def _init(self, shape) -> None:
+        self.square = np.zeros(shape)
+
+    def _update(self, params, grads) -> None:
+        self.square *= self.rho
+        self.square += (1.0 - self.rho) * grads * grads
+        params -= self.lr * grads / (np.sqrt(self.square) + self.eps)
+
+
+class Adam(Optimizer):
+    """
+    Adam: moving averages of the gradients and of their squares, with bias correction.
+    """
+    def __init__(self, lr=0.001, beta1=0.9, beta2=0.999, eps=1e-8):
+        super().__init__(lr)
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.eps = eps
+
+    def _init(self, shape) -> None:
+        self.mean = np.zeros(shape)
+        self.square = np.zeros(shape)
+
+    def _update(self, params, grads) -> None:
+        self.mean *= self.beta1
+        self.mean += (1.0 - self.beta1) * grads
+        self.square *= self.beta2
+        self.square += (1.0 - self.beta2) * grads * grads
+        # The bias corrections of both moments folded into the step size
+        lr = self.lr * np.sqrt(1.0 - self.beta2 ** self.t) / (1.0 - self.beta1 ** self.t)
+        params -= lr * self.mean / (np.sqrt(self.square) + self.eps)
+
+
+OPTIMIZERS = {
+    'sgd': SGD,
+    'momentum': Momentum,
+    'rmsprop': RMSProp,
+    'adam': Adam,
+}
+
+
+def get_optimizer(optimizer=None, lr=0.01) -> Optimizer:
+    """
+    Returns an optimizer: `optimizer` itself if it is one, else a new one of that name with
+    learning rate `lr`, SGD by default.
+
+    Raises:
+        ValueError: If the name is unknown.
+
+    Example:
+        get_optimizer('adam', lr=0.01)
+    """
+    if isinstance(optimizer, Optimizer):
+        return optimizer
+    if optimizer is None:
+        optimizer = 'sgd'
+    if optimizer not in OPTIMIZERS:
+        raise ValueError(f"Unknown optimizer '{optimizer}', expected one of {list(OPTIMIZERS)}")
+    return OPTIMIZERS[optimizer](lr)
+
+
+def apply(optimizer, values, grads, index) -> None:
+    """
+    Updates values[i] for every i of `index` in place with one step of the optimizer.
+
+    `values` and `grads` are float64 arrays, or lists of floats and arrays as in tensor mode,
+    where the parameters are flattened into one vector for the step and a None or 0.0
+    gradient stands for a zero gradient of the shape of its value.
+    """
+    if isinstance(values, np.ndarray):
+        values[index] = optimizer.step(values[index], grads[index])
+        return
+    index = list(index)
+    shapes = [np.shape(values[i]) for i in index]
+    flat = np.concatenate([np.ravel(values[i]) for i in index]) if index else np.empty(0)
+    flat_grads = np.concatenate([np.broadcast_to(0.0 if grads[i] is None else grads[i], shape).ravel()
+                                 for i, shape in zip(index, shapes)]) if index else np.empty(0)
+    flat = optimizer.step(flat, flat_grads)
+    start = 0
+    for i, shape in zip(index, shapes):
+        size = int(np.prod(shape))
+        values[i] = flat[start:start + size].reshape(shape) if shape else float(flat[start])
+        start += size
@@ -0,0 +1,190 @@
+import os
+import time
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+
+from .tape import Tape
+from .optim import apply, get_optimizer
+
+# Data-parallel training over a pool of processes.
+#
+# The compiled tape and the samples are shipped to the workers once, at start-up. For every
+# mini-batch, each worker evaluates its shard of the batch with Tape.run_batch and
+# backward_batch, and writes the sum of its gradients and of its losses into shared memory.
+# The main process reduces them into the gradient of the batch, applies one step of the
+# optimizer and publishes the new parameters in shared memory for the next batch. Only the
+# shard bounds go through the pipes.
+
+
+def train_parallel(G, data, loss_node=None, params=None, batch_size=32, epochs=1, lr=0.01, tape=None,
+                   optimizer=None, workers=None) -> dict:
+    """
+    Trains the parameters of a num/op DiGraph as `train` does, with the samples of every
+    mini-batch split between `workers` processes.
+
+    The update of every batch is the one `train` would apply, up to the rounding of the sum
+    of the gradients. 'store' ops latch within the shard of each worker.
+
+    Args:
+        G: The num/op DiGraph built with Engine.op1 and Engine.op2, with scalar values.
+        data (dict): The arrays of samples by input node id, all of the same length.
+        workers (int, optional): The number of processes. Defaults to the number of CPUs.
+        The other arguments are the ones of `train`.
+
+    Returns:
+        dict: The result of `train`, with 'workers', the number of processes.
+
+    Raises:
+        ValueError: If the graph is tensor-valued, if the data is not a dict of arrays, or
+            for the arguments `train` rejects.
+        Exception: The exception raised by a worker on its shard, such as the ValueError of an
+            op outside of its domain, raised again in the main process.
+
+    Example:
+        result = Engine.train(G, {x: xs, y: ys}, e2, batch_size=4096, epochs=10, workers=8)
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    if epochs < 1:
+        raise ValueError(f"epochs must be positive, got {epochs}")
+    if workers < 1:
+        raise ValueError(f"workers must be positive, got {workers}")
+    if not isinstance(data, dict):
+        raise ValueError("Parallel training needs a dict of arrays of samples")
+
+    optimizer = get_optimizer(optimizer, lr)
+    tape = tape or Tape(G)
+    if tape.tensor:
+        raise ValueError("Parallel training of tensor-valued graphs is not supported")
+    index = tape.params if params is None else np.array([tape.index[node] for node in params], dtype=np.int64)
+    loss = tape._loss_index(loss_node)
+
+    nodes = list(data)
+    lengths = {len(data[node]) for node in nodes}
+    if len(lengths) != 1:
+        raise ValueError(f"The arrays of samples must have the same length, got {sorted(lengths)}")
+    size = lengths.pop()
+    starts = list(range(0, size, batch_size))
+
+    n = len(tape.ids)
+    blocks, processes = [], []
+    inputs = values = grads = losses = None
+    try:
+        def shared(shape):
+            block = shared_memory.SharedMemory(create=True, size=max(8, int(np.prod(shape)) * 8))
+            blocks.append(block)
+            return np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+
+        inputs = shared((len(nodes), size))
+        for k, node in enumerate(nodes):
+            inputs[k] = data[node]
+        values = shared((n,))
+        values[:] = tape.values
+        grads = shared((workers, n))
+        losses = shared((workers,))
+
+        context = mp.get_context()
+        pipes = []
+        for worker in range(workers):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=_worker, daemon=True,
+                args=(child, worker, workers, tape, loss, nodes, [block.name for block in blocks], size),
+            )
+            process.start()
+            child.close()
+            pipes.append(parent)
+            processes.append(process)
+
+        history = np.empty(epochs * len(starts), dtype=np.float64)
+        epoch_loss = np.empty(epochs, dtype=np.float64)
+        count = 0
+        start_time = time.perf_counter()
+        for epoch in range(epochs):
+            total = 0.0
+            for start in starts:
+                end = min(start + batch_size, size)
+                bounds = np.linspace(start, end, workers + 1).astype(np.int64).tolist()
+                active = [w for w in range(workers) if bounds[w] < bounds[w + 1]]
+                for w in active:
+                    pipes[w].send((bounds[w], bounds[w + 1]))
+                results = [pipes[w].recv() for w in active]
+                for result in results:
+                    if isinstance(result, Exception):
+                        raise result
+
+                batch = end - start
+                tape.grads[:] = grads[active].sum(axis=0) / batch
+                apply(optimizer, tape.values, tape.grads, index)
+                values[:] = tape.values
+
+                history[count] = losses[active].sum() / batch
+                total += history[count] * batch
+                count += 1
+            epoch_loss[epoch] = total / size if size else np.nan
+        seconds = time.perf_counter() - start_time
+
+        for pipe, process in zip(pipes, processes):
+            pipe.send(None)
+            process.join()
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        # The views must be released before the blocks are closed
+        inputs = values = grads = losses = None
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    tape.write_back(G)
+    samples = epochs * size
+    return {
+        'loss': history[:count],
+        'epoch_loss': epoch_loss,
+        'samples': samples,
+        'seconds': seconds,
+        'samples_per_second': samples / seconds if seconds > 0 else np.inf,
+        'tape': tape,
+        'optimizer': optimizer,
+        'workers': workers,
+    }
+
+
+def _worker(pipe, worker, workers, tape, loss, nodes, names, size) -> None:
+    """
+    Evaluates the shards sent by the main process until it sends None.
+    """
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    try:
+        _serve(pipe, worker, workers, tape, loss, nodes, blocks, size)
+    finally:
+        for block in blocks:
+            block.close()
+
+
+def _serve(pipe, worker, workers, tape, loss, nodes, blocks, size) -> None:
+    n = len(tape.ids)
+    inputs = np.ndarray((len(nodes), size), dtype=np.float64, buffer=blocks[0].buf)
+    values = np.ndarray((n,), dtype=np.float64, buffer=blocks[1].buf)
+    grads = np.ndarray((workers, n), dtype=np.float64, buffer=blocks[2].buf)
+    losses = np.ndarray((workers,), dtype=np.float64, buffer=blocks[3].buf)
+    loss_node = tape.ids[loss]
+    while True:
+        shard = pipe.recv()
+        if shard is None:
+            return
+        start, end = shard
+        try:
+            tape.values[:] = values
+            batch_values = tape.run_batch({node: inputs[k, start:end] for k, node in enumerate(nodes)})
+            grads[worker] = tape.backward_batch(loss_node) * (end - start)
+            losses[worker] = batch_values[loss].sum()
+        except Exception as error:
+            # The main process raises it, instead of finding the pipe closed
+            pipe.send(error)
+            continue
+        pipe.send(True)
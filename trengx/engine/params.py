@@ -0,0 +1,77 @@
+# Trainable parameters and loss of a num/op graph.
+#
+# They are registered explicitly in G.graph['params'] and G.graph['loss'], and compiled to index
+# arrays by Tape and CompactGraph, so that the backward sweep never inspects node names and the
+# parameters are updated in one vectorized step. Graphs with no registered parameters fall back
+# to the convention of the notebooks, where the num nodes whose names start with 'w' or 'b' are
+# the parameters; it is applied once, when the graph is compiled.
+
+PARAM_PREFIXES = frozenset({'w', 'b'})
+
+
+def set_params(G, nodes) -> None:
+    """
+    Registers the trainable num nodes of G, replacing the registered ones.
+
+    Raises:
+        ValueError: If a node is not a num node of G.
+
+    Example:
+        set_params(G, [w1, b, w2])
+    """
+    nodes = list(dict.fromkeys(nodes))
+    for node in nodes:
+        _check_num(G, node)
+    G.graph['params'] = nodes
+
+
+def add_params(G, *nodes) -> None:
+    """
+    Registers more trainable num nodes of G, after the registered ones.
+
+    Raises:
+        ValueError: If a node is not a num node of G.
+    """
+    set_params(G, G.graph.get('params', []) + list(nodes))
+
+
+def get_params(G) -> list:
+    """
+    Returns the ids of the trainable num nodes of G: the registered ones, or by default the num
+    nodes whose names start with 'w' or 'b'.
+    """
+    if 'params' in G.graph:
+        return list(G.graph['params'])
+    return [node for node, data in G.nodes(data=True)
+            if data.get('label') == 'num' and (data.get('name') or ' ')[0] in PARAM_PREFIXES]
+
+
+def set_loss(G, node) -> None:
+    """
+    Designates the loss num node of G, the default loss of the backward passes and of train.
+
+    Raises:
+        ValueError: If the node is not a num node of G.
+    """
+    _check_num(G, node)
+    G.graph['loss'] = node
+
+
+def get_loss(G):
+    """
+    Returns the id of the loss num node of G, or None if none was designated.
+    """
+    return G.graph.get('loss')
+
+
+def default_params(names) -> list:
+    """
+    Returns the indices of the names that start with 'w' or 'b', the parameters of graphs with
+    no registered parameters.
+    """
+    return [i for i, name in enumerate(names) if name and name[0] in PARAM_PREFIXES]
+
+
+def _check_num(G, node) -> None:
+    if node not in G or G.nodes[node].get('label') != 'num':
+        raise ValueError(f"{node!r} is not a num node of the graph")
@@ -0,0 +1,417 @@
+import heapq
+from collections import deque
+import numpy as np
+
+from .ops import OPS, OPCODES, FORWARD, BACKWARD, FORWARD_BATCH, BACKWARD_BATCH, FORWARD_TENSOR, BACKWARD_TENSOR, unbroadcast
+from .params import get_params, get_loss
+from .optim import Optimizer, apply
+
+
+class Tape:
+    """
+    A num/op DiGraph compiled into a flat evaluation tape.
+
+    The ops are sorted topologically once and resolved to the opcodes of the registry in
+    trengx.engine.ops, so evaluating the graph is a single pass over integer arrays instead
+    of a recursive walk over networkx attribute dicts.
+
+    A 'store' op is a unit delay: at the start of every run its output latches the value
+    its input had at the end of the previous run, so each run is one time step.
+
+    `run_batch` and `backward_batch` evaluate a batch of B samples at once: every num node
+    holds a row of B values and every op runs as one NumPy call over its row.
+
+    If a num node holds a NumPy array, the tape is compiled in tensor mode: `values` and
+    `grads` are lists of floats and arrays, `run` and `backward` use the tensor kernels of the
+    registry, and the gradients are reduced to the shape of each node.
+
+    Attributes:
+        ids (list): The networkx id of the num node at each index.
+        index (dict): The index of each num node, by networkx id.
+        names (list): The name of the num node at each index.
+        values (np.ndarray): The float64 value of every num node, a list in tensor mode.
+        grads (np.ndarray): The float64 gradient of the loss with respect to every num node, a list in tensor mode.
+        tensor (bool): Whether the tape is in tensor mode.
+        params (np.ndarray): The indices of the trainable num nodes, see trengx.engine.params.
+        loss (int): The index of the designated loss num node, -1 if none.
+        op_ids (list): The networkx id of the op at each tape position.
+        opcodes (np.ndarray): The opcode of the op at each tape position.
+        in1 (np.ndarray): The index of the first operand at each tape position.
+        in2 (np.ndarray): The index of the second operand at each tape position, -1 for unary ops.
+        out (np.ndarray): The index of the output at each tape position.
+        store_in (np.ndarray): The input index of every 'store' op.
+        store_out (np.ndarray): The output index of every 'store' op.
+        batch_values (np.ndarray): The (num nodes, B) values of the last `run_batch`, or None.
+        batch_grads (np.ndarray): The (num nodes, B) gradients of the last `backward_batch`, or None.
+    """
+    def __init__(self, G):
+        """
+        Compiles the num/op DiGraph built with Engine.op1 and Engine.op2.
+
+        The operand whose num2op edge is flagged `reverse` is the second operand, so
+        '-' computes the non-reversed operand minus the reversed one, as in forward_propagate.
+
+        Raises:
+            ValueError: If an op is unknown, has the wrong number of operands or outputs,
+                or if the ops form a cycle that does not go through a 'store' op.
+        """
+        self.ids = [node for node, label in G.nodes(data='label') if label == 'num']
+        self.index = {node: i for i, node in enumerate(self.ids)}
+        self.names = [G.nodes[node].get('name') for node in self.ids]
+        values = [G.nodes[node].get('value') for node in self.ids]
+        self.tensor = any(isinstance(value, np.ndarray) for value in values)
+        if self.tensor:
+            self.values = [np.array(value, dtype=np.float64) if isinstance(value, np.ndarray) else _as_float(value) for value in values]
+            self.grads = [0.0] * len(self.ids)
+        else:
+            self.values = np.array([_as_float(value) for value in values], dtype=np.float64)
+            self.grads = np.zeros(len(self.ids), dtype=np.float64)
+        self.params = np.array([self.index[node] for node in get_params(G)], dtype=np.int64)
+        loss = get_loss(G)
+        self.loss = -1 if loss is None else self.index[loss]
+        self.batch_values = None
+        self.batch_grads = None
+
+        ops = []
+        stores = []
+        for op, label in G.nodes(data='label'):
+            if label != 'op':
+                continue
+            name = G.nodes[op]['name']
+            outputs = list(G.successors(op))
+            if len(outputs) != 1:
+                raise ValueError(f"op '{name}' must have exactly one output, got {len(outputs)}")
+            operands = sorted(G.predecessors(op), key=lambda node: bool(G[node][op].get('reverse', False)))
+            out = self.index[outputs[0]]
+            if name == 'store':
+                stores.append((self.index[operands[0]], out))
+                continue
+            if name not in OPCODES:
+                raise ValueError(f"Unknown op '{name}'")
+            arity = OPS[OPCODES[name]].arity
+            if len(operands) != arity:
+                raise ValueError(f"op '{name}' expects {arity} operand(s), got {len(operands)}")
+            operands = [self.index[node] for node in operands]
+            ops.append((op, OPCODES[name], operands[0], operands[1] if arity == 2 else -1, out))
+
+        ops = _topological_order(ops)
+        self.op_ids = [op[0] for op in ops]
+        self.opcodes = np.array([op[1] for op in ops], dtype=np.int64)
+        self.in1 = np.array([op[2] for op in ops], dtype=np.int64)
+        self.in2 = np.array([op[3] for op in ops], dtype=np.int64)
+        self.out = np.array([op[4] for op in ops], dtype=np.int64)
+        self.store_in = np.array([store[0] for store in stores], dtype=np.int64)
+        self.store_out = np.array([store[1] for store in stores], dtype=np.int64)
+
+        # Plain Python lists are much faster than NumPy arrays for scalar indexing
+        self._program = list(zip(self.opcodes.tolist(), self.in1.tolist(), self.in2.tolist(), self.out.tolist()))
+        self._stores = list(zip(self.store_in.tolist(), self.store_out.tolist()))
+        # The tape positions of the ops reading each num node
+        self._consumers = [[] for _ in self.ids]
+        for position, (_, a, b, _) in enumerate(self._program):
+            self._consumers[a].append(position)
+            if b >= 0 and b != a:
+                self._consumers[b].append(position)
+
+    def run(self, inputs=None):
+        """
+        Evaluates the tape once.
+
+        Args:
+            inputs (dict, optional): New values of num nodes, by networkx id.
+
+        Returns:
+            np.ndarray: The values of every num node, indexed like `ids`.
+        """
+        if self.tensor:
+            return self._run_tensor(inputs)
+        values = self.values.tolist()
+        self._latch(values)
+        if inputs:
+            index = self.index
+            for node, value in inputs.items():
+                values[index[node]] = value
+
+        forward = FORWARD
+        for code, a, b, o in self._program:
+            values[o] = forward[code](values[a], values[b])
+
+        self.values[:] = values
+        return self.values
+
+    def backward(self, loss=None, lr=None):
+        """
+        Computes the gradient of the loss with one reverse sweep over the tape.
+
+        Every op is visited exactly once, after all the consumers of its output, so the
+        adjoint of each num node is accumulated completely before it is propagated further.
+        Uses the values of the last `run`.
+
+        Args:
+            loss (optional): The networkx id of the loss num node. Defaults to the designated loss.
+            lr (float or Optimizer, optional): If given, update the parameters with `step`.
+
+        Returns:
+            np.ndarray: The gradients of every num node, indexed like `ids`.
+        """
+        loss = self._loss_index(loss)
+        if self.tensor:
+            return self._backward_tensor(loss, lr)
+        values = self.values.tolist()
+        grads = [0.0] * len(values)
+        grads[loss] = 1.0
+
+        backward = BACKWARD
+        for code, a, b, o in reversed(self._program):
+            g = grads[o]
+            if g == 0.0:
+                continue
+            da, db = backward[code](values[a], values[b], g)
+            grads[a] += da
+            if b >= 0:
+                grads[b] += db
+
+        self.grads[:] = grads
+        if lr is not None:
+            self.step(lr)
+        return self.grads
+
+    def _run_tensor(self, inputs):
+        values = self.values
+        self._latch(values)
+        if inputs:
+            for node, value in inputs.items():
+                values[self.index[node]] = np.asarray(value, dtype=np.float64) if isinstance(value, (np.ndarray, list)) else value
+
+        forward = FORWARD_TENSOR
+        for code, a, b, o in self._program:
+            values[o] = forward[code](values[a], values[b])
+        return values
+
+    def _latch(self, values) -> None:
+        # Every store reads its input before any store writes its output, so that a chain of
+        # stores delays by one run per store whatever the order of the nodes
+        latched = [values[i] for i, _ in self._stores]
+        for (_, o), value in zip(self._stores, latched):
+            values[o] = value
+
+    def _backward_tensor(self, loss, lr):
+        # None stands for a zero gradient of any shape
+        values = self.values
+        grads = [None] * len(values)
+        grads[loss] = np.ones_like(values[loss])
+
+        backward = BACKWARD_TENSOR
+        for code, a, b, o in reversed(self._program):
+            g = grads[o]
+            if g is None:
+                continue
+            da, db = backward[code](values[a], values[b], g)
+            da = unbroadcast(da, values[a])
+            grads[a] = da if grads[a] is None else grads[a] + da
+            if b >= 0:
+                db = unbroadcast(db, values[b])
+                grads[b] = db if grads[b] is None else grads[b] + db
+
+        grads = [0.0 if g is None else g for g in grads]
+        self.grads = grads
+        if lr is not None:
+            self.step(lr)
+        return grads
+
+    def update(self, inputs, tol=None):
+        """
+        Incrementally recomputes the ops downstream of changed inputs.
+
+        The ops reading a changed node are marked dirty and recomputed in tape order, so each
+        op of the changed cone is evaluated exactly once and the rest of the tape is not touched.
+        Unlike `run`, this is not a time step: 'store' outputs are not latched.
+
+        Args:
+            inputs (dict): New values of num nodes, by networkx id.
+            tol (float, optional): Early cutoff. A node whose new value is within `tol` of its
+                previous value is still written but does not dirty the ops reading it.
+
+        Returns:
+            int: The number of ops recomputed.
+        """
+        if self.tensor:
+            raise ValueError("update is not supported in tensor mode")
+        values = self.values
+        consumers = self._consumers
+        dirty = []
+        queued = set()
+
+        def changed(i, value):
+            unchanged = tol is not None and abs(value - values[i]) <= tol
+            values[i] = value
+            if not unchanged:
+                for position in consumers[i]:
+                    if position not in queued:
+                        queued.add(position)
+                        heapq.heappush(dirty, position)
+
+        for node, value in inputs.items():
+            changed(self.index[node], value)
+
+        forward = FORWARD
+        program = self._program
+        while dirty:
+            code, a, b, o = program[heapq.heappop(dirty)]
+            changed(o, forward[code](values[a], values[b]))
+        return len(queued)
+
+    def run_batch(self, inputs):
+        """
+        Evaluates the tape once over a batch of samples.
+
+        Num nodes missing from `inputs`, such as the parameters, take their current value
+        for every sample. Each 'store' op latches, sample by sample, the value its input had
+        in the previous batch of the same size.
+
+        Args:
+            inputs (dict): 1-D arrays of B values of num nodes, by networkx id.
+
+        Returns:
+            np.ndarray: The (num nodes, B) values, with rows indexed like `ids`.
+        """
+        if self.tensor:
+            raise ValueError("run_batch is not supported in tensor mode, give the inputs a batch dimension instead")
+        inputs = {self.index[node]: np.asarray(value, dtype=np.float64) for node, value in inputs.items()}
+        sizes = {value.shape for value in inputs.values()}
+        if len(sizes) != 1 or len(next(iter(sizes))) != 1:
+            raise ValueError(f"inputs must be 1-D arrays of the same length, got shapes {sizes}")
+        size = next(iter(sizes))[0]
+
+        values = np.empty((len(self.ids), size), dtype=np.float64)
+        values[:] = self.values[:, None]
+        if len(self.store_out):
+            previous = self.batch_values
+            if previous is not None and previous.shape[1] == size:
+                values[self.store_out] = previous[self.store_in]
+            else:
+                values[self.store_out] = self.values[self.store_in, None]
+        for i, value in inputs.items():
+            values[i] = value
+
+        forward = FORWARD_BATCH
+        for code, a, b, o in self._program:
+            values[o] = forward[code](values[a], values[b])
+
+        self.batch_values = values
+        return values
+
+    def backward_batch(self, loss=None, lr=None):
+        """
+        Computes the gradient of the loss of every sample of the last `run_batch` with one
+        reverse sweep over the tape.
+
+        The gradients are averaged over the batch into `grads`, so `lr` has the same scale
+        as in `backward`.
+
+        Args:
+            loss (optional): The networkx id of the loss num node. Defaults to the designated loss.
+            lr (float or Optimizer, optional): If given, update the parameters with `step`.
+
+        Returns:
+            np.ndarray: The batch-averaged gradients of every num node, indexed like `ids`.
+        """
+        if self.batch_values is None:
+            raise ValueError("backward_batch needs the values of a previous run_batch")
+        values = self.batch_values
+        grads = np.zeros_like(values)
+        grads[self._loss_index(loss)] = 1.0
+
+        backward = BACKWARD_BATCH
+        for code, a, b, o in reversed(self._program):
+            da, db = backward[code](values[a], values[b], grads[o])
+            grads[a] += da
+            if b >= 0:
+                grads[b] += db
+
+        self.batch_grads = grads
+        self.grads[:] = grads.mean(axis=1)
+        if lr is not None:
+            self.step(lr)
+        return self.grads
+
+    def step(self, lr) -> None:
+        """
+        Updates the parameters from the current gradients in one vectorized step: plain SGD,
+        values[params] -= lr * grads[params], if `lr` is a float, else one step of the
+        optimizer over the parameter vector, see trengx.engine.optim.
+        """
+        if isinstance(lr, Optimizer):
+            apply(lr, self.values, self.grads, self.params)
+        elif self.tensor:
+            for i in self.params.tolist():
+                self.values[i] = self.values[i] - lr * self.grads[i]
+        else:
+            self.values[self.params] -= lr * self.grads[self.params]
+
+    def _loss_index(self, loss) -> int:
+        if loss is not None:
+            return self.index[loss]
+        if self.loss < 0:
+            raise ValueError("No loss given and none designated with set_loss")
+        return self.loss
+
+    def __getitem__(self, node):
+        """
+        Returns the value of a num node by networkx id.
+        """
+        return self.values[self.index[node]]
+
+    def write_back(self, G) -> None:
+        """
+        Copies the values and gradients of the tape into the 'value' and 'grad' attributes of the num nodes of G.
+        """
+        values, grads = (self.values, self.grads) if self.tensor else (self.values.tolist(), self.grads.tolist())
+        for node, value, grad in zip(self.ids, values, grads):
+            G.nodes[node]['value'] = value
+            G.nodes[node]['grad'] = grad
+
+
+def compile(G) -> Tape:
+    """
+    Compiles a num/op DiGraph into a Tape.
+
+    Example:
+        tape = compile(G)
+        tape.run({x: 1.0})
+        tape[e2]
+    """
+    return Tape(G)
+
+
+def _as_float(value) -> float:
+    return np.nan if value is None else float(value)
+
+
+def _topological_order(ops):
+    """
+    Sorts (op, opcode, in1, in2, out) tuples so that every op comes after the ops producing its operands.
+    """
+    producers = {op[4]: position for position, op in enumerate(ops)}
+    successors = [[] for _ in ops]
+    in_degree = [0] * len(ops)
+    for position, op in enumerate(ops):
+        for operand in (op[2], op[3]):
+            producer = producers.get(operand)
+            if producer is not None:
+                successors[producer].append(position)
+                in_degree[position] += 1
+
+    ready = deque(position for position, degree in enumerate(in_degree) if degree == 0)
+    order = []
+    while ready:
+        position = ready.popleft()
+        order.append(ops[position])
+        for successor in successors[position]:
+            in_degree[successor] -= 1
+            if in_degree[successor] == 0:
+                ready.append(successor)
+
+    if len(order) != len(ops):
+        raise ValueError("The ops form a cycle that does not go through a 'store' op")
+    return order
@@ -0,0 +1,139 @@
+import time
+import numpy as np
+
+from .tape import Tape
+from .optim import apply, get_optimizer
+from .parallel import train_parallel
+
+
+def train(G, data, loss_node=None, params=None, batch_size=32, epochs=1, lr=0.01, tape=None, optimizer=None,
+          workers=1) -> dict:
+    """
+    Trains the parameters of a num/op DiGraph with mini-batches on its compiled tape.
+
+    Every batch is evaluated in one forward and one backward pass. The gradients are averaged
+    over the samples of the batch, and the parameters are updated in one vectorized step of
+    the optimizer, plain SGD by default.
+    The trained values are written back into G at the end.
+
+    On scalar graphs the samples of a batch run side by side with Tape.run_batch. On tensor
+    graphs the batch is given to the input nodes as the first dimension of their arrays, so the
+    loss node should reduce over it, for instance with a 'mean' op.
+
+    Args:
+        G: The num/op DiGraph built with Engine.op1, Engine.op2 or Dense.
+        data: Either a dict of arrays of samples by input node id, all of the same length,
+            or an iterable of {input node id: value} dicts, one per sample. A one-shot
+            iterator can only be used for one epoch.
+        loss_node (optional): The networkx id of the loss num node. Defaults to the loss
+            designated with Engine.set_loss.
+        params (list, optional): The networkx ids of the num nodes to train. Defaults to the
+            registered parameters, see trengx.engine.params.
+        batch_size (int): The number of samples per update.
+        epochs (int): The number of passes over the data.
+        lr (float): The learning rate of the optimizer created by name.
+        tape (Tape, optional): A tape compiled from G, to continue a previous training.
+        optimizer (str or Optimizer, optional): An optimizer of trengx.engine.optim, or the name
+            of one in OPTIMIZERS. Defaults to SGD. Pass the same object to continue a training
+            with its state.
+        workers (int): The number of processes. With more than one, every batch is split between
+            a pool of processes, see trengx.engine.parallel.train_parallel. None for one per CPU.
+
+    Returns:
+        dict: 'loss', the mean loss of every batch; 'epoch_loss', the mean loss of every epoch;
+        'samples', the number of samples processed; 'seconds' and 'samples_per_second', the
+        training time and throughput; 'tape', the compiled tape; and 'optimizer', the optimizer.
+
+    Raises:
+        ValueError: If the batch size or the number of epochs is not positive, if the arrays of
+            samples have different lengths, if a one-shot iterator is given for several epochs,
+            if no loss is given and none was designated, or if the optimizer is unknown.
+
+    Example:
+        result = Engine.train(G, {x: xs, y: ys}, e2, batch_size=50, epochs=10, lr=0.01)
+        result['epoch_loss'][-1], result['samples_per_second']
+    """
+    if workers != 1:
+        return train_parallel(G, data, loss_node, params, batch_size, epochs, lr, tape, optimizer, workers)
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    if epochs < 1:
+        raise ValueError(f"epochs must be positive, got {epochs}")
+
+    optimizer = get_optimizer(optimizer, lr)
+    tape = tape or Tape(G)
+    index = tape.params if params is None else np.array([tape.index[node] for node in params], dtype=np.int64)
+    loss = tape._loss_index(loss_node)
+
+    if isinstance(data, dict):
+        arrays = {node: np.asarray(values) for node, values in data.items()}
+        lengths = {len(values) for values in arrays.values()}
+        if len(lengths) != 1:
+            raise ValueError(f"The arrays of samples must have the same length, got {sorted(lengths)}")
+        size = lengths.pop()
+        batches_per_epoch = -(-size // batch_size)
+        capacity = epochs * batches_per_epoch
+
+        def batches():
+            for start in range(0, size, batch_size):
+                yield {node: values[start:start + batch_size] for node, values in arrays.items()}, min(batch_size, size - start)
+    else:
+        if epochs > 1 and iter(data) is data:
+            raise ValueError("A one-shot iterator of samples can only be used for one epoch")
+        capacity = 64
+
+        def batches():
+            samples = []
+            for sample in data:
+                samples.append(sample)
+                if len(samples) == batch_size:
+                    yield _stack(samples), batch_size
+                    samples = []
+            if samples:
+                yield _stack(samples), len(samples)
+
+    history = np.empty(capacity, dtype=np.float64)
+    epoch_loss = np.empty(epochs, dtype=np.float64)
+    count = 0
+    samples = 0
+
+    start = time.perf_counter()
+    for epoch in range(epochs):
+        total = 0.0
+        epoch_samples = 0
+        for inputs, n in batches():
+            if tape.tensor:
+                value = float(tape.run(inputs)[loss])
+                grads = tape.backward(loss_node)
+            else:
+                value = float(tape.run_batch(inputs)[loss].mean())
+                grads = tape.backward_batch(loss_node)
+            apply(optimizer, tape.values, grads, index)
+
+            if count == len(history):
+                history = np.concatenate([history, np.empty_like(history)])
+            history[count] = value
+            count += 1
+            total += value * n
+            epoch_samples += n
+        epoch_loss[epoch] = total / epoch_samples if epoch_samples else np.nan
+        samples += epoch_samples
+    seconds = time.perf_counter() - start
+
+    tape.write_back(G)
+    return {
+        'loss': history[:count],
+        'epoch_loss': epoch_loss,
+        'samples': samples,
+        'seconds': seconds,
+        'samples_per_second': samples / seconds if seconds > 0 else np.inf,
+        'tape': tape,
+        'optimizer': optimizer,
+    }
+
+
+def _stack(samples) -> dict:
+    """
+    Turns a list of {node: value} samples into a dict of arrays with the samples along the first axis.
+    """
+    return {node: np.array([sample[node] for sample in samples]) for node in samples[0]}